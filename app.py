@@ -1,7 +1,7 @@
 import streamlit as st
-import os
-os.system("pip install plotly")
-import plotly.graph_objects as go
+from core import instrumentation
+from core.startup import (STARTUP_TIMINGS, check_dependencies, load_page, profiling_enabled, start_background_services,
+                          startup_phase)
 
 st.set_page_config(
     page_title="SmartData Hub",
@@ -232,6 +232,26 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Dependency check — once per process, no pip shell-out
+missing = check_dependencies()
+if missing:
+    st.error(f"Missing dependencies: {', '.join(missing)}. Install them with `pip install -r requirement.txt`.")
+    st.stop()
+
+# Scheduled ingestion jobs run in this process whether or not the Data Ingestion page is ever opened
+start_background_services()
+
+# Page registry — modules are imported only when selected
+PAGES = {
+    "🏠 Home — Overview": "home",
+    "📊 BI Dashboard": "bi_dashboard",
+    "🔄 Data Ingestion": "data_ingestion",
+    "🤖 AI Chatbot (NL2SQL)": "ai_chatbot",
+    "🔬 Data Science & AutoML": "data_science",
+    "💰 Cost Optimizer": "cost_optimizer",
+    "🏗️ Architecture": "architecture",
+}
+
 # Sidebar Navigation
 with st.sidebar:
     st.markdown("""
@@ -246,15 +266,7 @@ with st.sidebar:
     
     page = st.selectbox(
         "🗺️ Navigate",
-        [
-            "🏠 Home — Overview",
-            "📊 BI Dashboard",
-            "🔄 Data Ingestion",
-            "🤖 AI Chatbot (NL2SQL)",
-            "🔬 Data Science & AutoML",
-            "💰 Cost Optimizer",
-            "🏗️ Architecture"
-        ],
+        list(PAGES),
         label_visibility="collapsed"
     )
     
@@ -262,15 +274,7 @@ with st.sidebar:
     
     # Platform Status
     st.markdown("### 🟢 Platform Status")
-    st.markdown("""
-    <div style='font-size:0.8rem; color:#8899bb;'>
-        <div style='margin:6px 0;'>🟢 Data Pipelines: <span style='color:#00ff88;'>Active</span></div>
-        <div style='margin:6px 0;'>🟢 AI Engine: <span style='color:#00ff88;'>Running</span></div>
-        <div style='margin:6px 0;'>🟢 Cloud Storage: <span style='color:#00ff88;'>Connected</span></div>
-        <div style='margin:6px 0;'>🟡 ML Models: <span style='color:#ffaa00;'>3 Training</span></div>
-        <div style='margin:6px 0;'>🟢 BI Reports: <span style='color:#00ff88;'>Live</span></div>
-    </div>
-    """, unsafe_allow_html=True)
+    status_panel = st.empty()
     
     st.markdown("---")
     st.markdown("""
@@ -281,24 +285,31 @@ with st.sidebar:
     """, unsafe_allow_html=True)
 
 # Route to pages
-if "🏠 Home" in page:
-    from pages import home
-    home.show()
-elif "📊 BI Dashboard" in page:
-    from pages import bi_dashboard
-    bi_dashboard.show()
-elif "🔄 Data Ingestion" in page:
-    from pages import data_ingestion
-    data_ingestion.show()
-elif "🤖 AI Chatbot" in page:
-    from pages import ai_chatbot
-    ai_chatbot.show()
-elif "🔬 Data Science" in page:
-    from pages import data_science
-    data_science.show()
-elif "💰 Cost Optimizer" in page:
-    from pages import cost_optimizer
-    cost_optimizer.show()
-elif "🏗️ Architecture" in page:
-    from pages import architecture
-    architecture.show()
+with startup_phase(f"first render {PAGES[page]}"), instrumentation.timed(PAGES[page], "render"):
+    load_page(PAGES[page]).show()
+
+
+def _status_line(label, row):
+    icon, color = ("🟢", "#00ff88") if row["p95"] < 250 else ("🟡", "#ffaa00") if row["p95"] < 1000 else ("🔴", "#ff4444")
+    return (
+        f"<div style='margin:6px 0;'>{icon} {label}: <span style='color:{color};'>"
+        f"p50 {row['p50']:.0f} · p95 {row['p95']:.0f} · p99 {row['p99']:.0f} ms</span></div>"
+    )
+
+
+# Platform Status — live rolling percentiles from the in-process store
+stats = instrumentation.snapshot()
+page_render = [row for row in stats if row["page"] == PAGES[page] and row["section"] == "render"]
+hot_sections = [row for row in stats if row["section"] != "render"][:5]
+lines = [_status_line(f"{page} render", row) for row in page_render]
+lines += [_status_line(f"{row['page']} › {row['section']}", row) for row in hot_sections]
+lines.append(
+    f"<div style='margin:6px 0; color:#556677;'>{sum(row['count'] for row in stats)} samples · "
+    f"{len(stats)} sections · last {instrumentation.WINDOW} per section</div>"
+)
+status_panel.markdown(f"<div style='font-size:0.8rem; color:#8899bb;'>{''.join(lines)}</div>", unsafe_allow_html=True)
+
+if profiling_enabled():
+    with st.sidebar.expander("⏱️ Startup Profile"):
+        for name, ms in STARTUP_TIMINGS.items():
+            st.markdown(f"<div style='font-size:0.75rem; color:#8899bb;'>{name}: <span style='color:#00d4ff;'>{ms:.1f} ms</span></div>", unsafe_allow_html=True)
@@ -0,0 +1,151 @@
+"""Intent matching benchmark: linear keyword scan vs. the BM25 intent index.
+
+Generates N synthetic question→SQL templates, then times on the same queries:
+
+* ``first_match_scan`` — the original ``any(word in question_lower ...)`` loop
+  from ``get_nl2sql_response``. It stops at the first substring hit, so it is
+  cheap when it hits early but usually returns the wrong template;
+* ``ranked_scan`` — a linear scan that scores every template by word overlap,
+  i.e. what the scan has to do to pick the best template;
+* ``intent_index`` — ``IntentIndex.best``.
+
+Accuracy is the share of paraphrased queries that resolve to the template
+they were generated from.
+
+    python benchmarks/intent_match.py --templates 10000 --queries 2000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.intent_index import IntentIndex  # noqa: E402
+
+DOMAIN_WORDS = (
+    "sales revenue profit margin churn risk customer order product region country segment month quarter "
+    "year trend forecast inventory supplier shipment invoice payment refund discount campaign lead "
+    "conversion employee headcount salary attrition ticket incident latency uptime cost budget expense "
+    "department store warehouse channel partner contract renewal subscription usage session device"
+).split()
+SYLLABLES = "ba ko ri mu te sa lo vi ne da pu ga fe zo hi ma ru ki no ta".split()
+
+
+def make_vocab(size, rng):
+    # Curated templates mention entities (tables, metrics, products) far beyond
+    # a few dozen common words; pad the domain words with synthetic entity names.
+    vocab = set(DOMAIN_WORDS)
+    while len(vocab) < size:
+        vocab.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 4))))
+    return sorted(vocab)
+
+
+def make_templates(n, seed=42, vocab_size=4000):
+    rng = random.Random(seed)
+    vocab = make_vocab(vocab_size, rng)
+    templates = {}
+    while len(templates) < n:
+        key = " ".join(rng.sample(DOMAIN_WORDS, 1) + rng.sample(vocab, rng.randint(1, 3)))
+        if key not in templates:
+            templates[key] = {"sql": f"-- {key}", "keywords": rng.sample(vocab, 2)}
+    return templates
+
+
+def first_match_scan(templates, question):
+    question_lower = question.lower()
+    for key, response in templates.items():
+        if any(word in question_lower for word in key.split()):
+            return response
+    return None
+
+
+def ranked_scan(templates, question):
+    words = set(question.lower().split())
+    best, best_score = None, 0
+    for key, response in templates.items():
+        score = sum(1 for word in key.split() if word in words)
+        if score > best_score:
+            best, best_score = response, score
+    return best
+
+
+def make_queries(templates, n, seed=7):
+    """Return ``[(question, expected_key or None)]``: half paraphrases, half misses."""
+    rng = random.Random(seed)
+    keys = list(templates)
+    queries = []
+    for _ in range(n):
+        if rng.random() < 0.5:
+            key = rng.choice(keys)
+            words = key.split()
+            queries.append(("show me the " + " ".join(rng.sample(words, len(words))), key))
+        else:
+            queries.append((f"unrelated question number {rng.randint(0, 10**6)}", None))
+    return queries
+
+
+def _measure(fn, queries, templates):
+    samples = []
+    correct = expected_total = 0
+    for question, expected in queries:
+        start = time.perf_counter()
+        result = fn(question)
+        samples.append((time.perf_counter() - start) * 1e6)
+        if expected is not None:
+            expected_total += 1
+            correct += result is templates[expected]
+    return {
+        "median_us": round(statistics.median(samples), 2),
+        "p95_us": round(sorted(samples)[int(len(samples) * 0.95)], 2),
+        "accuracy": round(correct / expected_total, 4) if expected_total else None,
+    }
+
+
+def _best_template(index, question):
+    match = index.best(question, min_confidence=0.3)
+    return match.template if match else None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--templates", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    templates = make_templates(args.templates)
+    queries = make_queries(templates, args.queries)
+
+    start = time.perf_counter()
+    index = IntentIndex(templates)
+    index.compile()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    scenarios = {
+        "first_match_scan": _measure(lambda q: first_match_scan(templates, q), queries, templates),
+        "ranked_scan": _measure(lambda q: ranked_scan(templates, q), queries, templates),
+        "intent_index": _measure(lambda q: _best_template(index, q), queries, templates),
+    }
+    results = {
+        "templates": args.templates,
+        "queries": args.queries,
+        "index_build_ms": round(build_ms, 1),
+        **scenarios,
+        "speedup_vs_ranked_scan": round(scenarios["ranked_scan"]["median_us"] / scenarios["intent_index"]["median_us"], 1),
+    }
+    print(f"templates={args.templates}  queries={args.queries}  index build={build_ms:.1f} ms")
+    for name, stats in scenarios.items():
+        print(f"{name:<18} median {stats['median_us']:>9.1f} µs   p95 {stats['p95_us']:>9.1f} µs   accuracy {stats['accuracy']:.1%}")
+    print(f"speedup vs ranked scan (median): {results['speedup_vs_ranked_scan']}x")
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
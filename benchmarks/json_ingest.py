@@ -0,0 +1,102 @@
+"""JSON ingestion benchmark: streaming NDJSON / array / wrapped dumps at bounded memory.
+
+Writes N synthetic sales rows, each nested under ``order`` / ``customer``
+objects with a list of tags, in three layouts, then reads each with
+``JSONReader`` and reports:
+
+* MB/s and rows/s through flattening and schema conformance;
+* peak RSS of the process doing the read (one fresh process per reader) —
+  roughly the interpreter plus one block and one chunk, independent of file size;
+* ``pandas.read_json(lines=True, chunksize=...)`` on the NDJSON file, for reference.
+
+    python benchmarks/json_ingest.py --rows 1000000 --chunk-rows 100000
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import synthetic  # noqa: E402
+from core.json_reader import JSONReader  # noqa: E402
+
+
+def nested_records(frame):
+    columns = list(frame.columns)
+    for row in frame.itertuples(index=False):
+        values = dict(zip(columns, row))
+        yield {
+            "id": values.pop(columns[0]),
+            "order": {key: values.pop(key) for key in columns[1:len(columns) // 2]},
+            "customer": values,
+            "tags": ["synthetic", "benchmark"],
+        }
+
+
+def write_dumps(tmp, rows):
+    paths = {layout: os.path.join(tmp, f"dump_{layout}.json") for layout in ("ndjson", "array", "wrapped")}
+    with open(paths["ndjson"], "w") as nd, open(paths["array"], "w") as arr, open(paths["wrapped"], "w") as wrapped:
+        arr.write("[")
+        wrapped.write('{"meta": {"source": "benchmark"}, "data": [')
+        first = True
+        for chunk in synthetic.iter_chunks("sales_transactions", rows, chunk_rows=50_000):
+            chunk = pd.DataFrame(json.loads(chunk.to_json(orient="records", date_format="iso")))
+            for record in nested_records(chunk):
+                text = json.dumps(record)
+                nd.write(text + "\n")
+                arr.write(("" if first else ",\n") + text)
+                wrapped.write(("" if first else ",") + text)
+                first = False
+        arr.write("]")
+        wrapped.write("]}")
+    return paths
+
+
+def read_chunks(reader, path, chunk_rows):
+    if reader == "pandas ndjson":
+        return pd.read_json(path, lines=True, chunksize=chunk_rows)
+    return JSONReader(path, chunk_rows)
+
+
+def measure(reader, path, chunk_rows):
+    start = time.perf_counter()
+    rows = sum(len(chunk) for chunk in read_chunks(reader, path, chunk_rows))
+    seconds = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {"rows": rows, "mb": round(size / 1e6, 1), "seconds": round(seconds, 2), "mb_per_s": round(size / 1e6 / seconds, 1),
+            "rows_per_s": round(rows / seconds), "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    results = {"rows": args.rows, "chunk_rows": args.chunk_rows, "runs": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_dumps(tmp, args.rows)
+        readers = [(layout, path) for layout, path in paths.items()] + [("pandas ndjson", paths["ndjson"])]
+        for name, path in readers:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                run = {"reader": name, **pool.submit(measure, name, path, args.chunk_rows).result()}
+            results["runs"].append(run)
+            print(f"{name:<14} {run['mb']:>8,} MB  {run['mb_per_s']:>6} MB/s  {run['rows_per_s']:>10,} rows/s  "
+                  f"peak RSS {run['peak_rss_mb']:,} MB")
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Headless per-page rerun benchmark.
+
+Drives app.py through Streamlit's AppTest harness, selects every entry in the
+sidebar navigation selectbox and records, per rerun: wall time, peak Python
+heap (tracemalloc), element/block counts and the serialized protobuf payload
+size. Results are written as JSON; pass ``--baseline`` with an earlier file to
+print the change per page.
+
+    python benchmarks/page_rerun.py --reruns 5 --out page_rerun.json
+    python benchmarks/page_rerun.py --baseline page_rerun.json
+    python benchmarks/page_rerun.py --data-scale 1000000   # production-sized sample tables
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+
+
+def _tree_stats(node):
+    """Count element and block protos under ``node`` and sum their serialized size."""
+    elements = blocks = payload = 0
+    proto = getattr(node, "proto", None)
+    children = getattr(node, "children", None) or {}
+    if proto is not None:
+        payload += proto.ByteSize()
+        if children:
+            blocks += 1
+        else:
+            elements += 1
+    for child in children.values():
+        e, b, p = _tree_stats(child)
+        elements += e
+        blocks += b
+        payload += p
+    return elements, blocks, payload
+
+
+def _timed_run(at):
+    tracemalloc.start()
+    start = time.perf_counter()
+    at.run()
+    wall_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    elements, blocks, payload = _tree_stats(at._tree)
+    return {
+        "wall_ms": round(wall_ms, 2),
+        "peak_mem_kb": round(peak / 1024, 1),
+        "elements": elements,
+        "blocks": blocks,
+        "payload_bytes": payload,
+        "exceptions": [str(e.value) for e in at.exception],
+    }
+
+
+def _summary(runs):
+    walls = [r["wall_ms"] for r in runs]
+    return {
+        "wall_ms_median": round(statistics.median(walls), 2),
+        "wall_ms_min": round(min(walls), 2),
+        "wall_ms_max": round(max(walls), 2),
+        "peak_mem_kb_max": max(r["peak_mem_kb"] for r in runs),
+        "elements": runs[-1]["elements"],
+        "blocks": runs[-1]["blocks"],
+        "payload_bytes": runs[-1]["payload_bytes"],
+    }
+
+
+def run_benchmark(reruns=5, pages=None, timeout=120):
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    navigation = at.sidebar.selectbox[0]
+    labels = [label for label in navigation.options if not pages or any(p in label for p in pages)]
+
+    results = {}
+    for label in labels:
+        at.sidebar.selectbox[0].select(label)
+        cold = _timed_run(at)
+        warm = [_timed_run(at) for _ in range(reruns)]
+        results[label] = {"cold": cold, "warm": _summary(warm), "runs": warm}
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_table(results, baseline=None):
+    print(f"{'Page':<28} {'cold ms':>9} {'warm ms':>9} {'peak KB':>9} {'elems':>6} {'bytes':>9}")
+    for label, entry in results.items():
+        warm = entry["warm"]
+        line = (
+            f"{label:<28} {entry['cold']['wall_ms']:>9.1f} {warm['wall_ms_median']:>9.1f} "
+            f"{warm['peak_mem_kb_max']:>9.0f} {warm['elements']:>6} {warm['payload_bytes']:>9}"
+        )
+        previous = (baseline or {}).get(label)
+        if previous:
+            before = previous["warm"]
+            delta_ms = warm["wall_ms_median"] - before["wall_ms_median"]
+            delta_bytes = warm["payload_bytes"] - before["payload_bytes"]
+            line += f"   Δ {delta_ms:+.1f} ms, {delta_bytes:+d} B"
+        print(line)
+        if entry["cold"]["exceptions"]:
+            print(f"    ⚠️ {entry['cold']['exceptions'][0]}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=5, help="warm reruns per page")
+    parser.add_argument("--page", action="append", dest="pages", help="substring of a navigation label (repeatable)")
+    parser.add_argument("--out", default=os.path.join(ROOT, "benchmarks", "page_rerun.json"), help="where to write the JSON results")
+    parser.add_argument("--baseline", default=None, help="earlier results file to diff against")
+    parser.add_argument("--data-scale", type=int, default=None, help="rows of synthetic sales data the pages load (sets SMARTHUB_DATA_SCALE)")
+    args = parser.parse_args(argv)
+
+    if args.data_scale:
+        # Read by the pages at import, which happens inside the first AppTest run
+        os.environ["SMARTHUB_DATA_SCALE"] = str(args.data_scale)
+
+    results = run_benchmark(reruns=args.reruns, pages=args.pages)
+
+    baseline = None
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["pages"]
+    _print_table(results, baseline)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "reruns": args.reruns,
+        "data_scale": args.data_scale,
+        "pages": results,
+    }
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2, ensure_ascii=False)
+    print(f"\nWrote {args.out}")
+    return 1 if any(entry["cold"]["exceptions"] for entry in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Parallel CSV benchmark: byte-range parsing speedup by worker process count.
+
+Writes N synthetic sales rows to a CSV file, then reads it:
+
+* ``serial`` — ``pd.read_csv(chunksize=...)``, the single-core baseline;
+* ``ParallelCSVReader`` with each ``--workers`` count, frames consumed in
+  file order (what the pipeline's extract stage sees);
+
+and reports seconds, MB/s and speedup over serial. Results are checked
+equal to the serial read. Counts above ``os.cpu_count()`` are still run
+but can't scale further.
+
+    python benchmarks/parallel_csv.py --rows 5000000 --workers 1,2,4,8,16
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import synthetic  # noqa: E402
+from core.parallel_csv import ParallelCSVReader  # noqa: E402
+
+
+def consume(chunks):
+    rows, checksum = 0, 0.0
+    for chunk in chunks:
+        rows += len(chunk)
+        checksum += float(chunk["sale_amount"].sum())
+    return rows, round(checksum, 2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--workers", default="1,2,4,8,16", help="comma-separated worker counts")
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sales.csv")
+        with open(path, "w") as fh:
+            for i, chunk in enumerate(synthetic.iter_chunks("sales_transactions", args.rows, chunk_rows=200_000)):
+                chunk.to_csv(fh, index=False, header=i == 0)
+        mb = os.path.getsize(path) / 1e6
+        print(f"rows={args.rows:,}  file={mb:,.0f} MB  cpus={os.cpu_count()}")
+
+        start = time.perf_counter()
+        with pd.read_csv(path, chunksize=args.chunk_rows) as reader:
+            expected = consume(reader)
+        serial_s = time.perf_counter() - start
+        results = {"rows": args.rows, "mb": round(mb, 1), "cpus": os.cpu_count(), "serial_s": round(serial_s, 2), "runs": []}
+        print(f"serial      {serial_s:>7.2f} s  {mb / serial_s:>7.1f} MB/s")
+
+        for workers in [int(count) for count in args.workers.split(",")]:
+            reader = ParallelCSVReader(path, args.chunk_rows, workers=workers)
+            start = time.perf_counter()
+            got = consume(reader)
+            seconds = time.perf_counter() - start
+            if got != expected:
+                raise SystemExit(f"workers={workers}: read {got}, expected {expected}")
+            run = {"workers": workers, "ranges": reader.ranges, "seconds": round(seconds, 2),
+                   "mb_per_s": round(mb / seconds, 1), "speedup": round(serial_s / seconds, 2)}
+            results["runs"].append(run)
+            print(f"workers {workers:>3} {seconds:>7.2f} s  {run['mb_per_s']:>7.1f} MB/s  {run['speedup']:>5.2f}× "
+                  f"({reader.ranges} ranges)")
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
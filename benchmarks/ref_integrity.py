@@ -0,0 +1,112 @@
+"""Referential integrity benchmark: foreign-key probes of fact chunks against a dimension key index.
+
+Builds a dimension of ``--dim-keys`` customer ids and streams ``--rows``
+fact rows (ids drawn past the dimension's end for ``--orphan-pct`` of them)
+through:
+
+* ``isin``       — ``Series.isin`` against the dimension's materialized values,
+  what in_set reference rules did before;
+* ``index``      — ``KeyIndex`` loaded in memory;
+* ``index-mmap`` — the same index built and probed under a memory budget
+  smaller than the index, so it spills while building and is memory-mapped.
+
+Reports build / reopen seconds, probe rows/s and checks every method finds
+the same orphans. ``--key-type str`` uses ``C<id>`` codes; ``isin`` is then
+an order of magnitude slower, so keep ``--rows`` small.
+
+    python benchmarks/ref_integrity.py --dim-keys 5000000 --rows 50000000
+    python benchmarks/ref_integrity.py --key-type str --rows 2000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import ref_integrity  # noqa: E402
+
+
+def as_keys(ids, key_type):
+    return ids if key_type == "int" else pd.Series(ids).astype(str).radd("C")
+
+
+def dimension_chunks(keys, chunk_rows, key_type):
+    for start in range(0, keys, chunk_rows):
+        yield pd.DataFrame({"customer_id": as_keys(np.arange(start + 1, min(start + chunk_rows, keys) + 1), key_type)})
+
+
+def fact_chunks(rows, dim_keys, orphan_pct, chunk_rows, key_type, seed=42):
+    rng = np.random.default_rng(seed)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        ids = rng.integers(1, dim_keys + 1, n)
+        orphan = rng.random(n) < orphan_pct / 100
+        ids[orphan] += dim_keys
+        yield pd.DataFrame({"customer_id": as_keys(ids, key_type)})
+
+
+def probe(orphans, chunks):
+    found, seconds = 0, 0.0
+    for chunk in chunks:
+        start = time.perf_counter()
+        found += int(orphans(chunk["customer_id"]).sum())
+        seconds += time.perf_counter() - start
+    return found, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dim-keys", type=int, default=2_000_000)
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--orphan-pct", type=float, default=0.5)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--key-type", choices=("int", "str"), default="int")
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    results = {"dim_keys": args.dim_keys, "rows": args.rows, "orphan_pct": args.orphan_pct, "key_type": args.key_type,
+               "runs": []}
+    print(f"dimension={args.dim_keys:,} {args.key_type} keys  fact={args.rows:,} rows  orphans≈{args.orphan_pct}%")
+    with tempfile.TemporaryDirectory() as tmp:
+        values = pd.Index(as_keys(np.arange(1, args.dim_keys + 1), args.key_type))
+        methods = [("isin", None, lambda s: (~s.isin(values) & s.notna()).to_numpy())]
+        for name, memory_bytes in (("index", ref_integrity.DEFAULT_MEMORY_BYTES << 4), ("index-mmap", args.dim_keys * 2)):
+            path = os.path.join(tmp, name)
+            start = time.perf_counter()
+            ref_integrity.build_index(dimension_chunks(args.dim_keys, 500_000, args.key_type), "customer_id", path,
+                                      memory_bytes=memory_bytes)
+            build_s = time.perf_counter() - start
+            start = time.perf_counter()
+            index = ref_integrity.KeyIndex(path, memory_bytes)
+            methods.append((name, {"build_s": round(build_s, 2), "open_s": round(time.perf_counter() - start, 3),
+                                   "mode": index.mode, "spills": index.meta["spills"]}, index.orphans))
+
+        expected = None
+        for name, built, orphans in methods:
+            chunks = fact_chunks(args.rows, args.dim_keys, args.orphan_pct, args.chunk_rows, args.key_type)
+            found, seconds = probe(orphans, chunks)
+            if expected is None:
+                expected = found
+            elif found != expected:
+                raise SystemExit(f"{name}: {found:,} orphans, expected {expected:,}")
+            run = {"method": name, "orphans": found, "probe_s": round(seconds, 2), "rows_per_s": round(args.rows / seconds),
+                   **(built or {})}
+            results["runs"].append(run)
+            print(f"{name:<11} {run['rows_per_s']:>12,} rows/s  {found:>10,} orphans"
+                  + (f"  build {built['build_s']}s ({built['spills']} spills), reopen {built['open_s']}s, {built['mode']}"
+                     if built else ""))
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
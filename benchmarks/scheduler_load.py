@@ -0,0 +1,99 @@
+"""Scheduler load benchmark: hundreds of short-interval jobs on one worker pool.
+
+Registers N jobs that sleep for a random share of their interval (some longer
+than it, so runs overlap), runs the scheduler for a while and reports:
+
+* completed / dropped (``skipped``) runs and the dispatch rate;
+* peak threads in flight — never above ``--workers``;
+* peak concurrent runs of any one job — never above its ``max_concurrency``;
+* tick latency (time to queue due slots and dispatch).
+
+    python benchmarks/scheduler_load.py --jobs 500 --workers 8 --seconds 20
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import scheduler  # noqa: E402
+
+_lock = threading.Lock()
+_in_flight = Counter()
+_peaks = {"total": 0, "per_job": 0}
+
+
+@scheduler.task("benchmark_sleep")
+def sleep_task(params):
+    with _lock:
+        _in_flight[params["job"]] += 1
+        _peaks["per_job"] = max(_peaks["per_job"], _in_flight[params["job"]])
+        _peaks["total"] = max(_peaks["total"], sum(_in_flight.values()))
+    try:
+        time.sleep(params["sleep_s"])
+    finally:
+        with _lock:
+            _in_flight[params["job"]] -= 1
+    return {"records": 1}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--interval", type=float, default=5, help="job interval in seconds")
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        sched = scheduler.Scheduler(os.path.join(tmp, "scheduler.db"), workers=args.workers, tick_s=0.25)
+        now = time.time()
+        for i in range(args.jobs):
+            name = f"job_{i:04d}"
+            sched.add_job(name, "benchmark_sleep", {"job": name, "sleep_s": rng.uniform(0, 0.04)},
+                          interval_s=args.interval, start_at=now + rng.uniform(0, args.interval))
+        ticks = []
+        start = time.perf_counter()
+        while time.perf_counter() - start < args.seconds:
+            tick_start = time.perf_counter()
+            sched.tick()
+            ticks.append((time.perf_counter() - tick_start) * 1000)
+            time.sleep(sched.tick_s)
+        elapsed = time.perf_counter() - start
+        history = sched.history(limit=10 ** 9)
+        sched.stop()
+
+    counts = history["status"].value_counts().to_dict()
+    results = {
+        "jobs": args.jobs,
+        "workers": args.workers,
+        "seconds": round(elapsed, 1),
+        "runs_ok": int(counts.get("ok", 0)),
+        "runs_skipped": int(counts.get("skipped", 0)),
+        "runs_per_s": round(counts.get("ok", 0) / elapsed, 1),
+        "peak_in_flight": _peaks["total"],
+        "peak_per_job": _peaks["per_job"],
+        "tick_median_ms": round(statistics.median(ticks), 2),
+        "tick_max_ms": round(max(ticks), 2),
+    }
+    print(f"jobs={args.jobs}  workers={args.workers}  {elapsed:.1f} s")
+    print(f"ok {results['runs_ok']:,} ({results['runs_per_s']}/s)   skipped {results['runs_skipped']:,}   "
+          f"peak in flight {results['peak_in_flight']}   peak per job {results['peak_per_job']}")
+    print(f"tick median {results['tick_median_ms']} ms   max {results['tick_max_ms']} ms")
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""Streaming consumer benchmark: micro-batched events through the ingestion pipeline.
+
+Pre-fills a backlog of N synthetic sales events as NDJSON (an in-memory topic,
+or ``--file`` for the file-tail stand-in), then consumes it with
+``StreamSource`` + ``Pipeline`` at several micro-batch sizes, reporting
+events/sec end to end (offsets committed once each batch is durable) into:
+
+* ``discard`` — a target that drops batches (consumer + decode + quality cost);
+* ``column_store`` — the local lake target;
+* ``sql_engine`` — the in-process SQLite engine.
+
+    python benchmarks/stream_consumer.py --events 500000 --batches 10000,50000,100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import pipeline, quality, streaming, synthetic  # noqa: E402
+from core.column_store import ColumnStore  # noqa: E402
+from core.sql_engine import SQLEngine  # noqa: E402
+
+
+class DiscardTarget:
+    def append(self, name, frame, replace=False):
+        pass
+
+    def create_indexes(self, name, columns):
+        pass
+
+
+def consume(make_consumer, target, batch_records, events):
+    # Stop on the event count, not on idleness, so the tail's idle wait isn't timed
+    source = streaming.StreamSource(make_consumer(), batch_records=batch_records, max_records=events)
+    start = time.perf_counter()
+    result = pipeline.Pipeline(source, target, "stream_events", checks=(quality.QualityRunner(),), replace=False).run()
+    seconds = time.perf_counter() - start
+    return {"events": source.committed, "seconds": round(seconds, 2), "events_per_s": round(result["records"] / seconds)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500_000)
+    parser.add_argument("--batches", default="10000,50000,100000", help="comma-separated micro-batch sizes")
+    parser.add_argument("--file", action="store_true", help="consume an NDJSON file tail instead of an in-memory topic")
+    parser.add_argument("--out", default=None, help="optional JSON results file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        topic = streaming.MemoryTopic(retention=args.events)
+        for chunk in synthetic.iter_chunks("sales_transactions", args.events, chunk_rows=50_000):
+            topic.produce(streaming.encode_frame(chunk))
+        topic.close()
+        if args.file:
+            path = os.path.join(tmp, "events.ndjson")
+            with open(path, "wb") as fh:
+                fh.write(b"\n".join(topic.events) + b"\n")
+        produce_s = time.perf_counter() - start
+        print(f"events={args.events:,}  produced in {produce_s:.1f} s  source={'file tail' if args.file else 'memory topic'}")
+
+        results = {"events": args.events, "source": "file" if args.file else "memory", "runs": []}
+        for batch_records in [int(size) for size in args.batches.split(",")]:
+            targets = {
+                "discard": DiscardTarget(),
+                "column_store": ColumnStore(os.path.join(tmp, "store")),
+                "sql_engine": SQLEngine(),
+            }
+            for name, target in targets.items():
+                group = f"{name}-{batch_records}"
+                if args.file:
+                    make_consumer = lambda: streaming.FileTailConsumer(path, group, offset_dir=os.path.join(tmp, "offsets"))  # noqa: E731
+                else:
+                    make_consumer = lambda: streaming.MemoryConsumer(topic, group)  # noqa: E731
+                run = {"target": name, "batch_records": batch_records, **consume(make_consumer, target, batch_records, args.events)}
+                results["runs"].append(run)
+                print(f"batch {batch_records:>7,}  {name:<13} {run['events_per_s']:>10,} events/s   ({run['seconds']} s)")
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
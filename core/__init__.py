@@ -0,0 +1 @@
+# core/__init__.py
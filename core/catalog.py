@@ -0,0 +1,199 @@
+import bisect
+import re
+import threading
+from array import array
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# ─── Catalog Search Index ────────────────────────────────────────────────────
+# Inverted index over catalog entries — one per dataset and one per column —
+# updated as datasets are registered. A query token matches vocabulary tokens
+# three ways, each discounting the posting weight:
+#
+#   exact   "revenue"  → revenue
+#   prefix  "rev"      → revenue, reverse_… (sorted vocabulary + bisect; last token only, as typed)
+#   fuzzy   "reveneu"  → revenue (one edit, transpositions included; deletion-neighbourhood lookup)
+#
+# Postings are append-only ``array`` buffers viewed as NumPy arrays at query
+# time; each query token keeps its best-matching variant per entry
+# (``np.maximum.at`` over entry ids) and the tokens' scores are summed. Entries
+# matching every query token rank first, then by score. Re-registering a
+# dataset tombstones its old entries; once tombstones make up COMPACT_SHARE of
+# the index (and at least COMPACT_MIN of them), it is rebuilt from the live
+# entries, so repeated re-registration neither grows the postings nor skews idf.
+
+FIELD_WEIGHTS = {"dataset": 3.0, "column": 2.0, "domain": 1.5, "owner": 1.0}
+MATCH_WEIGHTS = {"exact": 1.0, "prefix": 0.7, "fuzzy": 0.5}
+MAX_EXPANSIONS = 64  # vocabulary tokens one prefix / typo may expand to
+MIN_FUZZY_LENGTH = 4
+COMPACT_SHARE = 0.5
+COMPACT_MIN = 1024
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return _TOKEN.findall(str(text).lower().replace("_", " "))
+
+
+def _deletes(token):
+    return {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def edit_distance_within_one(a, b):
+    """True when ``a`` and ``b`` differ by at most one insert, delete, substitute or adjacent swap."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (a[i:i + 2] == b[i:i + 2][::-1] and a[i + 2:] == b[i + 2:])
+    return a[i + 1:] == b[i:] if la > lb else a[i:] == b[i + 1:]
+
+
+class CatalogIndex:
+    """Incrementally built search index over catalog entries (plain dicts)."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.entries = []
+        self._dead = 0
+        self._alive = array("b")
+        self._datasets = defaultdict(list)  # dataset → entry ids
+        self._postings = {}  # token → (array of int64 entry ids, array of float32 weights)
+        self._vocab = []  # sorted, for prefix lookup
+        self._deletes = defaultdict(set)  # token with one char removed → tokens
+
+    def __len__(self):
+        return len(self.entries) - self._dead
+
+    def __contains__(self, dataset):
+        return dataset in self._datasets
+
+    # ─── Registration ──
+    def _add_token(self, token, entry_id, weight):
+        posting = self._postings.get(token)
+        if posting is None:
+            posting = self._postings[token] = (array("q"), array("f"))
+            bisect.insort(self._vocab, token)
+            if len(token) >= MIN_FUZZY_LENGTH:
+                for variant in _deletes(token):
+                    self._deletes[variant].add(token)
+        posting[0].append(entry_id)
+        posting[1].append(weight)
+
+    def add(self, entry):
+        """Index one entry; ``dataset`` / ``column`` / ``domain`` / ``owner`` fields are searchable."""
+        with self._lock:
+            entry_id = len(self.entries)
+            self.entries.append(entry)
+            self._alive.append(1)
+            self._datasets[entry.get("dataset")].append(entry_id)
+            weights = {}
+            for field, field_weight in FIELD_WEIGHTS.items():
+                for token in tokenize(entry.get(field) or ""):
+                    weights[token] = max(weights.get(token, 0.0), field_weight)
+            norm = 1 / (1 + 0.1 * len(weights))  # short entries match more specifically
+            for token, weight in weights.items():
+                self._add_token(token, entry_id, weight * norm)
+            return entry_id
+
+    def remove_dataset(self, dataset):
+        with self._lock:
+            for entry_id in self._datasets.pop(dataset, ()):
+                self._alive[entry_id] = 0
+                self._dead += 1
+            if self._dead >= COMPACT_MIN and self._dead >= COMPACT_SHARE * len(self.entries):
+                self.compact()
+
+    def compact(self):
+        """Rebuild the index from its live entries, dropping tombstones; entry ids are renumbered."""
+        with self._lock:
+            live = [entry for entry, alive in zip(self.entries, self._alive) if alive]
+            self._reset()
+            for entry in live:
+                self.add(entry)
+
+    def register_dataset(self, dataset, columns=(), **fields):
+        """(Re-)register ``dataset`` with one entry for itself and one per column."""
+        with self._lock:
+            self.remove_dataset(dataset)
+            self.add({"dataset": dataset, "column": None, **fields})
+            for column in columns:
+                self.add({"dataset": dataset, "column": str(column), "domain": fields.get("domain"), "owner": fields.get("owner")})
+
+    # ─── Lookup ──
+    def expand(self, token, prefix=False):
+        """``[(vocabulary token, match weight)]`` for one query token."""
+        matches = {}
+        if token in self._postings:
+            matches[token] = MATCH_WEIGHTS["exact"]
+        if prefix:
+            start = bisect.bisect_left(self._vocab, token)
+            for candidate in self._vocab[start:start + MAX_EXPANSIONS]:
+                if not candidate.startswith(token):
+                    break
+                matches.setdefault(candidate, MATCH_WEIGHTS["prefix"])
+        if len(token) >= MIN_FUZZY_LENGTH and len(matches) < MAX_EXPANSIONS:
+            candidates = set(self._deletes.get(token, ()))  # vocabulary token has one extra char
+            for variant in _deletes(token):
+                if variant in self._postings:  # query has one extra char
+                    candidates.add(variant)
+                candidates.update(self._deletes.get(variant, ()))  # substitutions and swaps
+            for candidate in sorted(candidates)[:MAX_EXPANSIONS]:
+                if candidate not in matches and edit_distance_within_one(token, candidate):
+                    matches[candidate] = MATCH_WEIGHTS["fuzzy"]
+        return list(matches.items())
+
+    def search(self, query, limit=50):
+        """Ranked ``[(entry, score, matched_tokens)]``; the last query token is treated as a prefix."""
+        tokens = tokenize(query)
+        with self._lock:
+            n = len(self.entries)
+            if not tokens or not n:
+                return []
+            total = np.zeros(n)
+            coverage = np.zeros(n, dtype=np.int32)
+            tokens = list(dict.fromkeys(tokens))
+            for position, token in enumerate(tokens):
+                ids, weights = [], []
+                for vocab_token, match_weight in self.expand(token, prefix=position == len(tokens) - 1):
+                    posting_ids, posting_weights = self._postings[vocab_token]
+                    idf = np.log(1 + n / len(posting_ids))
+                    ids.append(np.frombuffer(posting_ids, dtype=np.int64))
+                    weights.append(np.frombuffer(posting_weights, dtype=np.float32) * (idf * match_weight))
+                if not ids:
+                    continue
+                ids = np.concatenate(ids)
+                scores = np.zeros(n)
+                np.maximum.at(scores, ids, np.concatenate(weights))  # best variant per entry, not the sum
+                total += scores
+                coverage += scores > 0
+            alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+            hits = np.flatnonzero((coverage > 0) & alive)
+            if not len(hits):
+                return []
+            # Entries matching more query tokens first, then by score
+            rank = coverage[hits] * (total.max() + 1) + total[hits]
+            if len(hits) > limit:
+                keep = np.argpartition(-rank, limit - 1)[:limit]
+                hits, rank = hits[keep], rank[keep]
+            top = hits[np.argsort(-rank, kind="stable")]
+            return [(self.entries[i], float(total[i]), int(coverage[i])) for i in top]
+
+    def search_frame(self, query, limit=50):
+        """``search`` as a DataFrame of the matched entries plus ``score``."""
+        results = self.search(query, limit)
+        return pd.DataFrame([{**entry, "score": round(score, 3)} for entry, score, _ in results])
+
+
+CATALOG = CatalogIndex()
@@ -0,0 +1,121 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+# ─── Chat History Store ──────────────────────────────────────────────────────
+# Sessions keep only text and references: the question, its fingerprint, the
+# generated SQL and a result key. Heavy artifacts (figures, frames) live in a
+# single process-wide LRU cache and are rebuilt from the result key on demand.
+
+DEFAULT_MAX_MESSAGES = 40
+DEFAULT_MAX_BYTES = 64 * 1024
+
+
+def fingerprint(question):
+    normalized = " ".join(question.lower().split())
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _message_bytes(msg):
+    return sum(len(v.encode("utf-8")) if isinstance(v, str) else 8 for v in msg.values()) + 64
+
+
+class ChatHistory:
+    """Per-session chat log capped by message count and estimated bytes.
+
+    The first message (the greeting) is pinned; the oldest exchanges are
+    dropped once either cap is exceeded.
+    """
+
+    def __init__(self, greeting, max_messages=DEFAULT_MAX_MESSAGES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self._next_id = 0
+        self._bytes = 0
+        self.messages = []
+        self._append({"role": "bot", "content": greeting})
+
+    def _append(self, msg):
+        msg["id"] = self._next_id
+        self._next_id += 1
+        self.messages.append(msg)
+        self._bytes += _message_bytes(msg)
+        while len(self.messages) > 1 and (len(self.messages) > self.max_messages or self._bytes > self.max_bytes):
+            self._bytes -= _message_bytes(self.messages.pop(1))
+        return msg
+
+    def add_user(self, question):
+        return self._append({"role": "user", "content": question, "fingerprint": fingerprint(question)})
+
+    def add_bot(self, question, content, sql, result_key):
+        return self._append({
+            "role": "bot",
+            "content": content,
+            "sql": sql,
+            "fingerprint": fingerprint(question),
+            "result_key": result_key,
+        })
+
+    def last_bot_id(self):
+        for msg in reversed(self.messages):
+            if msg.get("result_key"):
+                return msg["id"]
+        return None
+
+    def clear(self):
+        del self.messages[1:]
+        self._bytes = _message_bytes(self.messages[0])
+
+    def footprint(self):
+        return {"messages": len(self.messages), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+# ─── Shared Result Cache ─────────────────────────────────────────────────────
+class ResultCache:
+    """Thread-safe LRU of rebuilt artifacts, bounded by entry count and bytes.
+
+    ``builder`` returns ``(value, nbytes)``; the size is the caller's estimate
+    and is only used for eviction and reporting.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, builder):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value, nbytes = builder()
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, nbytes)
+                self._bytes += nbytes
+                while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._bytes -= evicted
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def footprint(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,451 @@
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends copy the previous version instead of linking it
+    fcntl = None
+
+# ─── Columnar Dataset Store ──────────────────────────────────────────────────
+# Local stand-in for lake targets (Data Lake, Delta Lake) in development. Each
+# dataset version is a directory with one ``.npy`` file per column, published
+# by atomically replacing the dataset's ``manifest.json``. Readers open columns
+# with ``np.load(mmap_mode="r")`` so only the columns (and row ranges) a page
+# touches are paged in, and the OS page cache is shared by every worker
+# instead of each holding a copy. The previous version is kept for readers
+# that opened it before a reload.
+#
+# An append run hard-links the current version's column files into the new
+# version and appends past the rows that version's manifest counts, so
+# carrying a dataset forward costs O(new rows), not O(dataset). Readers only
+# map the rows their manifest lists, and a re-encode writes a new file, so a
+# published version never changes. One appender per dataset links (it holds
+# ``APPEND_LOCK``); a concurrent one copies.
+#
+# Text columns are dictionary-encoded: int32 codes (-1 = null) in the ``.npy``
+# plus the distinct values in ``<column>.dict.json``.
+#
+#     <root>/<dataset>/manifest.json
+#     <root>/<dataset>/v<N>/<column>.npy
+#     <root>/<dataset>/v<N>/<column>.dict.json
+
+DEFAULT_ROOT = os.environ.get("SMARTHUB_STORE_DIR", os.path.join("data", "store"))
+MANIFEST = "manifest.json"
+APPEND_LOCK = ".append.lock"
+_HEADER_BYTES = 128  # fixed .npy v1 header, rewritten with the final row count on close
+REWRITE_ROWS = 1 << 20
+
+
+def _npy_header(dtype, rows):
+    header = repr({"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (rows,)})
+    header = header.ljust(_HEADER_BYTES - 10 - 1) + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1")
+
+
+def _copy_head(source, destination, size):
+    # Only the first ``size`` bytes: a linked appender may be extending ``source``
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        while size > 0:
+            block = src.read(min(size, 16 << 20))
+            if not block:
+                break
+            dst.write(block)
+            size -= len(block)
+
+
+def _try_append_lock(root):
+    """Exclusive non-blocking lock on the dataset's appender lock file, or ``None`` if taken."""
+    if fcntl is None:
+        return None
+    fh = open(os.path.join(root, APPEND_LOCK), "a")
+    try:
+        fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        fh.close()
+        return None
+    return fh
+
+
+def _column_file(name):
+    # Column names become file names; keep them portable
+    return "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in str(name))
+
+
+# ─── Writing ─────────────────────────────────────────────────────────────────
+def _wider(have, new):
+    """The dtype holding both ``have`` and ``new`` values, or ``None`` if only text can."""
+    if have.kind in "biuf" and new.kind in "biuf" or have.kind == new.kind == "M":
+        return np.result_type(have, new)
+    return None
+
+
+def _as_text(series):
+    # One dictionary entry per distinct text, whatever type a chunk held it as (5 and "5" alike)
+    return series.astype(str).where(series.notna())
+
+
+class _ColumnWriter:
+    """One column's ``.npy``, appended chunk by chunk.
+
+    A chunk the column's type can't hold re-encodes the rows written so far
+    instead of failing: to a wider number type (int16 → int64 → float64, or
+    a finer datetime unit), or to dictionary-encoded text.
+    """
+
+    def __init__(self, directory, name, series, backfill=0):
+        self.name = name
+        self.file = _column_file(name)
+        self.path = os.path.join(directory, self.file + ".npy")
+        self.rows = 0
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_dtype(series):
+            self.kind = "fixed"
+            self.dtype = series.to_numpy().dtype  # datetimes keep their unit (pandas 3 parses to [us])
+            self.codes = None
+        else:
+            self.kind = "dictionary"
+            self.dtype = np.dtype(np.int32)
+            self.codes = {}
+        if backfill and self.kind == "fixed" and self.dtype.kind not in "fM":
+            raise ValueError(f"column {name!r} first appears after {backfill:,} rows, and {self.dtype} has no null for them")
+        self._fh = open(self.path, "wb")
+        self._fh.write(_npy_header(self.dtype, 0))
+        if backfill:
+            # A column that appears mid-dataset is null for the rows already written
+            null = -1 if self.kind == "dictionary" else np.array("NaT" if self.dtype.kind == "M" else np.nan, dtype=self.dtype)
+            self._fh.write(np.full(backfill, null, dtype=self.dtype).tobytes())
+            self.rows = backfill
+
+    def write(self, series):
+        if self.kind == "fixed":
+            values = series.to_numpy()
+            if values.dtype != self.dtype:
+                cast = values.astype(self.dtype) if np.can_cast(values.dtype, self.dtype, casting="same_kind") else None
+                # Narrowing (e.g. int64 chunk into an int16 column) only when no value changes
+                if cast is not None and not series.isna().any() and np.array_equal(cast, values):
+                    values = cast
+                elif _wider(self.dtype, values.dtype) is not None:
+                    wider = _wider(self.dtype, values.dtype)
+                    self._rewrite(wider, lambda block: block.astype(wider))
+                    values = values.astype(wider)
+                else:
+                    self._rewrite(np.dtype(np.int32), lambda block: self._encode(_as_text(pd.Series(block))), "dictionary")
+        if self.kind == "dictionary":
+            values = self._encode(series if pd.api.types.is_string_dtype(series.dtype) else _as_text(series))
+        self._fh.write(np.ascontiguousarray(values).tobytes())
+        self.rows += len(values)
+
+    def _encode(self, series):
+        # Chunk-local factorize, then map the chunk's uniques onto the global dictionary
+        local, uniques = pd.factorize(series.astype("object"), use_na_sentinel=True)
+        mapping = np.fromiter(
+            (self.codes.setdefault(value, len(self.codes)) for value in uniques),
+            dtype=np.int32, count=len(uniques),
+        )
+        return np.where(local >= 0, mapping[np.maximum(local, 0)] if len(mapping) else -1, -1).astype(np.int32)
+
+    def _rewrite(self, dtype, convert, kind="fixed"):
+        """Re-encode the rows written so far as ``dtype``, block by block."""
+        if kind == "dictionary":
+            self.kind, self.codes = kind, {}
+        self._fh.flush()
+        tmp = self.path + ".tmp"
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            dst.write(_npy_header(dtype, 0))
+            src.seek(_HEADER_BYTES)
+            for start in range(0, self.rows, REWRITE_ROWS):
+                block = np.fromfile(src, dtype=self.dtype, count=min(REWRITE_ROWS, self.rows - start))
+                dst.write(np.ascontiguousarray(convert(block), dtype=dtype).tobytes())
+        self._fh.close()
+        os.replace(tmp, self.path)
+        self._fh = open(self.path, "r+b")
+        self._fh.seek(0, os.SEEK_END)
+        self.dtype = dtype
+
+    @classmethod
+    def resume(cls, directory, name, meta, source, rows, link=False):
+        """A writer that continues column ``name`` of the ``rows``-row dataset version in ``source``.
+
+        With ``link`` the file is hard-linked into ``directory`` (falling back
+        to a copy where links aren't supported); the caller must hold the
+        dataset's append lock.
+        """
+        writer = cls.__new__(cls)
+        writer.name = name
+        writer.file = _column_file(name)
+        writer.path = os.path.join(directory, writer.file + ".npy")
+        writer.kind = meta["kind"]
+        writer.dtype = np.dtype(meta["dtype"])
+        writer.codes = None
+        if writer.kind == "dictionary":
+            with open(os.path.join(source, meta["dictionary"])) as fh:
+                writer.codes = {value: code for code, value in enumerate(json.load(fh))}
+        size = _HEADER_BYTES + rows * writer.dtype.itemsize
+        if link:
+            try:
+                os.link(os.path.join(source, meta["file"]), writer.path)
+            except OSError:
+                link = False
+        if not link:
+            _copy_head(os.path.join(source, meta["file"]), writer.path, size)
+        writer.rows = rows
+        writer._fh = open(writer.path, "r+b")
+        writer._fh.truncate(size)  # drop rows an aborted append left past the published ones
+        writer._fh.seek(size)
+        return writer
+
+    def discard(self):
+        self._fh.close()
+
+    def close(self, directory):
+        self._fh.seek(0)
+        self._fh.write(_npy_header(self.dtype, self.rows))
+        self._fh.close()
+        meta = {"file": self.file + ".npy", "dtype": self.dtype.str, "kind": self.kind}
+        if self.kind == "dictionary":
+            meta["dictionary"] = self.file + ".dict.json"
+            with open(os.path.join(directory, meta["dictionary"]), "w") as fh:
+                json.dump([str(value) for value in self.codes], fh)
+        return meta
+
+
+class _DatasetWriter:
+    def __init__(self, root, version):
+        self.root = root
+        # Claim the first free version directory: ``mkdir`` is atomic, so two
+        # writers (threads or processes) never share or clobber a directory
+        while True:
+            self.directory = os.path.join(root, f"v{version}")
+            try:
+                os.mkdir(self.directory)
+                break
+            except FileExistsError:
+                version += 1
+        self.version = version
+        self.columns = OrderedDict()
+        self.rows = 0
+        self._append_lock = None
+
+    def carry_forward(self, dataset):
+        """Start from ``dataset``'s rows, so appends extend it instead of replacing it."""
+        self._append_lock = _try_append_lock(self.root)
+        for name, meta in dataset.manifest["columns"].items():
+            self.columns[name] = _ColumnWriter.resume(self.directory, name, meta, dataset.directory, dataset.rows,
+                                                      link=self._append_lock is not None)
+        self.rows = dataset.rows
+
+    def _unlock(self):
+        if self._append_lock is not None:
+            self._append_lock.close()
+            self._append_lock = None
+
+    def append(self, frame):
+        if not self.columns:
+            for name in frame.columns:
+                self.columns[name] = _ColumnWriter(self.directory, name, frame[name])
+        elif list(frame.columns) != list(self.columns):
+            if list(frame.columns[:len(self.columns)]) != list(self.columns):
+                raise ValueError("chunk columns differ from the dataset's columns")
+            # A source whose schema widened (see core.json_reader) adds columns at the end
+            for name in frame.columns[len(self.columns):]:
+                self.columns[name] = _ColumnWriter(self.directory, name, frame[name], backfill=self.rows)
+        for name, writer in self.columns.items():
+            writer.write(frame[name])
+        self.rows += len(frame)
+
+    def commit(self, name):
+        manifest = {
+            "name": name,
+            "rows": self.rows,
+            "version": self.version,
+            "data": f"v{self.version}",
+            "columns": {str(col): writer.close(self.directory) for col, writer in self.columns.items()},
+        }
+        manifest_path = os.path.join(self.root, MANIFEST)
+        replaced = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as fh:
+                replaced = json.load(fh)
+            manifest["previous"] = replaced["data"]
+        tmp = os.path.join(self.root, f"{MANIFEST}.{self.version}.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(manifest, fh, indent=2)
+        os.replace(tmp, manifest_path)
+        # Keep the version just replaced for readers that still have it open;
+        # drop the one before it. Other writers' unpublished versions are never touched.
+        stale = replaced and replaced.get("previous")
+        if stale and stale not in (manifest["data"], manifest["previous"]):
+            shutil.rmtree(os.path.join(self.root, stale), ignore_errors=True)
+        self._unlock()
+        return manifest
+
+    def abort(self):
+        for writer in self.columns.values():
+            writer.discard()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._unlock()
+
+
+class ColumnStore:
+    """Directory of columnar datasets.
+
+    Works as a pipeline target (``append`` per chunk, then ``commit`` to
+    publish the manifest or ``abort`` to discard the unpublished version) and
+    as a reader via ``open``. A dataset becomes visible to readers only once
+    its manifest is written. Appending without ``replace`` to a published
+    dataset copies its current version forward first, so the new version
+    holds the earlier rows too.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._writers = {}
+        self._lock = threading.Lock()
+
+    def connect(self):
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def append(self, name, frame, replace=False):
+        with self._lock:
+            writer = self._writers.get(name)
+            if writer is None or replace:
+                if writer is not None:
+                    writer.abort()
+                directory = self.path(name)
+                os.makedirs(directory, exist_ok=True)
+                current = Dataset(directory) if os.path.exists(os.path.join(directory, MANIFEST)) else None
+                writer = self._writers[name] = _DatasetWriter(directory, current.version + 1 if current else 1)
+                if current is not None and not replace:
+                    writer.carry_forward(current)
+            writer.append(frame)
+
+    def create_indexes(self, name, columns):
+        # Columns are scanned positionally; nothing to index
+        pass
+
+    def commit(self):
+        with self._lock:
+            while self._writers:
+                name, writer = self._writers.popitem()
+                try:
+                    writer.commit(name)
+                except Exception:
+                    writer.abort()
+                    raise
+
+    def abort(self):
+        with self._lock:
+            for writer in self._writers.values():
+                writer.abort()
+            self._writers.clear()
+
+    def close(self):
+        # Anything neither committed nor aborted by now is discarded
+        self.abort()
+
+    def write(self, name, frame):
+        """Write ``frame`` as dataset ``name`` in one go."""
+        self.append(name, frame, replace=True)
+        self.commit()
+        return self.open(name)
+
+    def datasets(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            entry.name for entry in os.scandir(self.root)
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, MANIFEST))
+        )
+
+    def open(self, name):
+        return open_dataset(self.path(name))
+
+
+# ─── Reading ─────────────────────────────────────────────────────────────────
+class Dataset:
+    """Read-only view of one dataset; columns are memory-mapped on first access."""
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, MANIFEST)) as fh:
+            self.manifest = json.load(fh)
+        self.directory = os.path.join(directory, self.manifest["data"])
+        self.version = self.manifest["version"]
+        self.name = self.manifest["name"]
+        self.rows = self.manifest["rows"]
+        self.columns = list(self.manifest["columns"])
+        self._arrays = {}
+        self._dictionaries = {}
+
+    def __len__(self):
+        return self.rows
+
+    def array(self, column):
+        """Raw memory-mapped array: values, or dictionary codes for text columns. No copy."""
+        array = self._arrays.get(column)
+        if array is None:
+            meta = self.manifest["columns"][column]
+            # Later appends may have extended a linked file; this version is its first ``rows``
+            array = np.load(os.path.join(self.directory, meta["file"]), mmap_mode="r")[:self.rows]
+            self._arrays[column] = array
+        return array
+
+    def dictionary(self, column):
+        values = self._dictionaries.get(column)
+        if values is None:
+            meta = self.manifest["columns"][column]
+            with open(os.path.join(self.directory, meta["dictionary"])) as fh:
+                values = self._dictionaries[column] = pd.Index(json.load(fh))
+        return values
+
+    def is_text(self, column):
+        return self.manifest["columns"][column]["kind"] == "dictionary"
+
+    def column(self, column, rows=None):
+        """One column as a Series; ``rows`` is an optional slice, so only that range is paged in."""
+        data = self.array(column)
+        if rows is not None:
+            data = data[rows]
+        if self.is_text(column):
+            values = pd.Categorical.from_codes(np.asarray(data), categories=self.dictionary(column), validate=False)
+            return pd.Series(values, name=column)
+        return pd.Series(np.asarray(data), name=column)
+
+    def read(self, columns=None, rows=None):
+        """DataFrame of just ``columns`` (default: all), optionally limited to a row slice."""
+        return pd.DataFrame({col: self.column(col, rows) for col in (columns or self.columns)})
+
+    def mapped_bytes(self, columns=None):
+        return sum(self.array(col).nbytes for col in (columns or self.columns))
+
+
+_open_datasets = OrderedDict()
+_open_lock = threading.Lock()
+MAX_OPEN_DATASETS = 32
+
+
+def open_dataset(directory):
+    """Process-wide cache of open datasets, refreshed when the manifest changes."""
+    manifest = os.path.join(directory, MANIFEST)
+    if not os.path.exists(manifest):
+        raise FileNotFoundError(f"no dataset at {directory}")
+    key = (os.path.abspath(directory), os.stat(manifest).st_mtime_ns)
+    with _open_lock:
+        dataset = _open_datasets.get(key)
+        if dataset is not None:
+            _open_datasets.move_to_end(key)
+            return dataset
+    dataset = Dataset(directory)
+    with _open_lock:
+        _open_datasets[key] = dataset
+        while len(_open_datasets) > MAX_OPEN_DATASETS:
+            _open_datasets.popitem(last=False)
+    return dataset
+
@@ -0,0 +1,83 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import streamlit as st
+
+# ─── Batched HTML Components ─────────────────────────────────────────────────
+# A spec describes a whole grid or list declaratively:
+#
+#   {
+#       "layout": "grid",            # "grid" or "list"
+#       "columns": 4,                # grid only
+#       "title": "🗄️ Databases",     # optional bold heading
+#       "template": "<div>{name} — {status}</div>",
+#       "items": [{"name": "PostgreSQL", "status": "✅ Connected"}, ...],
+#   }
+#
+# render() turns one spec — or a list of specs — into a single st.markdown
+# delta, so a 20-card grid costs one websocket message instead of twenty.
+
+HTML_CACHE_SIZE = 256
+
+_html_cache = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+_cache_lock = threading.Lock()  # every Streamlit session renders on its own thread
+
+
+def _compact(template):
+    # Indented multi-line HTML can be read as a markdown code block once it is
+    # nested inside a wrapper; collapsing to one line keeps it a raw HTML block.
+    return " ".join(line.strip() for line in template.strip().splitlines())
+
+
+def _build(spec):
+    template = _compact(spec["template"])
+    body = "".join(template.format(**item) for item in spec["items"])
+    title = spec.get("title")
+    heading = f"<div style='margin:8px 0;'><strong>{title}</strong></div>" if title else ""
+
+    if spec.get("layout", "list") == "grid":
+        columns = spec.get("columns", 4)
+        gap = spec.get("gap", "16px")
+        return (
+            f"{heading}<div style='display:grid; grid-template-columns:repeat({columns}, minmax(0, 1fr)); "
+            f"column-gap:{gap}; margin-bottom:16px;'>{body}</div>"
+        )
+    return f"{heading}<div>{body}</div>"
+
+
+def spec_key(spec):
+    payload = json.dumps(spec, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def build_html(spec):
+    """Return the HTML for a spec (or list of specs), cached by content hash."""
+    specs = spec if isinstance(spec, list) else [spec]
+    key = spec_key(specs)
+    with _cache_lock:
+        html = _html_cache.get(key)
+        if html is not None:
+            _html_cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return html
+        _cache_stats["misses"] += 1
+
+    html = "".join(_build(s) for s in specs)  # built outside the lock; a racing miss just builds it twice
+    with _cache_lock:
+        _html_cache[key] = html
+        while len(_html_cache) > HTML_CACHE_SIZE:
+            _html_cache.popitem(last=False)
+    return html
+
+
+def render(spec, container=None):
+    """Emit a spec (or list of specs) as exactly one markdown delta."""
+    (container or st).markdown(build_html(spec), unsafe_allow_html=True)
+
+
+def cache_info():
+    with _cache_lock:
+        return {"size": len(_html_cache), "max_size": HTML_CACHE_SIZE, **_cache_stats}
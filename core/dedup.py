@@ -0,0 +1,333 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.incremental import default_key
+
+# ─── Cross-run Duplicate Detection ───────────────────────────────────────────
+# ``KeyFilter`` remembers every key a table has ever loaded as 64-bit hashes,
+# in sorted, disjoint runs on disk — one ``.npy`` per committed load, merged
+# when there are more than MAX_RUNS — so checking a chunk never reloads the
+# table's history. What stays in memory depends on the key count:
+#
+#   exact   keys × 8 bytes fit in ``memory_bytes``: all runs are loaded into
+#           one sorted array and probed with ``searchsorted``
+#   bloom   only a Bloom filter (about 10 bits per key at 1% false positives,
+#           capped at ``memory_bytes``) is kept; its positives are confirmed
+#           against the memory-mapped runs, so reported duplicates are exact
+#
+# Keys first seen in the current load are collected in memory (spilled to a
+# pending run past half the budget) and only become history on ``commit()``,
+# so a failed load leaves the filter as it was.
+#
+#     <state_dir>/<table>.json            key column, mode, key count, runs, bloom
+#     <state_dir>/<table>.r<N>.npy        sorted uint64 key hashes
+#     <state_dir>/<table>.bloom<N>.npy    Bloom filter words
+
+DEFAULT_STATE_DIR = os.environ.get("SMARTHUB_DEDUP_DIR", os.path.join("data", "dedup"))
+DEFAULT_MEMORY_BYTES = 64 << 20
+FP_RATE = 0.01
+MAX_RUNS = 8
+PROBE_BLOCK = 1 << 20
+SAMPLE_ROWS = 5
+
+
+def key_hashes(series):
+    """One uint64 per non-null value, equal for equal keys whichever dtype a run read them as."""
+    values = series.dropna()
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(values.cat.categories.dtype)
+    if pd.api.types.is_bool_dtype(values):
+        values = values.astype(np.int64)
+    elif pd.api.types.is_float_dtype(values):
+        data = values.to_numpy(dtype=np.float64)
+        if np.isfinite(data).all() and (data == np.floor(data)).all():
+            values = values.astype(np.int64)  # 7.0 read from a column with nulls is the key 7
+    if pd.api.types.is_integer_dtype(values):
+        return pd.util.hash_array(values.to_numpy(dtype=np.int64))
+    return pd.util.hash_array(values.astype(str).to_numpy(dtype=object))
+
+
+def contains_sorted(sorted_keys, keys):
+    """Mask over ``keys``: True where the key is in the sorted (possibly memory-mapped) array ``sorted_keys``."""
+    found = np.zeros(len(keys), dtype=bool)
+    if not len(sorted_keys) or not len(keys):
+        return found
+    # Hashes arrive in random order; probing them sorted walks ``sorted_keys`` once instead of missing cache on every key
+    order = np.argsort(keys)
+    probe = keys[order]
+    pos = np.minimum(np.searchsorted(sorted_keys, probe), len(sorted_keys) - 1)
+    found[order] = sorted_keys[pos] == probe
+    return found
+
+
+# ─── Bloom Filter ────────────────────────────────────────────────────────────
+class BloomFilter:
+    """Bit array over uint64 words; ``hashes`` positions per key by double hashing."""
+
+    def __init__(self, bits, hashes, words=None):
+        self.bits = int(bits)
+        self.hashes = int(hashes)
+        self.words = words if words is not None else np.zeros((self.bits + 63) // 64, dtype=np.uint64)
+
+    @classmethod
+    def for_capacity(cls, keys, fp_rate=FP_RATE, max_bytes=None):
+        bits = int(-max(keys, 1) * np.log(fp_rate) / np.log(2) ** 2)
+        if max_bytes is not None:
+            bits = min(bits, max_bytes * 8)  # over budget: more false positives, still confirmed exactly
+        bits = max(bits, 64)
+        return cls(bits, max(1, round(bits / max(keys, 1) * np.log(2))))
+
+    @property
+    def nbytes(self):
+        return self.words.nbytes
+
+    def capacity(self, fp_rate=FP_RATE):
+        """Keys this filter holds at ``fp_rate``."""
+        return int(self.bits * np.log(2) ** 2 / -np.log(fp_rate))
+
+    def _positions(self, keys):
+        low = keys & np.uint64(0xFFFFFFFF)
+        step = (keys >> np.uint64(32)) | np.uint64(1)
+        rounds = np.arange(self.hashes, dtype=np.uint64)
+        return (low[:, None] + rounds[None, :] * step[:, None]) % np.uint64(self.bits)
+
+    def add(self, keys):
+        for start in range(0, len(keys), PROBE_BLOCK):
+            pos = self._positions(keys[start:start + PROBE_BLOCK]).ravel()
+            np.bitwise_or.at(self.words, pos >> np.uint64(6), np.uint64(1) << (pos & np.uint64(63)))
+
+    def contains(self, keys):
+        if not len(keys):
+            return np.zeros(0, dtype=bool)
+        pos = self._positions(keys)
+        return ((self.words[pos >> np.uint64(6)] >> (pos & np.uint64(63))) & np.uint64(1)).astype(bool).all(axis=1)
+
+
+# ─── Key Filter ──────────────────────────────────────────────────────────────
+class KeyFilter:
+    """Persistent set of a table's loaded keys: ``check`` a chunk, ``commit`` after the load."""
+
+    def __init__(self, table, key, state_dir=DEFAULT_STATE_DIR, memory_bytes=DEFAULT_MEMORY_BYTES, fp_rate=FP_RATE):
+        self.table = table
+        self.key = key
+        self.state_dir = state_dir
+        self.memory_bytes = memory_bytes
+        self.fp_rate = fp_rate
+        self.meta = {"key": key, "keys": 0, "runs": [], "bloom": None, "version": 0}
+        meta_path = self._path(table + ".json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                meta = json.load(fh)
+            if meta.get("key") == key:
+                self.meta = meta
+        self._clean()
+        self.mode = "exact" if self.meta["keys"] * 8 <= memory_bytes else "bloom"
+        self._runs = [np.load(self._path(name), mmap_mode="r") for name in self.meta["runs"]]
+        self._history = None
+        self.bloom = None
+        if self.mode == "exact":
+            self._history = np.sort(np.concatenate([np.array([], dtype=np.uint64)] + [np.asarray(run) for run in self._runs]))
+        else:
+            self.bloom = self._load_bloom()
+        self._new = np.array([], dtype=np.uint64)  # keys first seen in this load, sorted
+        self._pending = []  # spilled parts of ``_new``: (file, memory-mapped array)
+        self.stats = {"checked": 0, "in_load": 0, "history": 0, "new": 0, "bloom_positives": 0, "false_positives": 0}
+
+    def _path(self, name):
+        return os.path.join(self.state_dir, name)
+
+    def _clean(self):
+        # Pending runs of a load that never committed, and files a newer commit replaced
+        if not os.path.isdir(self.state_dir):
+            return
+        keep = set(self.meta["runs"]) | {self.meta["bloom"], self.table + ".json"}
+        for entry in os.scandir(self.state_dir):
+            if entry.name.startswith(self.table + ".") and entry.name not in keep and entry.name[len(self.table) + 1:][:1] in "rbp":
+                os.remove(entry.path)
+
+    def _load_bloom(self):
+        bloom = self.meta.get("bloom")
+        if bloom:
+            return BloomFilter(self.meta["bloom_bits"], self.meta["bloom_hashes"], np.load(self._path(bloom)))
+        return self._build_bloom(self.meta["keys"])
+
+    def _build_bloom(self, keys):
+        bloom = BloomFilter.for_capacity(2 * keys, self.fp_rate, max_bytes=self.memory_bytes)
+        for run in self._runs:
+            for start in range(0, len(run), PROBE_BLOCK):
+                bloom.add(np.asarray(run[start:start + PROBE_BLOCK]))
+        return bloom
+
+    def __len__(self):
+        return self.meta["keys"] + len(self._new) + sum(len(part) for _, part in self._pending)
+
+    @property
+    def memory(self):
+        """Bytes this filter holds in memory (memory-mapped runs excluded)."""
+        held = self._new.nbytes + (self._history.nbytes if self._history is not None else 0)
+        return held + (self.bloom.nbytes if self.bloom is not None else 0)
+
+    def _seen_before(self, keys):
+        """``(in history, Bloom positive)``; the second is ``None`` in exact mode."""
+        if self.mode == "exact":
+            return contains_sorted(self._history, keys), None
+        maybe = self.bloom.contains(keys)
+        found = np.zeros(len(keys), dtype=bool)
+        if maybe.any():
+            candidates = keys[maybe]
+            hit = np.zeros(len(candidates), dtype=bool)
+            for run in self._runs:
+                hit |= contains_sorted(run, candidates)
+            found[maybe] = hit
+        return found, maybe
+
+    def _seen_in_load(self, keys):
+        found = contains_sorted(self._new, keys)
+        for _, part in self._pending:
+            found |= contains_sorted(part, keys)
+        return found
+
+    def check(self, series):
+        """Boolean mask over ``series``: True where the key was already seen (this chunk, this load or history).
+
+        Nulls are never duplicates. Keys seen for the first time are remembered for ``commit``.
+        """
+        present = series.notna().to_numpy()
+        keys = key_hashes(series)
+        first = ~pd.Series(keys).duplicated().to_numpy()  # repeats within the chunk
+        distinct = keys[first]
+        history, maybe = self._seen_before(distinct)
+        in_load = ~history & self._seen_in_load(distinct)
+        new = distinct[~history & ~in_load]
+        if maybe is not None:
+            # This load's keys are in the Bloom filter too; only positives matching nothing are false
+            self.stats["bloom_positives"] += int(maybe.sum())
+            self.stats["false_positives"] += int((maybe & ~history & ~in_load).sum())
+
+        repeat = ~first
+        repeat[first] = history | in_load
+        self.stats["checked"] += len(keys)
+        self.stats["history"] += int(history.sum())
+        self.stats["in_load"] += int(in_load.sum() + (~first).sum())
+        self.stats["new"] += len(new)
+        self._remember(new)
+
+        mask = np.zeros(len(series), dtype=bool)
+        mask[present] = repeat
+        return mask
+
+    def _remember(self, keys):
+        if not len(keys):
+            return
+        keys = np.sort(keys)
+        # Two sorted runs: a stable sort merges them in linear time
+        self._new = np.sort(np.concatenate([self._new, keys]), kind="stable") if len(self._new) else keys
+        if self.bloom is not None:
+            self.bloom.add(keys)
+        if self._new.nbytes > self.memory_bytes // 2:
+            self._spill()
+
+    def _spill(self):
+        os.makedirs(self.state_dir, exist_ok=True)
+        name = f"{self.table}.p{self.meta['version'] + 1}-{len(self._pending)}.npy"
+        np.save(self._path(name), self._new)
+        self._pending.append((name, np.load(self._path(name), mmap_mode="r")))
+        self._new = np.array([], dtype=np.uint64)
+
+    def commit(self):
+        """Make this load's new keys part of the history; returns the number added."""
+        added = len(self) - self.meta["keys"]
+        if not added:
+            return 0
+        os.makedirs(self.state_dir, exist_ok=True)
+        version = self.meta["version"] + 1
+        parts = [np.asarray(part) for _, part in self._pending] + [self._new]
+        run_name = f"{self.table}.r{version}.npy"
+        np.save(self._path(run_name), np.sort(np.concatenate(parts)))
+        runs = self.meta["runs"] + [run_name]
+        self._runs.append(np.load(self._path(run_name), mmap_mode="r"))
+        if len(runs) > MAX_RUNS:
+            runs = self._compact(runs, version)
+        meta = {**self.meta, "keys": self.meta["keys"] + added, "runs": runs, "version": version}
+
+        if meta["keys"] * 8 <= self.memory_bytes:
+            self._history = np.sort(np.concatenate([self._history] + parts))
+        else:
+            if self.mode == "exact" or meta["keys"] > self.bloom.capacity(self.fp_rate) and self.bloom.nbytes < self.memory_bytes:
+                self.bloom = self._build_bloom(meta["keys"])  # switching modes, or outgrew its capacity
+            self.mode, self._history = "bloom", None
+            meta.update(bloom=f"{self.table}.bloom{version}.npy", bloom_bits=self.bloom.bits, bloom_hashes=self.bloom.hashes)
+            np.save(self._path(meta["bloom"]), self.bloom.words)
+
+        # Data files first, then the metadata that points at them
+        tmp = self._path(self.table + ".json.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(meta, fh, indent=2)
+        os.replace(tmp, self._path(self.table + ".json"))
+        self.meta = meta
+        self._new, self._pending = np.array([], dtype=np.uint64), []
+        self._clean()
+        return added
+
+    def _compact(self, runs, version):
+        """Merge the smallest runs (as many as fit half the memory budget, at least two) into one."""
+        sizes = sorted(range(len(runs)), key=lambda i: len(self._runs[i]))
+        merge, total = [], 0
+        for i in sizes:
+            if len(merge) >= 2 and (total + len(self._runs[i])) * 8 > self.memory_bytes // 2:
+                break
+            merge.append(i)
+            total += len(self._runs[i])
+        name = f"{self.table}.r{version}m.npy"
+        np.save(self._path(name), np.sort(np.concatenate([np.asarray(self._runs[i]) for i in merge])))
+        kept = [i for i in range(len(runs)) if i not in merge]
+        self._runs = [self._runs[i] for i in kept] + [np.load(self._path(name), mmap_mode="r")]
+        return [runs[i] for i in kept] + [name]
+
+
+# ─── Pipeline Check ──────────────────────────────────────────────────────────
+class DuplicateCheck:
+    """Pipeline check that flags rows whose key was already loaded, in this run or any earlier one.
+
+    ``key`` defaults to ``incremental.default_key`` of the first chunk. The
+    pipeline calls ``commit()`` after a successful run. Only attach it to
+    loads that append every row: an upsert target (``incremental``) turns a
+    key it has seen into an update, not a duplicate.
+    """
+
+    def __init__(self, table, key=None, state_dir=DEFAULT_STATE_DIR, memory_bytes=DEFAULT_MEMORY_BYTES, fp_rate=FP_RATE):
+        self.table = table
+        self.key = key
+        self.state_dir = state_dir
+        self.memory_bytes = memory_bytes
+        self.fp_rate = fp_rate
+        self.filter = None
+        self.duplicates = 0
+        self.samples = []
+
+    def __call__(self, chunk):
+        if self.filter is None:
+            self.key = self.key or default_key(list(chunk.columns))
+            self.filter = KeyFilter(self.table, self.key, self.state_dir, self.memory_bytes, self.fp_rate)
+        if self.key not in chunk.columns:
+            return 0
+        repeat = self.filter.check(chunk[self.key])
+        count = int(repeat.sum())
+        self.duplicates += count
+        if count and sum(len(sample) for sample in self.samples) < SAMPLE_ROWS:
+            self.samples.append(chunk.iloc[np.flatnonzero(repeat)[:SAMPLE_ROWS]])
+        return repeat
+
+    def commit(self):
+        return self.filter.commit() if self.filter is not None else 0
+
+    def summary(self):
+        """``KeyFilter`` counters plus mode, key count, memory held and up to SAMPLE_ROWS duplicate rows."""
+        if self.filter is None:
+            return None
+        return {**self.filter.stats, "key": self.key, "duplicates": self.duplicates, "mode": self.filter.mode,
+                "keys": len(self.filter), "memory": self.filter.memory,
+                "sample": pd.concat(self.samples).head(SAMPLE_ROWS) if self.samples else pd.DataFrame()}
@@ -0,0 +1,159 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# ─── Ingest-time Type Optimizer ──────────────────────────────────────────────
+# A plan is profiled once from the first chunk (or a sample) and applied to
+# every chunk, so all chunks of a dataset share the same dtypes:
+#
+#   integers            smallest signed int holding the sample range with HEADROOM
+#   floats              float32 when every sampled value survives the round trip
+#   low-cardinality     category (≤ CATEGORY_MAX distinct, ≤ CATEGORY_RATIO of rows)
+#   ISO date strings    datetime64, parsed once here instead of on every query
+#
+# A chunk that doesn't fit its column's plan (an integer out of range, a float
+# float32 can't hold, a date that doesn't parse) widens that column back to its
+# original type for the rest of the dataset; ``TypePlan.widened`` lists them.
+# Targets must accept that mid-dataset: the column store re-encodes the rows
+# it already wrote in the wider type.
+
+CATEGORY_MAX = 1_000
+CATEGORY_RATIO = 0.5
+HEADROOM = 1.0  # extra range, as a share of the sampled span, on each side
+INT_TYPES = (np.int8, np.int16, np.int32)
+
+_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?$")
+
+
+def _is_text(series):
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def _int_type(low, high):
+    span = high - low
+    low, high = low - span * HEADROOM, high + span * HEADROOM
+    for dtype in INT_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype).name
+    return None
+
+
+def plan_column(series):
+    """Target dtype for one sampled column, or ``None`` to keep it as is."""
+    values = series.dropna()
+    if values.empty or pd.api.types.is_bool_dtype(series):
+        return None
+    if pd.api.types.is_integer_dtype(series):
+        return _int_type(int(values.min()), int(values.max())) if series.dtype.itemsize > 1 else None
+    if pd.api.types.is_float_dtype(series):
+        data = values.to_numpy(dtype=np.float64)
+        return "float32" if series.dtype.itemsize > 4 and np.array_equal(data.astype(np.float32), data) else None
+    if isinstance(series.dtype, pd.CategoricalDtype) or not _is_text(series):
+        return None
+    text = values.astype(str)
+    # Dates first: a date column is often low-cardinality too, but should parse
+    if text.head(100).str.match(_ISO_DATE).all() and text.str.match(_ISO_DATE).all():
+        if pd.to_datetime(text, errors="coerce", format="ISO8601").notna().all():
+            return "datetime"
+    distinct = values.nunique()
+    if distinct <= CATEGORY_MAX and distinct <= CATEGORY_RATIO * len(values):
+        return "category"
+    return None
+
+
+def _cast(series, target):
+    """``series`` as ``target``, or ``None`` when the values don't fit."""
+    if target == "category":
+        return series.astype("category")
+    if target == "datetime":
+        parsed = pd.to_datetime(series, errors="coerce", format="ISO8601")
+        return parsed if parsed.isna().sum() == series.isna().sum() else None
+    if target == "float32":
+        cast = series.astype(np.float32)
+        data = series.to_numpy(dtype=np.float64)
+        return cast if np.array_equal(cast.to_numpy(dtype=np.float64), data, equal_nan=True) else None
+    info = np.iinfo(target)
+    if series.isna().any() or not pd.api.types.is_integer_dtype(series):
+        return None
+    return series.astype(target) if series.empty or (info.min <= series.min() and series.max() <= info.max) else None
+
+
+class TypePlan:
+    """Per-column target dtypes, profiled from the first chunk seen.
+
+    Callable, so it drops into a pipeline's ``transforms``; tracks deep memory
+    before and after across every chunk it converts.
+    """
+
+    def __init__(self, dtypes=None):
+        self.dtypes = dtypes
+        self.original = {}
+        self.widened = []
+        self.bytes_before = {}
+        self.bytes_after = {}
+
+    @classmethod
+    def from_sample(cls, sample):
+        plan = cls()
+        plan._profile(sample)
+        return plan
+
+    def _profile(self, sample):
+        self.dtypes = {}
+        for col in sample.columns:
+            target = plan_column(sample[col])
+            if target is not None:
+                self.dtypes[col] = target
+            self.original[col] = str(sample[col].dtype)
+
+    def __call__(self, chunk):
+        return self.apply(chunk)
+
+    def apply(self, chunk):
+        if self.dtypes is None:
+            self._profile(chunk)
+        before = chunk.memory_usage(index=False, deep=True)
+        converted = {}
+        for col, target in list(self.dtypes.items()):
+            if col not in chunk.columns:
+                continue
+            cast = _cast(chunk[col], target)
+            if cast is None:
+                del self.dtypes[col]
+                self.widened.append(col)
+            else:
+                converted[col] = cast
+        if converted:
+            chunk = chunk.assign(**converted)
+        after = chunk.memory_usage(index=False, deep=True)
+        for col in chunk.columns:
+            self.bytes_before[col] = self.bytes_before.get(col, 0) + int(before[col])
+            self.bytes_after[col] = self.bytes_after.get(col, 0) + int(after[col])
+        return chunk
+
+    @property
+    def memory(self):
+        """``{"before", "after", "ratio"}`` in bytes over every chunk applied so far."""
+        before, after = sum(self.bytes_before.values()), sum(self.bytes_after.values())
+        return {"before": before, "after": after, "ratio": round(before / after, 2) if after else 1.0}
+
+    def report(self):
+        """One row per column: original and optimized dtype, memory before/after."""
+        return pd.DataFrame([
+            {
+                "column": col,
+                "from": self.original.get(col, ""),
+                "to": (self.dtypes or {}).get(col, "widened" if col in self.widened else "—"),
+                "before_kb": round(self.bytes_before[col] / 1024, 1),
+                "after_kb": round(self.bytes_after[col] / 1024, 1),
+            }
+            for col in self.bytes_before
+        ])
+
+
+def optimize(frame):
+    """``(optimized frame, plan)`` for an in-memory frame."""
+    plan = TypePlan()
+    return plan.apply(frame), plan
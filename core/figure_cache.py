@@ -0,0 +1,46 @@
+import json
+
+import plotly.graph_objects as go
+
+from core.chat_store import ResultCache
+
+# ─── Figure Cache ────────────────────────────────────────────────────────────
+# Process-wide LRU of Plotly figures stored as pre-serialized JSON. Building a
+# themed figure (grouping + validation of every trace and layout property)
+# costs ~10 ms; rehydrating the cached JSON without re-validation costs ~1.5 ms
+# and the JSON string gives an exact byte size for eviction. Callers put the
+# data version in the key, so a changed dataset simply misses and the stale
+# entries age out.
+
+
+def freeze(fig):
+    return fig.to_json()
+
+
+def thaw(spec):
+    # The JSON came from an already-validated figure; skip plotly's per-property checks
+    return go.Figure(json.loads(spec), _validate=False)
+
+
+class FigureCache:
+    """Bounded LRU of figure JSON; ``builder`` returns a ``go.Figure`` or ``None``."""
+
+    def __init__(self, max_entries=128, max_bytes=16 * 1024 * 1024):
+        self._store = ResultCache(max_entries=max_entries, max_bytes=max_bytes)
+
+    def get_or_build(self, key, builder):
+        def build():
+            fig = builder()
+            if fig is None:
+                return None, 0
+            spec = freeze(fig)
+            return spec, len(spec)
+
+        spec = self._store.get_or_build(key, build)
+        return None if spec is None else thaw(spec)
+
+    def clear(self):
+        self._store.clear()
+
+    def stats(self):
+        return self._store.footprint()
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict, namedtuple
+from urllib.parse import urlsplit
+
+from core.column_store import DEFAULT_ROOT as STORE_ROOT
+
+# ─── Connector Health Checks ─────────────────────────────────────────────────
+# Probes run concurrently on one asyncio loop in a background thread, each
+# under its own timeout, so a slow source only delays its own result. Results
+# are cached with a TTL: ``HealthChecker.results()`` returns immediately with
+# whatever is cached and schedules a refresh when it is stale — rendering the
+# Connectors tab never waits on the network. HTTP keep-alive connections and
+# SQLite handles are pooled per endpoint and reused across rounds. TCP probes
+# connect afresh every round: an idle socket to a host that went away still
+# looks open, so only a new handshake proves the endpoint is up.
+#
+# Probe specs are dicts, overridable per connector from the JSON file named by
+# ``SMARTHUB_CONNECTORS``:
+#
+#     {"kind": "sqlite", "path": "data/warehouse.db"}
+#     {"kind": "http", "url": "http://127.0.0.1:8000/health"}
+#     {"kind": "directory", "path": "data/store"}        (object store stand-in)
+#     {"kind": "tcp", "host": "localhost", "port": 9092}
+#     {"kind": "unconfigured"}
+
+DEFAULT_TIMEOUT_S = 2.0
+DEFAULT_TTL_S = 30.0
+POOL_SIZE = 4
+
+HealthResult = namedtuple("HealthResult", ["name", "status", "latency_ms", "detail", "checked_at"])
+STATUS_LABELS = {
+    "ok": ("✅ Connected", "#00ff88"),
+    "unconfigured": ("⚙️ Configuring", "#ffaa00"),
+    "checking": ("⏳ Checking", "#8899bb"),
+    "timeout": ("⌛ Timed out", "#ff4444"),
+    "error": ("❌ Not Connected", "#ff4444"),
+}
+
+CONNECTORS = {
+    "🗄️ Databases": {
+        "PostgreSQL": {"kind": "tcp", "host": "localhost", "port": 5432},
+        "MySQL": {"kind": "tcp", "host": "localhost", "port": 3306},
+        "SQL Server": {"kind": "tcp", "host": "localhost", "port": 1433},
+        "Oracle DB": {"kind": "unconfigured"},
+        "MongoDB": {"kind": "tcp", "host": "localhost", "port": 27017},
+        "Snowflake": {"kind": "unconfigured"},
+    },
+    "☁️ Cloud Storage": {
+        "AWS S3": {"kind": "directory", "path": os.path.join("data", "synthetic")},
+        "Azure ADLS": {"kind": "directory", "path": STORE_ROOT},
+        "Google Cloud Storage": {"kind": "unconfigured"},
+        "Azure Blob": {"kind": "unconfigured"},
+    },
+    "📡 Streaming": {
+        "Apache Kafka": {"kind": "tcp", "host": "localhost", "port": 9092},
+        "AWS Kinesis": {"kind": "unconfigured"},
+        "Azure Event Hub": {"kind": "unconfigured"},
+        "Apache Pulsar": {"kind": "tcp", "host": "localhost", "port": 6650},
+    },
+    "🏢 Enterprise Apps": {
+        "Salesforce": {"kind": "unconfigured"},
+        "SAP ERP": {"kind": "unconfigured"},
+        "ServiceNow": {"kind": "unconfigured"},
+        "Workday HR": {"kind": "unconfigured"},
+        "Google Analytics": {"kind": "unconfigured"},
+    },
+}
+
+
+def load_connectors(path=None):
+    """``CONNECTORS`` with per-name overrides from ``path`` (default ``$SMARTHUB_CONNECTORS``)."""
+    path = path or os.environ.get("SMARTHUB_CONNECTORS")
+    overrides = {}
+    if path and os.path.exists(path):
+        with open(path) as fh:
+            overrides = json.load(fh)
+    return {
+        category: {name: overrides.get(name, spec) for name, spec in connectors.items()}
+        for category, connectors in CONNECTORS.items()
+    }
+
+
+# ─── Connection Pool ─────────────────────────────────────────────────────────
+class ConnectionPool:
+    """Idle connections per endpoint key, at most ``size`` kept per key. Used from the checker's loop only."""
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._idle = defaultdict(list)
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, key):
+        idle = self._idle.get(key)
+        if idle:
+            self.reused += 1
+            return idle.pop()
+        return None
+
+    def release(self, key, conn, close):
+        if len(self._idle[key]) < self.size:
+            self._idle[key].append(conn)
+        else:
+            close(conn)
+
+    def discard(self, conn, close):
+        try:
+            close(conn)
+        except Exception:
+            pass
+
+    def close_all(self, closers):
+        """Close every idle connection with ``closers[kind]``, ``kind`` being the first item of its key."""
+        for key, conns in self._idle.items():
+            for conn in conns:
+                self.discard(conn, closers[key[0]])
+        self._idle.clear()
+
+
+def _close_stream(conn):
+    conn[1].close()
+
+
+def _close_sqlite(conn):
+    conn.close()
+
+
+# ─── Probes ──────────────────────────────────────────────────────────────────
+# Each is ``async probe(spec, pool) -> detail`` and raises on failure.
+
+async def _probe_tcp(spec, pool):
+    conn = await asyncio.open_connection(spec["host"], int(spec["port"]))
+    pool.created += 1
+    pool.discard(conn, _close_stream)
+    return f"{spec['host']}:{spec['port']} reachable"
+
+
+async def _probe_http(spec, pool):
+    url = urlsplit(spec["url"])
+    port = url.port or (443 if url.scheme == "https" else 80)
+    key = ("http", url.hostname, port, url.scheme)
+    conn = pool.acquire(key)
+    if conn is not None and (conn[0].at_eof() or conn[1].is_closing()):
+        pool.discard(conn, _close_stream)
+        conn = None
+    if conn is None:
+        conn = await asyncio.open_connection(url.hostname, port, ssl=url.scheme == "https")
+        pool.created += 1
+    reader, writer = conn
+    try:
+        path = (url.path or "/") + (f"?{url.query}" if url.query else "")
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: {url.hostname}\r\nConnection: keep-alive\r\n\r\n".encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        if length:
+            await reader.readexactly(length)
+    except BaseException:  # includes the cancellation from a timeout
+        pool.discard(conn, _close_stream)
+        raise
+    status = int(status_line.split()[1])
+    if headers.get("connection", "").lower() == "close" or "content-length" not in headers:
+        pool.discard(conn, _close_stream)
+    else:
+        pool.release(key, conn, _close_stream)
+    if status >= 400:
+        raise ConnectionError(f"HTTP {status}")
+    return f"HTTP {status}"
+
+
+async def _probe_sqlite(spec, pool):
+    key = ("sqlite", spec["path"])
+    conn = pool.acquire(key)
+
+    def query(conn):
+        if conn is None:
+            if not os.path.exists(spec["path"]):
+                raise FileNotFoundError(f"{spec['path']} not found")
+            conn = sqlite3.connect(f"file:{spec['path']}?mode=ro", uri=True, check_same_thread=False)
+            pool.created += 1
+        tables = conn.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+        return conn, tables
+
+    conn, tables = await asyncio.to_thread(query, conn)
+    pool.release(key, conn, _close_sqlite)
+    return f"{tables} tables"
+
+
+async def _probe_directory(spec, pool):
+    def scan():
+        if not os.path.isdir(spec["path"]):
+            raise FileNotFoundError(f"{spec['path']} not found")
+        with os.scandir(spec["path"]) as entries:
+            return sum(1 for _ in entries)
+
+    return f"{await asyncio.to_thread(scan)} objects"
+
+
+PROBES = {"tcp": _probe_tcp, "http": _probe_http, "sqlite": _probe_sqlite, "directory": _probe_directory}
+CLOSERS = {"tcp": _close_stream, "http": _close_stream, "sqlite": _close_sqlite}  # by pool key kind
+
+
+# ─── Checker ─────────────────────────────────────────────────────────────────
+class HealthChecker:
+    """Concurrent, TTL-cached health checks over ``{name: spec}`` on a background event loop."""
+
+    def __init__(self, connectors, timeout=DEFAULT_TIMEOUT_S, ttl=DEFAULT_TTL_S):
+        self.connectors = dict(connectors)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.pool = ConnectionPool()
+        self._results = {}
+        self._pending = None
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="health-checks", daemon=True)
+        self._thread.start()
+
+    async def _check(self, name, spec):
+        kind = spec.get("kind", "unconfigured")
+        start = time.perf_counter()
+        if kind not in PROBES:
+            status, detail = "unconfigured", "no endpoint configured"
+        else:
+            timeout = spec.get("timeout", self.timeout)
+            try:
+                detail = await asyncio.wait_for(PROBES[kind](spec, self.pool), timeout)
+                status = "ok"
+            except asyncio.TimeoutError:
+                status, detail = "timeout", f"no answer within {timeout:g}s"
+            except Exception as exc:
+                status, detail = "error", str(exc) or type(exc).__name__
+        result = HealthResult(name, status, round((time.perf_counter() - start) * 1000, 1), detail, time.time())
+        with self._lock:
+            self._results[name] = result  # published as it lands, not when the slowest probe finishes
+        return result
+
+    async def _check_all(self):
+        return await asyncio.gather(*(self._check(name, spec) for name, spec in self.connectors.items()))
+
+    def refresh(self):
+        """Start a round unless one is running; returns its ``concurrent.futures.Future``."""
+        with self._lock:
+            if self._pending is None or self._pending.done():
+                self._pending = asyncio.run_coroutine_threadsafe(self._check_all(), self._loop)
+            return self._pending
+
+    def results(self, wait_s=0.0):
+        """Cached results (``status="checking"`` for ones not seen yet), refreshing in the background when stale.
+
+        ``wait_s`` bounds how long to wait for a round this call started —
+        enough for local probes to land on the first render.
+        """
+        now = time.time()
+        with self._lock:
+            stale = len(self._results) < len(self.connectors) or any(
+                now - result.checked_at > self.ttl for result in self._results.values())
+        if stale:
+            future = self.refresh()
+            if wait_s:
+                try:
+                    future.result(timeout=wait_s)
+                except Exception:
+                    pass
+        with self._lock:
+            return {
+                name: self._results.get(name) or HealthResult(name, "checking", None, "first check running", None)
+                for name in self.connectors
+            }
+
+    def close(self):
+        async def shutdown():
+            self.pool.close_all(CLOSERS)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=self.timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=self.timeout)
+
+
+_checker = None
+_checker_lock = threading.Lock()
+
+
+def default_checker():
+    """Process-wide checker over ``load_connectors()``."""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            connectors = {name: spec for group in load_connectors().values() for name, spec in group.items()}
+            _checker = HealthChecker(connectors)
+        return _checker
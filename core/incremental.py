@@ -0,0 +1,273 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# ─── Incremental / CDC Loads ─────────────────────────────────────────────────
+# ``IncrementalTarget`` wraps a pipeline target (``SQLEngine``, ``SQLiteTarget``)
+# and writes only what changed since the previous run. Per table it keeps a
+# snapshot of the sorted primary keys, one 64-bit content hash per row and the
+# high-water mark of the watermark column — 16 bytes per row plus the key,
+# however wide the rows are. Each incoming chunk is probed against the
+# snapshot with ``searchsorted``:
+#
+#   key not in snapshot          → insert
+#   key present, hash differs    → update (delete + append in the target)
+#   key present, hash identical  → skipped
+#
+# ``cdc`` mode reads the full source, so snapshot keys that never show up are
+# deletes. ``incremental`` mode only reads rows at or after the high-water mark
+# (inclusive, so late rows sharing the last timestamp are not lost; the hash
+# probe drops the ones already loaded) and cannot see deletes.
+#
+# The snapshot only moves on ``commit`` (a successful run). A failed run is
+# ``abort``ed: no deletes, the old snapshot stays, and it is marked ``dirty``
+# so the rerun replaces (delete + append) rows the failed run already inserted
+# instead of inserting them twice.
+#
+#     <state_dir>/<table>.npz   keys, hashes
+#     <state_dir>/<table>.json  key column, watermark column, high-water mark, rows
+
+DEFAULT_STATE_DIR = os.environ.get("SMARTHUB_CDC_DIR", os.path.join("data", "cdc"))
+MODES = {"Full Load": "full", "Incremental": "incremental", "CDC (Change Data Capture)": "cdc"}
+
+
+def row_hashes(frame):
+    """One uint64 per row over every column's value (index excluded).
+
+    float32 and categorical columns (see ``core.dtypes``) hash as float64 and
+    plain values, so a row hashes the same whichever types a run picked.
+    """
+    canonical = {
+        col: frame[col].astype(np.float64) if frame[col].dtype == np.float32 else frame[col].astype(frame[col].cat.categories.dtype)
+        for col in frame.columns
+        if frame[col].dtype == np.float32 or isinstance(frame[col].dtype, pd.CategoricalDtype)
+    }
+    return pd.util.hash_pandas_object(frame.assign(**canonical) if canonical else frame, index=False).to_numpy()
+
+
+def key_values(series):
+    # Numeric keys are stored as-is; anything else as fixed-width unicode so
+    # ``np.savez`` needs no pickling and the keys can be sorted and probed
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy()
+    return series.astype(str).to_numpy(dtype=str)
+
+
+def _watermark_values(series):
+    # Numbers compare as numbers; dates and text as ISO-formatted strings
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series
+    return series.astype(str)
+
+
+def default_key(columns):
+    """First ``id`` / ``*_id`` column, else the first column."""
+    for col in columns:
+        if col == "id" or str(col).endswith("_id"):
+            return col
+    return columns[0]
+
+
+def default_watermark(columns):
+    """First ``*_at`` / ``*_date`` / ``*_time`` column, or ``None``."""
+    for col in columns:
+        if str(col).endswith(("_at", "_date", "_time", "_ts")):
+            return col
+    return None
+
+
+class Snapshot:
+    """Sorted keys with their row hashes, as left by the last committed run."""
+
+    def __init__(self, keys=None, hashes=None, meta=None):
+        self.keys = keys if keys is not None else np.array([], dtype=np.int64)
+        self.hashes = hashes if hashes is not None else np.array([], dtype=np.uint64)
+        self.meta = meta or {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, state_dir, table):
+        meta_path = os.path.join(state_dir, table + ".json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as fh:
+            meta = json.load(fh)
+        with np.load(os.path.join(state_dir, meta["data"])) as data:
+            return cls(data["keys"], data["hashes"], meta)
+
+    def save(self, state_dir, table):
+        # Data first, then the metadata that points at it: a crash mid-save leaves the previous snapshot in force
+        os.makedirs(state_dir, exist_ok=True)
+        version = self.meta.get("version", 0) + 1
+        data_name = f"{table}.v{version}.npz"
+        np.savez(os.path.join(state_dir, data_name), keys=self.keys, hashes=self.hashes)
+        previous = self.meta.get("data")
+        self.meta.update(version=version, data=data_name, rows=len(self.keys))
+        self.save_meta(state_dir, table)
+        if previous and previous != data_name and os.path.exists(os.path.join(state_dir, previous)):
+            os.remove(os.path.join(state_dir, previous))
+
+    def save_meta(self, state_dir, table):
+        tmp = os.path.join(state_dir, table + ".json.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(self.meta, fh, indent=2)
+        os.replace(tmp, os.path.join(state_dir, table + ".json"))
+
+    def probe(self, keys):
+        """Return ``(found, position)`` of each key in the snapshot."""
+        if not len(self.keys) or not len(keys):
+            return np.zeros(len(keys), dtype=bool), np.zeros(len(keys), dtype=np.intp)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return self.keys[pos] == keys, pos
+
+
+class IncrementalTarget:
+    """Pipeline target that loads only inserts, updates and deletes into ``target``.
+
+    ``mode`` is ``cdc`` or ``incremental``. ``key`` and ``watermark`` default
+    to ``default_key`` / ``default_watermark`` of the first chunk. The first
+    run (no snapshot) is a full load. Deletes and the new snapshot are
+    applied on ``commit``; ``abort`` (failed run) leaves the last committed
+    snapshot in force, so the run is simply repeated.
+    """
+
+    def __init__(self, target, mode="cdc", key=None, watermark=None, state_dir=DEFAULT_STATE_DIR):
+        if mode not in ("cdc", "incremental"):
+            raise ValueError(f"unknown mode {mode!r}; expected 'cdc' or 'incremental'")
+        if not hasattr(target, "delete"):
+            raise ValueError(f"{type(target).__name__} cannot delete rows; incremental loads need a SQL target")
+        self.target = target
+        self.mode = mode
+        self.key = key
+        self.watermark = watermark
+        self.state_dir = state_dir
+        self.table = None
+        self.snapshot = None
+        self.stats = {"scanned": 0, "inserts": 0, "updates": 0, "deletes": 0, "unchanged": 0,
+                      "bytes_scanned": 0, "bytes_loaded": 0, "full_load": False}
+        self._seen = None
+        self._keys = []
+        self._hashes = []
+        self._since = None
+        self._high_water = None
+
+    def connect(self):
+        connect = getattr(self.target, "connect", None)
+        if connect is not None:
+            connect()
+
+    def _start(self, name, chunk):
+        self.table = name
+        self.key = self.key or default_key(list(chunk.columns))
+        if self.mode == "incremental":
+            self.watermark = self.watermark or default_watermark(list(chunk.columns))
+            if self.watermark is None:
+                raise ValueError("incremental mode needs a watermark column (*_at, *_date, *_time)")
+        snapshot = Snapshot.load(self.state_dir, name)
+        # Reload in full when the snapshot was taken with another key or the
+        # target lost the table (e.g. the in-process engine restarted)
+        tables = getattr(self.target, "tables", None)
+        if snapshot is not None and snapshot.meta.get("key") == self.key and (tables is None or name in tables):
+            self.snapshot = snapshot
+        else:
+            self.snapshot = Snapshot(meta={"key": self.key})
+            self.stats["full_load"] = True
+        self.snapshot.meta["watermark"] = self.watermark
+        self._since = self.snapshot.meta.get("high_water")  # filter bound: last run's mark, fixed for this run
+        self._high_water = self._since
+        self._seen = np.zeros(len(self.snapshot), dtype=bool)
+
+    def append(self, name, chunk, replace=False):
+        # ``replace`` (first pipeline chunk) is ignored unless this is a full load
+        if self.table is None:
+            self._start(name, chunk)
+        self.stats["scanned"] += len(chunk)
+        self.stats["bytes_scanned"] += int(chunk.memory_usage(index=False, deep=True).sum())
+
+        if self.mode == "incremental" and self._since is not None:
+            chunk = chunk[_watermark_values(chunk[self.watermark]) >= self._since]
+        chunk = chunk.drop_duplicates(self.key, keep="last")
+        keys = key_values(chunk[self.key])
+        hashes = row_hashes(chunk)
+        if self.watermark is not None and len(chunk):
+            high = _watermark_values(chunk[self.watermark]).max()
+            high = high.item() if hasattr(high, "item") else high  # JSON-serializable
+            self._high_water = high if self._high_water is None else max(self._high_water, high)
+
+        found, pos = self.snapshot.probe(keys)
+        self._seen[pos[found]] = True
+        changed = found & (self.snapshot.hashes[pos] != hashes) if len(self.snapshot) else found
+        inserted = ~found
+        self.stats["inserts"] += int(inserted.sum())
+        self.stats["updates"] += int(changed.sum())
+        self.stats["unchanged"] += int((found & ~changed).sum())
+
+        # After an aborted run, "new" keys may already be in the target
+        rewrite = changed | inserted if self.snapshot.meta.get("dirty") else changed
+        if rewrite.any():
+            self.target.delete(name, self.key, chunk[self.key][rewrite].tolist())
+        delta = chunk[inserted | changed]
+        if len(delta) or self.stats["full_load"] and replace:
+            self.target.append(name, delta, replace=self.stats["full_load"] and replace)
+            self.stats["bytes_loaded"] += int(delta.memory_usage(index=False, deep=True).sum())
+        keep = inserted | changed
+        self._keys.append(keys[keep])
+        self._hashes.append(hashes[keep])
+
+    def create_indexes(self, name, columns):
+        self.target.create_indexes(name, columns)
+
+    def commit(self):
+        """Apply ``cdc`` deletes and save the new snapshot; call once the whole run succeeded."""
+        if self.table is not None:
+            snapshot = self.snapshot
+            kept = np.ones(len(snapshot), dtype=bool)
+            if self.mode == "cdc" and not self.stats["full_load"] and not self._seen.all():
+                deleted = snapshot.keys[~self._seen]
+                self.target.delete(self.table, self.key, deleted.tolist())
+                self.stats["deletes"] = len(deleted)
+                kept = self._seen
+            # Surviving old entries followed by this run's inserts and updates
+            parts = ([] if self.stats["full_load"] else [(snapshot.keys[kept], snapshot.hashes[kept])]) + list(zip(self._keys, self._hashes))
+            if parts:
+                keys = np.concatenate([k for k, _ in parts])
+                hashes = np.concatenate([h for _, h in parts])
+                # A repeated key keeps its latest hash: stable sort, take the last of each run
+                order = np.argsort(keys, kind="stable")
+                keys, hashes = keys[order], hashes[order]
+                last = np.append(keys[1:] != keys[:-1], True)
+                snapshot.keys, snapshot.hashes = keys[last], hashes[last]
+            snapshot.meta.pop("dirty", None)
+            snapshot.meta.update(key=self.key, watermark=self.watermark, high_water=self._high_water, mode=self.mode)
+            snapshot.save(self.state_dir, self.table)
+        self._finish("commit")
+
+    def abort(self):
+        """Drop the run's pending snapshot; the target keeps whatever rows were already written."""
+        if self.table is not None and not self.stats["full_load"] and (self.stats["inserts"] or self.stats["updates"]):
+            snapshot = Snapshot.load(self.state_dir, self.table)
+            if snapshot is not None:
+                snapshot.meta["dirty"] = True
+                snapshot.save_meta(self.state_dir, self.table)
+        self._finish("abort")
+
+    def _finish(self, step):
+        self.snapshot, self._seen, self._keys, self._hashes = None, None, [], []
+        self.table = None
+        finish = getattr(self.target, step, None)
+        if finish is not None:
+            finish()
+
+    def close(self):
+        close = getattr(self.target, "close", None)
+        if close is not None:
+            close()
+
+    def summary(self):
+        """``stats`` plus the share of scanned bytes that was actually written."""
+        scanned = self.stats["bytes_scanned"]
+        return {**self.stats, "loaded_pct": round(100 * self.stats["bytes_loaded"] / scanned, 2) if scanned else 0.0}
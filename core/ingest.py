@@ -0,0 +1,272 @@
+import os
+import re
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from core.dtypes import TypePlan
+from core.json_reader import SUFFIXES, JSONReader
+from core.parallel_csv import parallel_reader
+from core.sql_engine import index_candidates
+
+# ─── Streaming Ingestion ─────────────────────────────────────────────────────
+# Files are read in fixed-size row chunks; each chunk updates running column
+# statistics and is written to the target store before the next one is read,
+# so peak memory is one chunk regardless of file size.
+
+DEFAULT_CHUNK_ROWS = 100_000
+DISTINCT_CAP = 10_000
+# Server-side paths typed into the UI may only name data files under this directory
+SERVER_ROOT = os.environ.get("SMARTHUB_DATA_DIR", "data")
+SERVER_SUFFIXES = (".csv",) + SUFFIXES
+# Uploads kept for scheduled re-runs
+UPLOAD_DIR = os.path.join(SERVER_ROOT, "uploads")
+INGESTED_PREFIX = "ingested_"
+
+
+class ColumnStats:
+    """Mergeable running statistics for one column.
+
+    Numeric columns keep count/min/max and mean/variance, combined chunk by
+    chunk with Chan's parallel update; other columns track distinct values up
+    to ``DISTINCT_CAP``.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.kind = None
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._distinct = set()
+        self._distinct_capped = False
+
+    def update(self, series):
+        nulls = int(series.isna().sum())
+        self.nulls += nulls
+        values = series.dropna()
+        if values.empty:
+            return
+        if self.kind is None:
+            self.kind = "numeric" if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values) else "text"
+        elif self.kind == "numeric" and not pd.api.types.is_numeric_dtype(values):
+            # A later chunk proved the column is not numeric
+            self.kind = "text"
+
+        if self.kind == "numeric":
+            data = values.to_numpy(dtype=np.float64)
+            n = len(data)
+            mean = data.mean()
+            m2 = ((data - mean) ** 2).sum()
+            total = self.count + n
+            delta = mean - self.mean
+            self._m2 += m2 + delta * delta * self.count * n / total
+            self.mean += delta * n / total
+            self.count = total
+            self.min = data.min() if self.min is None else min(self.min, data.min())
+            self.max = data.max() if self.max is None else max(self.max, data.max())
+        else:
+            self.count += len(values)
+            if not self._distinct_capped:
+                self._distinct.update(values.astype(str).unique()[:DISTINCT_CAP])
+                if len(self._distinct) >= DISTINCT_CAP:
+                    self._distinct_capped = True
+                    self._distinct.clear()
+
+    def summary(self):
+        total = self.count + self.nulls
+        row = {
+            "column": self.name,
+            "type": self.kind or "empty",
+            "rows": total,
+            "null_pct": round(100 * self.nulls / total, 2) if total else 0.0,
+            "distinct": None,
+            "min": None,
+            "max": None,
+            "mean": None,
+            "std": None,
+        }
+        if self.kind == "numeric":
+            row.update(
+                min=float(self.min), max=float(self.max), mean=round(self.mean, 4),
+                std=round(float(np.sqrt(self._m2 / (self.count - 1))), 4) if self.count > 1 else 0.0,
+            )
+        elif self.kind == "text":
+            row["distinct"] = f"{DISTINCT_CAP:,}+" if self._distinct_capped else f"{len(self._distinct):,}"
+        return row
+
+
+class IngestStats:
+    """Running per-column statistics over every chunk seen so far."""
+
+    def __init__(self):
+        self.rows = 0
+        self.chunks = 0
+        self.columns = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        self.chunks += 1
+        for name in chunk.columns:
+            stats = self.columns.get(name)
+            if stats is None:
+                stats = self.columns[name] = ColumnStats(name)
+            stats.update(chunk[name])
+
+    def to_frame(self):
+        return pd.DataFrame([stats.summary() for stats in self.columns.values()])
+
+
+def table_name(name):
+    """SQL table for an ingested source (a file stem or topic name).
+
+    Prefixed with ``INGESTED_PREFIX`` so a load never replaces one of the
+    chatbot's sample tables in the shared engine.
+    """
+    return INGESTED_PREFIX + (re.sub(r"\W+", "_", name).strip("_").lower() or "uploaded")
+
+
+def server_file(path, root=SERVER_ROOT):
+    """Resolve a user-supplied server path; raises ``ValueError`` unless it is a CSV / JSON file under ``root``.
+
+    Symlinks and ``..`` are resolved before the containment check.
+    """
+    root = os.path.realpath(root)
+    full = os.path.realpath(path)
+    if os.path.commonpath([root, full]) != root or not full.lower().endswith(SERVER_SUFFIXES):
+        raise ValueError(f"only CSV / JSON files under {root} can be read")
+    if not os.path.isfile(full):
+        raise ValueError(f"file not found: {path}")
+    return full
+
+
+def upload_path(name, directory=UPLOAD_DIR):
+    """Where to keep an uploaded file: its client-supplied ``name`` reduced to a
+    base name and prefixed with a uuid, so uploads never escape ``directory``
+    or overwrite each other.
+    """
+    base = os.path.basename(name.replace("\\", "/")).lstrip(".") or "upload"
+    os.makedirs(directory, exist_ok=True)
+    root = os.path.realpath(directory)
+    path = os.path.join(root, f"{uuid.uuid4().hex}_{base}")
+    if os.path.dirname(os.path.realpath(path)) != root:
+        raise ValueError(f"upload name {name!r} is not a plain file name")
+    return path
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    size = getattr(source, "size", None)
+    if size is None and hasattr(source, "getbuffer"):
+        size = source.getbuffer().nbytes
+    return size
+
+
+def _position(source, reader):
+    # Bytes consumed so far; the parser reads ahead in blocks, so this is approximate
+    handle = source if hasattr(source, "tell") else getattr(getattr(reader, "handles", None), "handle", None)
+    try:
+        return handle.tell() if handle is not None else None
+    except (OSError, ValueError):
+        return None
+
+
+def _ingest_chunks(chunks, position, size, table, store, on_chunk, index, optimize_types):
+    stats = IngestStats()
+    plan = TypePlan() if optimize_types else None
+    preview = None
+    start = time.perf_counter()
+
+    for chunk in chunks:
+        if plan is not None:
+            chunk = plan.apply(chunk)
+        store.append(table, chunk, replace=stats.chunks == 0)
+        stats.update(chunk)
+        if preview is None:
+            preview = chunk.head(5).copy()
+            index_columns = index_candidates(chunk) if index else []
+        if on_chunk is not None:
+            elapsed = time.perf_counter() - start
+            consumed = position()
+            on_chunk({
+                "chunk": stats.chunks,
+                "rows": stats.rows,
+                "fraction": min(1.0, consumed / size) if size and consumed is not None else None,
+                "elapsed_s": elapsed,
+                "rows_per_s": stats.rows / elapsed if elapsed else 0.0,
+            })
+
+    if preview is not None and index_columns:
+        store.create_indexes(table, index_columns)
+    return {
+        "table": table,
+        "rows": stats.rows,
+        "chunks": stats.chunks,
+        "seconds": time.perf_counter() - start,
+        "preview": preview if preview is not None else pd.DataFrame(),
+        "stats": stats.to_frame(),
+        "memory": plan.memory if plan is not None else None,
+        "types": plan.report() if plan is not None else None,
+    }
+
+
+def ingest_csv(source, table, store, chunk_rows=DEFAULT_CHUNK_ROWS, on_chunk=None, index=True, optimize_types=True,
+               workers=1, **read_csv_kwargs):
+    """Stream a CSV path or file object into ``store`` (an ``SQLEngine``) chunk by chunk.
+
+    ``on_chunk(progress)`` is called after every chunk with
+    ``{"chunk", "rows", "fraction", "elapsed_s", "rows_per_s"}``; ``fraction``
+    is ``None`` when the source size is unknown. With ``optimize_types`` each
+    chunk is converted by a ``TypePlan`` profiled from the first one. With
+    ``workers > 1`` a large file is parsed in a process pool by byte range.
+    Returns ``{"table", "rows", "chunks", "seconds", "preview", "stats",
+    "memory", "types"}``.
+    """
+    parallel = parallel_reader(source, chunk_rows, workers, **read_csv_kwargs)
+    if parallel is not None:
+        return _ingest_chunks(parallel, lambda: parallel.position, _source_size(source), table, store, on_chunk,
+                              index, optimize_types)
+    with pd.read_csv(source, chunksize=chunk_rows, **read_csv_kwargs) as reader:
+        return _ingest_chunks(reader, lambda: _position(source, reader), _source_size(source), table, store, on_chunk,
+                              index, optimize_types)
+
+
+def ingest_json(source, table, store, chunk_rows=DEFAULT_CHUNK_ROWS, on_chunk=None, index=True, optimize_types=True,
+                records_path=None):
+    """Stream a JSON / NDJSON path or file object into ``store``, flattening nested objects.
+
+    Same callbacks and result as ``ingest_csv``, plus ``"schema"``: the
+    inferred columns, their kinds and which were added or widened mid-stream.
+    """
+    with JSONReader(source, chunk_rows, records_path=records_path) as reader:
+        result = _ingest_chunks(reader, lambda: reader.position, _source_size(source), table, store, on_chunk,
+                                index, optimize_types)
+    result["schema"] = reader.schema.to_frame()
+    return result
+
+
+def ingest_frame(frame, table, store, optimize_types=True):
+    """Register an already-loaded frame (e.g. Excel, which has no chunked reader) with the same summary."""
+    start = time.perf_counter()
+    plan = TypePlan() if optimize_types else None
+    if plan is not None:
+        frame = plan.apply(frame)
+    store.register(table, frame)
+    stats = IngestStats()
+    stats.update(frame)
+    return {
+        "table": table,
+        "rows": stats.rows,
+        "chunks": 1,
+        "seconds": time.perf_counter() - start,
+        "preview": frame.head(5),
+        "stats": stats.to_frame(),
+        "memory": plan.memory if plan is not None else None,
+        "types": plan.report() if plan is not None else None,
+    }
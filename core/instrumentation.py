@@ -0,0 +1,87 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+# ─── Hot-Path Instrumentation ────────────────────────────────────────────────
+# Process-wide, bounded store of section timings. Every (page, section) pair
+# keeps its last WINDOW samples in a ring buffer and at most MAX_SERIES pairs
+# are tracked, so memory stays flat no matter how long the server runs.
+# Streamlit serves sessions from multiple threads, hence the lock.
+
+WINDOW = 512
+MAX_SERIES = 256
+
+_series = OrderedDict()
+_lock = threading.Lock()
+
+
+def record(page, section, ms):
+    key = (page, section)
+    with _lock:
+        samples = _series.get(key)
+        if samples is None:
+            if len(_series) >= MAX_SERIES:
+                _series.popitem(last=False)
+            samples = _series[key] = deque(maxlen=WINDOW)
+        else:
+            _series.move_to_end(key)
+        samples.append(ms)
+
+
+@contextmanager
+def timed(page, section):
+    """Time the enclosed block as ``section`` of ``page``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(page, section, (time.perf_counter() - start) * 1000)
+
+
+class SectionTimer:
+    """Lap timer for long ``show()`` bodies: each ``lap(name)`` records the time since the previous lap."""
+
+    def __init__(self, page):
+        self.page = page
+        self._last = time.perf_counter()
+
+    def lap(self, section):
+        now = time.perf_counter()
+        record(self.page, section, (now - self._last) * 1000)
+        self._last = now
+
+
+def _percentile(ordered, q):
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * q
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def snapshot(page=None):
+    """Return ``[{page, section, count, p50, p95, p99, last}]`` sorted by p95, slowest first."""
+    with _lock:
+        items = [(key, list(samples)) for key, samples in _series.items() if page is None or key[0] == page]
+
+    rows = []
+    for (series_page, section), samples in items:
+        ordered = sorted(samples)
+        rows.append({
+            "page": series_page,
+            "section": section,
+            "count": len(samples),
+            "p50": _percentile(ordered, 0.50),
+            "p95": _percentile(ordered, 0.95),
+            "p99": _percentile(ordered, 0.99),
+            "last": samples[-1],
+        })
+    rows.sort(key=lambda row: row["p95"], reverse=True)
+    return rows
+
+
+def reset():
+    with _lock:
+        _series.clear()
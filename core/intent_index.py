@@ -0,0 +1,127 @@
+import math
+import re
+from collections import Counter, defaultdict, namedtuple
+
+import numpy as np
+
+# ─── Intent Index ────────────────────────────────────────────────────────────
+# Inverted token index with BM25 scoring over question→SQL templates. Postings
+# are compiled once into NumPy arrays of (template id, precomputed BM25 weight),
+# so a query only touches the posting lists of its own tokens — lookup cost
+# depends on how many templates share the query's words, not on the total
+# template count.
+
+STOPWORDS = frozenset(
+    "a an and are by can do does for from give how i in is it list me my of on or our show "
+    "tell that the their this to us was we what which who with".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+Match = namedtuple("Match", ["key", "template", "score", "confidence"])
+
+
+def tokenize(text):
+    tokens = []
+    for token in _TOKEN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        # Light plural folding: customers → customer, sales → sale
+        if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "is", "us")):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class IntentIndex:
+    """BM25 index over templates keyed by intent phrase.
+
+    Each template is indexed on its key plus optional ``keywords`` and
+    ``questions`` fields. ``confidence`` is the idf-weighted share of the
+    intent key's terms matched by the question — where a matched keyword
+    counts toward it too — capped to ``[0, 1]``.
+    """
+
+    def __init__(self, templates=None, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._keys = []
+        self._templates = []
+        self._key_terms = []
+        self._doc_len = []
+        self._raw_postings = defaultdict(list)
+        self._compiled = None
+        for key, template in (templates or {}).items():
+            self.add(key, template)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, key, template):
+        text = " ".join([key, *template.get("keywords", ()), *template.get("questions", ())])
+        counts = Counter(tokenize(text))
+        doc_id = len(self._keys)
+        self._keys.append(key)
+        self._templates.append(template)
+        self._key_terms.append(tuple(set(tokenize(key))) or tuple(counts))
+        self._doc_len.append(sum(counts.values()))
+        for term, tf in counts.items():
+            self._raw_postings[term].append((doc_id, tf))
+        self._compiled = None
+
+    def compile(self):
+        """Freeze postings into NumPy arrays; runs lazily on the first search after ``add``."""
+        n = len(self._keys)
+        doc_len = np.asarray(self._doc_len, dtype=np.float64)
+        length_norm = self.k1 * (1 - self.b + self.b * doc_len / doc_len.mean())
+
+        idf = {}
+        postings = {}
+        for term, entries in self._raw_postings.items():
+            df = len(entries)
+            idf[term] = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            ids = np.fromiter((d for d, _ in entries), dtype=np.int64, count=df)
+            tf = np.fromiter((t for _, t in entries), dtype=np.float64, count=df)
+            postings[term] = (ids, idf[term] * tf * (self.k1 + 1) / (tf + length_norm[ids]))
+
+        key_weight = np.array([sum(idf[t] for t in terms) for terms in self._key_terms])
+        self._compiled = (idf, postings, key_weight)
+        return self._compiled
+
+    def search(self, question, limit=5):
+        if not self._keys:
+            return []
+        idf, postings, key_weight = self._compiled or self.compile()
+
+        hits = [(postings[t], idf[t]) for t in set(tokenize(question)) if t in postings]
+        if not hits:
+            return []
+        ids = np.concatenate([p[0] for p, _ in hits])
+        weights = np.concatenate([p[1] for p, _ in hits])
+        coverage = np.concatenate([np.full(len(p[0]), w) for p, w in hits])
+
+        candidates, inverse = np.unique(ids, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights)
+        matched = np.bincount(inverse, weights=coverage)
+
+        # Highest score first; ties go to the template registered first
+        order = np.lexsort((candidates, -scores))[:limit]
+        matches = []
+        for i in order:
+            doc_id = int(candidates[i])
+            weight = key_weight[doc_id]
+            confidence = min(1.0, matched[i] / weight) if weight else 0.0
+            matches.append(Match(self._keys[doc_id], self._templates[doc_id], float(scores[i]), float(confidence)))
+        return matches
+
+    def best(self, question, min_confidence=0.0):
+        """Return the top-ranked ``Match``, or ``None`` if it falls short of ``min_confidence``.
+
+        A lower-ranked template that clears the bar is not a fallback: the
+        question is closer to the top one, so answering with another would
+        be confidently wrong.
+        """
+        matches = self.search(question, limit=1)
+        if matches and matches[0].confidence >= min_confidence:
+            return matches[0]
+        return None
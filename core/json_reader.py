@@ -0,0 +1,341 @@
+import codecs
+import json
+import os
+
+import pandas as pd
+
+# ─── Streaming JSON / NDJSON Reader ──────────────────────────────────────────
+# API dumps come as newline-delimited JSON (one record per line), as a JSON
+# array of records, or as an object wrapping that array (``{"data": [...]}``).
+# The reader pulls READ_BYTES blocks and hands out DataFrame chunks of
+# ``chunk_rows`` records, so memory stays at one block plus one chunk:
+#
+#   ndjson   lines are split on bytes and a whole chunk is decoded with one
+#            ``json.loads`` of the lines joined as an array
+#   array    records are decoded one at a time with ``raw_decode`` from the
+#            block buffer, refilled when a record spans blocks
+#
+# Nested objects are flattened into ``parent.child`` columns and lists kept as
+# JSON text. Column names and kinds (bool / int / float / str) are inferred
+# from the first SCHEMA_ROWS records; a later chunk with a new key adds a
+# column at the end, and one whose values don't fit a column's kind widens it
+# (int → float → str), so every chunk yielded has the full, ordered schema.
+
+READ_BYTES = 4 << 20
+SCHEMA_ROWS = 1_000
+SEP = "."
+SUFFIXES = (".json", ".ndjson", ".jsonl")
+
+_WHITESPACE = " \t\r\n"
+
+
+class JSONFormatError(ValueError):
+    pass
+
+
+# ─── Flattening ──────────────────────────────────────────────────────────────
+_encode = json.JSONEncoder(default=str).encode
+
+
+def _lists_to_text(series):
+    # Tag-like lists repeat a lot; encode each distinct one once per chunk
+    cache = {}
+
+    def to_text(value):
+        if not isinstance(value, list):
+            return value
+        try:
+            key = tuple(value)
+            text = cache.get(key)
+            if text is None:
+                text = cache[key] = _encode(value)
+            return text
+        except TypeError:  # holds objects or lists: not hashable
+            return _encode(value)
+
+    return series.map(to_text)
+
+
+def flatten(frame, sep=SEP):
+    """Expand dict-valued columns into ``parent<sep>child`` columns; list values become JSON text."""
+    columns = {}
+    for name in frame.columns:
+        series = frame[name]
+        if series.dtype != object:
+            columns[name] = series
+            continue
+        types = series.map(type)
+        is_dict = types.eq(dict)
+        if is_dict.any():
+            scalars = series.where(~is_dict)
+            if scalars.notna().any():
+                columns[name] = _lists_to_text(scalars)  # a key that is sometimes an object, sometimes not
+            nested = pd.DataFrame.from_records([value if is_obj else {} for value, is_obj in zip(series, is_dict)],
+                                               index=frame.index)
+            for child, values in flatten(nested, sep).items():
+                columns[f"{name}{sep}{child}"] = values
+        elif types.eq(list).any():
+            columns[name] = _lists_to_text(series)
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=frame.index)
+
+
+# ─── Schema ──────────────────────────────────────────────────────────────────
+_KINDS = {"boolean": "bool", "integer": "int", "floating": "float", "mixed-integer-float": "float", "empty": None}
+
+
+def _kind(series):
+    return _KINDS.get(pd.api.types.infer_dtype(series, skipna=True), "str")
+
+
+def _wider(kind, other):
+    if kind is None or kind == other:
+        return other
+    if other is None:
+        return kind
+    if {kind, other} == {"int", "float"}:
+        return "float"
+    return "str"
+
+
+def _conform(series, kind):
+    if kind == "float" and not pd.api.types.is_float_dtype(series):
+        return series.astype("float64")
+    if kind == "str" and not pd.api.types.is_string_dtype(series):
+        return series.astype("str")
+    return series
+
+
+class JSONSchema:
+    """Ordered column → kind, inferred from a sample and widened chunk by chunk."""
+
+    def __init__(self):
+        self.kinds = {}
+        self.added = []  # columns first seen after the sample
+        self.widened = []  # columns whose kind was widened after the sample
+        self.rows = 0
+
+    def infer(self, sample):
+        for col in sample.columns:
+            self.kinds[col] = _kind(sample[col])
+
+    def conform(self, chunk):
+        """``chunk`` with every schema column, in order, cast to its kind."""
+        for col in chunk.columns:
+            if col not in self.kinds:
+                self.kinds[col] = None
+                self.added.append(col)
+        chunk = chunk.reindex(columns=list(self.kinds))
+        for col, kind in self.kinds.items():
+            wider = _wider(kind, _kind(chunk[col]))
+            if kind is None and self.rows or wider == "int" and chunk[col].isna().any():
+                # Rows without a value (here, or in earlier chunks for a new column) are nulls, which ints can't hold
+                wider = {"int": "float", "bool": "str"}.get(wider, wider)
+            if wider != kind:
+                if kind is not None and col not in self.widened:
+                    self.widened.append(col)
+                self.kinds[col] = wider
+        self.rows += len(chunk)
+        return chunk.assign(**{col: _conform(chunk[col], kind) for col, kind in self.kinds.items() if kind is not None})
+
+    def to_frame(self):
+        return pd.DataFrame([
+            {"column": col, "kind": kind or "empty", "added": col in self.added, "widened": col in self.widened}
+            for col, kind in self.kinds.items()
+        ])
+
+
+# ─── Reader ──────────────────────────────────────────────────────────────────
+class JSONReader:
+    """Iterates a JSON / NDJSON path or binary file object as flattened DataFrame chunks.
+
+    ``records_path`` (dotted, e.g. ``"data.items"``) names the array of records
+    inside a wrapping object; by default the first array found is used.
+    ``position`` is the number of bytes read so far, for progress.
+    """
+
+    def __init__(self, source, chunk_rows, records_path=None, sep=SEP, schema_rows=SCHEMA_ROWS):
+        self.source = source
+        self.chunk_rows = chunk_rows
+        self.records_path = records_path.split(".") if records_path else None
+        self.sep = sep
+        self.schema_rows = schema_rows
+        self.schema = JSONSchema()
+        self.format = None
+        self.position = 0
+        self._fh = None
+        self._buf = b""
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        if isinstance(self.source, (str, os.PathLike)):
+            self._fh = open(self.source, "rb")
+        else:
+            self._fh = self.source
+            if hasattr(self._fh, "seek"):
+                self._fh.seek(0)
+
+    def close(self):
+        if self._fh is not None and self._fh is not self.source:
+            self._fh.close()
+        self._fh = None
+
+    def _read(self, size=READ_BYTES):
+        block = self._fh.read(size)
+        if isinstance(block, str):
+            block = block.encode()
+        self.position += len(block)
+        self._eof = not block
+        return block
+
+    def _detect(self):
+        """``"ndjson"``, ``"array"`` or ``"document"`` (an object wrapping the array), from the first line."""
+        while not self._eof and not self._buf.lstrip(codecs.BOM_UTF8 + b" \t\r\n"):
+            self._buf += self._read()
+        self._buf = self._buf.removeprefix(codecs.BOM_UTF8)
+        head = self._buf.lstrip()[:1]
+        if head in (b"", b"["):
+            return "array" if head else "ndjson"
+        if head != b"{":
+            raise JSONFormatError("expected a JSON object, a JSON array or newline-delimited JSON")
+        if self.records_path is not None:
+            return "document"
+        # A minified array has no newlines, so stop looking for one after a block
+        while not self._eof and b"\n" not in self._buf and len(self._buf) < READ_BYTES:
+            self._buf += self._read()
+        line, _, rest = self._buf.lstrip().partition(b"\n")
+        try:
+            first = json.loads(line)
+        except ValueError:
+            return "document"  # the first object spans lines: a pretty-printed wrapper
+        # A wrapper holds the records next to other containers (``meta``, ``links``) but no scalar fields;
+        # a single NDJSON record with a list of objects (``{"id": 1, "items": [...]}``) has some
+        values = first.values()
+        wraps_records = (any(isinstance(value, list) and value and isinstance(value[0], dict) for value in values)
+                         and all(isinstance(value, (dict, list)) for value in values))
+        if self._eof and not rest.strip() and wraps_records:
+            return "document"  # a single minified wrapper object
+        return "ndjson"
+
+    # ─── NDJSON ──
+    def _ndjson_batches(self):
+        lines = []
+        while True:
+            block = self._read()
+            self._buf += block
+            parts = self._buf.split(b"\n")
+            self._buf = parts.pop() if block else b""  # a partial last line waits for the next block
+            lines.extend(line for line in parts if line.strip())
+            while len(lines) >= self.chunk_rows or not block and lines:
+                batch, lines = lines[:self.chunk_rows], lines[self.chunk_rows:]
+                try:
+                    yield json.loads(b"[" + b",".join(batch) + b"]")
+                except ValueError as exc:
+                    raise JSONFormatError(f"invalid JSON line before byte {self.position:,}: {exc}") from exc
+            if not block:
+                return
+
+    # ─── JSON document ──
+    def _fill(self):
+        """Read another block into the text buffer; ``False`` at end of input."""
+        block = self._read(max(READ_BYTES, len(self._text) - self._pos))
+        if self._pos:
+            self._text, self._pos = self._text[self._pos:], 0
+        self._text += self._utf8.decode(block, final=not block)
+        return bool(block)
+
+    def _skip(self, chars=_WHITESPACE):
+        while True:
+            while self._pos < len(self._text) and self._text[self._pos] in chars:
+                self._pos += 1
+            if self._pos < len(self._text) or not self._fill():
+                return self._text[self._pos:self._pos + 1]
+
+    def _value(self):
+        """Decode the next complete value, reading more input until it is complete."""
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError as exc:
+                if not self._fill():
+                    raise JSONFormatError(f"invalid JSON near byte {self.position:,}: {exc.msg}") from exc
+                continue
+            # A number or literal ending exactly at the buffer end may continue in the next block
+            if end == len(self._text) and not isinstance(value, (dict, list, str)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _expect(self, char):
+        if self._skip() != char:
+            raise JSONFormatError(f"expected {char!r} near byte {self.position:,}")
+        self._pos += 1
+
+    def _find_records(self, path):
+        """Advance into the object at the cursor until the cursor is on the records array."""
+        self._expect("{")
+        while self._skip(_WHITESPACE + ",") == '"':
+            key = self._value()
+            self._expect(":")
+            head = self._skip()
+            if path is None and head == "[" or path is not None and key == path[0] and len(path) == 1:
+                return
+            if path is not None and key == path[0] and head == "{":
+                return self._find_records(path[1:])
+            self._value()  # not it: skip the value
+        raise JSONFormatError("no array of records found" if self.records_path is None
+                              else f"no array at {'.'.join(self.records_path)!r}")
+
+    def _array_batches(self):
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._text, self._pos = self._utf8.decode(self._buf), 0
+        self._buf = b""
+        if self.format == "document":
+            self._find_records(self.records_path)
+        self._expect("[")
+        batch = []
+        while True:
+            head = self._skip(_WHITESPACE + ",")
+            if head == "]" or not head:
+                break
+            batch.append(self._value())
+            if len(batch) >= self.chunk_rows:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # ─── Chunks ──
+    def _frames(self):
+        batches = self._ndjson_batches() if self.format == "ndjson" else self._array_batches()
+        for records in batches:
+            try:
+                frame = pd.DataFrame.from_records(records)
+            except (TypeError, ValueError) as exc:
+                raise JSONFormatError("records must be JSON objects") from exc
+            yield flatten(frame, self.sep)
+
+    def __iter__(self):
+        self._open()
+        self.format = self._detect()
+        frames = self._frames()
+        held, rows = [], 0
+        for frame in frames:
+            held.append(frame)
+            rows += len(frame)
+            if rows >= self.schema_rows:
+                break
+        if held:
+            self.schema.infer(pd.concat(held, ignore_index=True).head(self.schema_rows))
+        for frame in held:
+            yield self.schema.conform(frame)
+        for frame in frames:
+            yield self.schema.conform(frame)
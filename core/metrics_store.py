@@ -0,0 +1,235 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# ─── Pipeline Metrics Store ──────────────────────────────────────────────────
+# Fixed-memory time series per pipeline. Each pipeline owns one ring buffer per
+# resolution tier; a sample is folded into all tiers at once (sum + count per
+# slot), so downsampling costs nothing extra and old data ages out by being
+# overwritten. A slot remembers which time bucket it holds, so stale slots read
+# as gaps instead of old values.
+#
+#   tier  step   slots   span
+#   1s    1 s    300     5 minutes
+#   1m    60 s   1440    24 hours
+#   1h    3600 s 168     7 days
+#
+# At 18 bytes per slot that is ~34 KB per pipeline: a day of per-second
+# samples for 200 pipelines stays under 7 MB.
+
+FIELDS = ("records_per_s", "latency_ms", "success_rate")
+TIERS = (("1s", 1, 300), ("1m", 60, 1440), ("1h", 3600, 168))
+WARN_SUCCESS_RATE = 0.98
+IDLE_AFTER_S = 24 * 3600
+LIVE_WITHIN_S = 5
+
+
+class RingSeries:
+    """One resolution tier: ``capacity`` slots of ``step`` seconds each."""
+
+    def __init__(self, step, capacity, fields=len(FIELDS)):
+        self.step = step
+        self.capacity = capacity
+        self.sums = np.zeros((capacity, fields), dtype=np.float32)
+        self.counts = np.zeros(capacity, dtype=np.uint16)
+        self.buckets = np.full(capacity, -1, dtype=np.int32)  # time bucket held by each slot
+
+    @property
+    def nbytes(self):
+        return self.sums.nbytes + self.counts.nbytes + self.buckets.nbytes
+
+    def add(self, ts, values):
+        bucket = int(ts // self.step)
+        slot = bucket % self.capacity
+        if self.buckets[slot] != bucket:
+            self.buckets[slot] = bucket
+            self.sums[slot] = 0
+            self.counts[slot] = 0
+        self.sums[slot] += values
+        self.counts[slot] += 1
+
+    def add_many(self, timestamps, values):
+        """Vectorized ``add`` for a batch of samples (e.g. a backfill)."""
+        buckets = (np.asarray(timestamps) // self.step).astype(np.int64)
+        # Only the newest ``capacity`` buckets can survive in the ring
+        keep = buckets > buckets.max() - self.capacity
+        buckets, values = buckets[keep], np.asarray(values, dtype=np.float64)[keep]
+        if len(buckets) > 1 and (buckets[1:] < buckets[:-1]).any():
+            order = np.argsort(buckets, kind="stable")
+            buckets, values = buckets[order], values[order]
+        # Runs of equal buckets: one reduceat per batch instead of a hash table
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        unique = buckets[starts]
+        sums = np.add.reduceat(values, starts, axis=0)
+        counts = np.diff(np.r_[starts, len(buckets)])
+        slots = unique % self.capacity
+        fresh = self.buckets[slots] != unique
+        self.sums[slots[fresh]] = 0
+        self.counts[slots[fresh]] = 0
+        self.buckets[slots] = unique
+        self.sums[slots] += sums.astype(np.float32)
+        self.counts[slots] = np.minimum(self.counts[slots].astype(np.int64) + counts, np.iinfo(np.uint16).max)
+
+    def window(self, now, seconds):
+        """``(bucket start times, per-field means)`` for the last ``seconds``, oldest first; gaps are NaN."""
+        last = int(now // self.step)
+        n = min(self.capacity, max(1, int(seconds // self.step)))
+        wanted = np.arange(last - n + 1, last + 1)
+        slots = wanted % self.capacity
+        present = self.buckets[slots] == wanted
+        means = np.full((n, self.sums.shape[1]), np.nan)
+        counts = self.counts[slots[present]].astype(np.float64)[:, None]
+        means[present] = self.sums[slots[present]] / counts
+        return wanted * self.step, means
+
+
+class PipelineSeries:
+    """All tiers of one pipeline plus its last run."""
+
+    def __init__(self, name):
+        self.name = name
+        self.tiers = {label: RingSeries(step, capacity) for label, step, capacity in TIERS}
+        self.last_ts = None
+        self.last_status = None
+
+    @property
+    def nbytes(self):
+        return sum(tier.nbytes for tier in self.tiers.values())
+
+    def record(self, ts, values, status="ok"):
+        for tier in self.tiers.values():
+            tier.add(ts, values)
+        if self.last_ts is None or ts >= self.last_ts:
+            self.last_ts, self.last_status = ts, status
+
+    def record_many(self, timestamps, values):
+        for tier in self.tiers.values():
+            tier.add_many(timestamps, values)
+        latest = float(np.max(timestamps))
+        if self.last_ts is None or latest >= self.last_ts:
+            self.last_ts, self.last_status = latest, "ok"
+
+    def tier_for(self, seconds):
+        """Finest tier whose span covers ``seconds``."""
+        for label, step, capacity in TIERS:
+            if step * capacity >= seconds:
+                return self.tiers[label]
+        return self.tiers[TIERS[-1][0]]
+
+    def window(self, seconds, now=None):
+        return self.tier_for(seconds).window(time.time() if now is None else now, seconds)
+
+
+class MetricsStore:
+    """Thread-safe registry of ``PipelineSeries``; pipelines are created on first record."""
+
+    def __init__(self):
+        self.pipelines = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.pipelines
+
+    def get(self, name):
+        with self._lock:
+            series = self.pipelines.get(name)
+            if series is None:
+                series = self.pipelines[name] = PipelineSeries(name)
+            return series
+
+    def record(self, name, records_per_s, latency_ms, success_rate=1.0, ts=None, status="ok"):
+        series = self.get(name)
+        with self._lock:
+            series.record(time.time() if ts is None else ts, (records_per_s, latency_ms, success_rate), status)
+
+    def record_many(self, name, timestamps, values):
+        """Bulk samples: ``values`` is an ``(n, len(FIELDS))`` array."""
+        series = self.get(name)
+        with self._lock:
+            series.record_many(timestamps, values)
+
+    @property
+    def nbytes(self):
+        return sum(series.nbytes for series in self.pipelines.values())
+
+    def throughput(self, seconds, now=None, names=None):
+        """Total records/sec over the pipelines (default: all) as ``(times, values)``; gaps count as 0."""
+        now = time.time() if now is None else now
+        times, total = None, None
+        with self._lock:
+            for name in names or list(self.pipelines):
+                times, means = self.pipelines[name].window(seconds, now)
+                rate = np.nan_to_num(means[:, 0])
+                total = rate if total is None else total + rate
+        return times, total
+
+    def table(self, window_s=60, now=None):
+        """One row per pipeline with the page's columns; averages over the ``window_s`` up to its last sample."""
+        now = time.time() if now is None else now
+        rows = []
+        with self._lock:
+            for name, series in self.pipelines.items():
+                _, means = series.window(window_s, min(now, series.last_ts if series.last_ts is not None else now))
+                avg = np.nanmean(means, axis=0) if np.isfinite(means[:, 0]).any() else np.full(len(FIELDS), np.nan)
+                age = now - series.last_ts if series.last_ts is not None else None
+                if age is None or age > IDLE_AFTER_S:
+                    status = "⚪ Idle"
+                elif series.last_status != "ok":
+                    status = "🔴 Failed"
+                elif np.isfinite(avg[2]) and avg[2] < WARN_SUCCESS_RATE:
+                    status = "🟡 Warning"
+                else:
+                    status = "🟢 Running"
+                rows.append({
+                    "Pipeline": name,
+                    "Status": status,
+                    "Records/sec": int(avg[0]) if np.isfinite(avg[0]) else 0,
+                    "Latency (ms)": round(float(avg[1]), 1) if np.isfinite(avg[1]) else None,
+                    "Success Rate": f"{avg[2]:.1%}" if np.isfinite(avg[2]) else "—",
+                    "Last Run": _ago(age),
+                })
+        return pd.DataFrame(rows)
+
+
+def _ago(seconds):
+    if seconds is None:
+        return "Never"
+    if seconds < LIVE_WITHIN_S:
+        return "Live"
+    if seconds < 3600:
+        return f"{max(1, int(seconds // 60))} min ago" if seconds >= 60 else f"{int(seconds)} s ago"
+    if seconds < 86400:
+        return f"{int(seconds // 3600)} hr ago"
+    return f"{int(seconds // 86400)} d ago"
+
+
+# ─── Demo History ────────────────────────────────────────────────────────────
+# The monitor's sample pipelines, backfilled with a seeded day of per-second
+# samples so the tiers have something to show before real runs arrive.
+DEMO_PIPELINES = {
+    # name: (records/sec, latency ms, success rate, seconds since last sample)
+    "Sales → Snowflake": (12450, 45, 0.998, 120),
+    "Finance → Redshift": (8320, 78, 0.995, 300),
+    "HR → Data Lake": (2100, 234, 0.972, 3600),
+    "CRM → Analytics DB": (5670, 56, 0.999, 180),
+    "IoT → Kafka → Lake": (45000, 12, 0.997, 0),
+}
+
+
+def backfill_demo(store, now=None, seconds=86400, seed=42):
+    now = time.time() if now is None else now
+    rng = np.random.default_rng(seed)
+    for name, (rate, latency, success, lag) in DEMO_PIPELINES.items():
+        timestamps = np.arange(now - lag - seconds, now - lag)
+        daily = 1 + 0.25 * np.sin(2 * np.pi * timestamps / 86400)
+        values = np.column_stack([
+            rate * daily * rng.normal(1, 0.08, seconds),
+            latency * rng.lognormal(0, 0.15, seconds),
+            np.clip(rng.normal(success, 0.002, seconds), 0, 1),
+        ])
+        store.record_many(name, timestamps, values)
+
+
+METRICS = MetricsStore()
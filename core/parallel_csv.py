@@ -0,0 +1,152 @@
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# ─── Parallel CSV Loader ─────────────────────────────────────────────────────
+# A large CSV file is cut into byte ranges that each start at a line start and
+# hold roughly ``chunk_rows`` rows (sized from the average line length of the
+# first block). Ranges are parsed in a process pool — each worker reads its
+# range and parses it with the header line prepended, so every range gets the
+# same column names — and the frames are yielded strictly in file order. At
+# most ``max_in_flight`` ranges (default 2 × workers) are parsed or waiting
+# at once, so memory stays bounded however large the file is.
+#
+# Cuts are made only at newlines outside quotes: ranges are found by one
+# sequential pass that counts quote characters, and a newline after an odd
+# count sits inside a quoted field, so the cut moves back to an earlier line.
+# A quoted multi-line field anywhere in the file therefore stays in one range.
+# Buffers, read options that count rows (skiprows, nrows, ...) and options
+# that change what a quote means (escapechar, quoting) are read serially with
+# ``pd.read_csv``.
+#
+# Workers are started with ``forkserver`` (``spawn`` where that's missing),
+# never ``fork``: the app process runs threads (Streamlit, scheduler, health
+# checks), and a forked child can inherit a lock one of them held.
+
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+DEFAULT_WORKERS = min(16, os.cpu_count() or 1)
+MIN_PARALLEL_BYTES = 64 << 20
+MIN_RANGE_BYTES = 1 << 20
+SAMPLE_BYTES = 1 << 20
+ROW_OPTIONS = ("header", "names", "skiprows", "skipfooter", "nrows", "index_col", "comment", "lineterminator",
+               "escapechar", "quoting")
+
+
+def splittable(source, **read_csv_kwargs):
+    """Whether ``source`` is a local file that can be cut into ranges on newlines."""
+    if not isinstance(source, (str, os.PathLike)) or not os.path.isfile(source):
+        return False
+    return not any(option in read_csv_kwargs for option in ROW_OPTIONS)
+
+
+def _cut(buffer, quote):
+    """Offset just past the last newline of ``buffer`` that lies outside quotes, or 0 if there is none.
+
+    ``buffer`` starts outside quotes; a doubled quote inside a field counts twice, so parity still holds.
+    """
+    inside = buffer.count(quote) % 2
+    newline = buffer.rfind(b"\n")
+    while newline >= 0:
+        if not (inside ^ buffer.count(quote, newline + 1) % 2):
+            return newline + 1
+        newline = buffer.rfind(b"\n", 0, newline)
+    return 0
+
+
+def split_ranges(path, range_bytes, quotechar='"'):
+    """``(header line, ranges)``: ``ranges`` yields ``(start, end)`` spans of about ``range_bytes``.
+
+    Every range starts at a line start outside quotes. Ranges are found
+    while the file is read, so parsing can begin before the scan finishes.
+    """
+    quote = quotechar.encode()
+    with open(path, "rb") as fh:
+        header = fh.readline()
+        first = fh.tell()
+
+    def ranges():
+        with open(path, "rb") as fh:
+            fh.seek(first)
+            start, buffer = first, b""
+            while True:
+                block = fh.read(max(range_bytes - len(buffer), len(buffer) // 2))  # grows while no cut is found
+                if not block:
+                    if buffer:
+                        yield start, start + len(buffer)
+                    return
+                buffer += block
+                cut = _cut(buffer, quote) if len(buffer) >= range_bytes else 0
+                if cut:  # else the range runs on until a line ends outside quotes
+                    yield start, start + cut
+                    start, buffer = start + cut, buffer[cut:]
+
+    return header, ranges()
+
+
+def range_bytes(path, chunk_rows):
+    """Bytes per range for about ``chunk_rows`` rows, from the first block's average line length."""
+    with open(path, "rb") as fh:
+        block = fh.read(SAMPLE_BYTES)
+    lines = max(block.count(b"\n"), 1)
+    return max(MIN_RANGE_BYTES, len(block) * chunk_rows // lines)
+
+
+def _parse_range(path, header, start, end, read_csv_kwargs):
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        data = fh.read(end - start)
+    return pd.read_csv(io.BytesIO(header + data), **read_csv_kwargs)
+
+
+class ParallelCSVReader:
+    """Iterates a CSV file as DataFrames parsed in a process pool, in file order.
+
+    ``position`` is the end offset of the last range yielded, for progress;
+    ``ranges`` counts the ranges found so far.
+    """
+
+    def __init__(self, path, chunk_rows, workers=DEFAULT_WORKERS, max_in_flight=None, **read_csv_kwargs):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.max_in_flight = max_in_flight or 2 * workers
+        self.read_csv_kwargs = read_csv_kwargs
+        self.ranges = 0
+        self.position = 0
+
+    def __iter__(self):
+        header, ranges = split_ranges(self.path, range_bytes(self.path, self.chunk_rows),
+                                      self.read_csv_kwargs.get("quotechar", '"'))
+        self.ranges = 0
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context(START_METHOD)) as pool:
+            pending = deque()
+
+            def submit():
+                span = next(ranges, None)
+                if span is not None:
+                    self.ranges += 1
+                    pending.append((span[1], pool.submit(_parse_range, self.path, header, *span, self.read_csv_kwargs)))
+
+            for _ in range(self.max_in_flight):
+                submit()
+            try:
+                while pending:
+                    end, future = pending.popleft()
+                    frame = future.result()
+                    submit()  # keep the pool busy while the caller handles this frame
+                    self.position = end
+                    yield frame
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+
+def parallel_reader(source, chunk_rows, workers=DEFAULT_WORKERS, **read_csv_kwargs):
+    """A ``ParallelCSVReader`` when ``source`` is a large splittable file and ``workers > 1``, else ``None``."""
+    if workers <= 1 or not splittable(source, **read_csv_kwargs) or os.path.getsize(source) < MIN_PARALLEL_BYTES:
+        return None
+    return ParallelCSVReader(source, chunk_rows, workers=workers, **read_csv_kwargs)
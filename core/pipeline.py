@@ -0,0 +1,465 @@
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import metrics_store
+from core.ingest import DEFAULT_CHUNK_ROWS
+from core.json_reader import JSONReader
+from core.parallel_csv import ParallelCSVReader, parallel_reader
+from core.sql_engine import add_columns, index_candidates, sql_values
+
+# ─── Ingestion Pipeline Executor ─────────────────────────────────────────────
+# connect → validate run once up front; extract → transform → quality → load
+# then run as one thread each, joined by bounded queues, so reading chunk N+1
+# overlaps transforming chunk N and loading chunk N-1. The bounded queues give
+# back-pressure: a slow load stage stalls extraction instead of buffering the
+# whole file. Metrics are collected per stage and polled from the caller's
+# thread (Streamlit elements can only be updated from the script thread).
+
+STAGES = ("connect", "validate", "extract", "transform", "quality", "load")
+DEFAULT_QUEUE_SIZE = 4
+_DONE = object()
+
+
+class PipelineError(Exception):
+    pass
+
+
+# ─── Sources ─────────────────────────────────────────────────────────────────
+class CSVSource:
+    """CSV file path or file object, read in ``chunk_rows`` chunks.
+
+    With ``workers > 1``, large files are parsed in a process pool by byte
+    range (see ``core.parallel_csv``) and still yielded in file order.
+    """
+
+    def __init__(self, path_or_buffer, chunk_rows=DEFAULT_CHUNK_ROWS, workers=1, **read_csv_kwargs):
+        self.source = path_or_buffer
+        self.chunk_rows = chunk_rows
+        self.workers = workers
+        self.read_csv_kwargs = read_csv_kwargs
+        self.size = None
+        self._reader = None
+
+    def connect(self):
+        if isinstance(self.source, (str, os.PathLike)):
+            if not os.path.isfile(self.source):
+                raise PipelineError(f"source file not found: {self.source}")
+            self.size = os.path.getsize(self.source)
+        else:
+            self.size = getattr(self.source, "size", None)
+            self.source.seek(0)
+
+    def sample(self, rows=100):
+        frame = pd.read_csv(self.source, nrows=rows, **self.read_csv_kwargs)
+        if hasattr(self.source, "seek"):
+            self.source.seek(0)
+        return frame
+
+    def chunks(self):
+        parallel = parallel_reader(self.source, self.chunk_rows, self.workers, **self.read_csv_kwargs)
+        if parallel is not None:
+            self._reader = parallel
+            yield from parallel
+            return
+        with pd.read_csv(self.source, chunksize=self.chunk_rows, **self.read_csv_kwargs) as reader:
+            self._reader = reader
+            yield from reader
+
+    def progress(self, rows):
+        if isinstance(self._reader, ParallelCSVReader):
+            return min(1.0, self._reader.position / self.size) if self.size else None
+        handle = self.source if hasattr(self.source, "tell") else getattr(getattr(self._reader, "handles", None), "handle", None)
+        try:
+            position = handle.tell() if handle is not None else None
+        except (OSError, ValueError):
+            position = None
+        return min(1.0, position / self.size) if position is not None and self.size else None
+
+
+class JSONSource(CSVSource):
+    """JSON array / NDJSON path or file object, flattened into ``chunk_rows`` chunks (see ``core.json_reader``)."""
+
+    def __init__(self, path_or_buffer, chunk_rows=DEFAULT_CHUNK_ROWS, records_path=None):
+        super().__init__(path_or_buffer, chunk_rows=chunk_rows)
+        self.records_path = records_path
+
+    def sample(self, rows=100):
+        with JSONReader(self.source, rows, records_path=self.records_path, schema_rows=rows) as reader:
+            return next(iter(reader), pd.DataFrame())
+
+    def chunks(self):
+        with JSONReader(self.source, self.chunk_rows, records_path=self.records_path) as reader:
+            self._reader = reader
+            yield from reader
+
+    def progress(self, rows):
+        position = self._reader.position if self._reader is not None else None
+        return min(1.0, position / self.size) if position is not None and self.size else None
+
+
+class GeneratorSource:
+    """Chunks from a callable such as ``synthetic.iter_chunks``; ``total_rows`` drives progress."""
+
+    def __init__(self, make_chunks, total_rows=None):
+        self.make_chunks = make_chunks
+        self.total_rows = total_rows
+
+    def connect(self):
+        pass
+
+    def sample(self, rows=100):
+        return next(iter(self.make_chunks()), pd.DataFrame()).head(rows)
+
+    def chunks(self):
+        return self.make_chunks()
+
+    def progress(self, rows):
+        return min(1.0, rows / self.total_rows) if self.total_rows else None
+
+
+# ─── Targets ─────────────────────────────────────────────────────────────────
+class SQLiteTarget:
+    """SQLite database file; exposes the same ``append``/``delete``/``create_indexes`` as ``SQLEngine``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+
+    def connect(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    @property
+    def tables(self):
+        rows = self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        return {name for (name,) in rows}
+
+    def append(self, name, frame, replace=False):
+        if not replace:
+            add_columns(self._conn, name, frame)
+        sql_values(frame).to_sql(name, self._conn, index=False, if_exists="replace" if replace else "append")
+        self._conn.commit()
+
+    def delete(self, name, column, values):
+        before = self._conn.total_changes
+        self._conn.executemany(f'DELETE FROM "{name}" WHERE "{column}" = ?', ((value,) for value in values))
+        self._conn.commit()
+        return self._conn.total_changes - before
+
+    def create_indexes(self, name, columns):
+        for col in columns:
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{name}_{col}" ON "{name}" ("{col}")')
+        self._conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# ─── Default Transform / Quality Steps ───────────────────────────────────────
+def normalize_columns(chunk):
+    chunk.columns = [re.sub(r"\W+", "_", str(col)).strip("_").lower() for col in chunk.columns]
+    return chunk
+
+
+def drop_blank_rows(chunk):
+    return chunk.dropna(how="all")
+
+
+def null_check(chunk):
+    """Rows with a null in any column count as failing."""
+    return chunk.isna().any(axis=1).to_numpy()
+
+
+DEFAULT_TRANSFORMS = (normalize_columns, drop_blank_rows)
+DEFAULT_CHECKS = (null_check,)
+
+
+# ─── Stage Metrics ───────────────────────────────────────────────────────────
+class StageMetrics:
+    def __init__(self, name):
+        self.name = name
+        self.status = "pending"
+        self.records = 0
+        self.batches = 0
+        self.busy_s = 0.0
+        self.started = None
+        self.finished = None
+        self.latencies_ms = []
+
+    def start(self):
+        self.status = "running"
+        self.started = time.perf_counter()
+
+    def batch(self, records, seconds):
+        self.records += records
+        self.batches += 1
+        self.busy_s += seconds
+        self.latencies_ms.append(seconds * 1000)
+
+    def finish(self, status="done"):
+        self.status = status
+        self.finished = time.perf_counter()
+
+    def summary(self):
+        wall = ((self.finished or time.perf_counter()) - self.started) if self.started else 0.0
+        ordered = sorted(self.latencies_ms)
+        return {
+            "stage": self.name,
+            "status": self.status,
+            "records": self.records,
+            "batches": self.batches,
+            "records_per_s": round(self.records / wall) if wall else 0,
+            "p50_ms": round(ordered[len(ordered) // 2], 1) if ordered else 0.0,
+            "p95_ms": round(ordered[int(len(ordered) * 0.95)], 1) if ordered else 0.0,
+            "busy_pct": round(100 * self.busy_s / wall, 1) if wall else 0.0,
+        }
+
+
+# ─── Executor ────────────────────────────────────────────────────────────────
+class Pipeline:
+    """Staged ingestion of ``source`` into ``table`` of ``target``.
+
+    ``target`` is an ``SQLEngine`` or ``SQLiteTarget``. ``transforms`` map a
+    chunk to a chunk; ``checks`` return a chunk's failing rows as a boolean
+    mask (a row failing several checks counts once) or as a count.
+    With ``monitor`` set, every loaded batch is recorded under that name in
+    ``metrics_store.METRICS`` for the Pipeline Monitor. ``replace=False``
+    appends to an existing table instead of replacing it on the first batch.
+    Targets with ``commit()`` / ``abort()`` (see ``core.incremental``) get
+    one of them once the stages finish: ``commit`` if the run succeeded,
+    else ``abort``. Sources with a ``commit()`` method (streams) have it
+    called once per batch, in order, after that batch is durable: right
+    after it is loaded, or for such targets after their ``commit``. Checks
+    with one (see ``core.dedup``) are committed once, after the whole run
+    succeeded.
+    """
+
+    def __init__(self, source, target, table, transforms=DEFAULT_TRANSFORMS, checks=DEFAULT_CHECKS,
+                 expected_columns=None, queue_size=DEFAULT_QUEUE_SIZE, index=True, monitor=None, replace=True):
+        self.source = source
+        self.target = target
+        self.table = table
+        self.transforms = transforms
+        self.checks = checks
+        self.expected_columns = expected_columns
+        self.queue_size = queue_size
+        self.index = index
+        self.monitor = monitor
+        self.replace = replace
+        self.metrics = {name: StageMetrics(name) for name in STAGES}
+        self.failed_rows = 0
+        self.error = None
+        self.columns = []
+        self._index_columns = []
+        self._stop = threading.Event()
+        self._started = None
+        self._last_load = None
+        self._uncommitted = 0
+
+    # Each worker pulls from ``inbox`` (None for extract) and pushes to ``outbox``
+    def _put(self, outbox, item):
+        while not self._stop.is_set():
+            try:
+                outbox.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, inbox):
+        while not self._stop.is_set():
+            try:
+                return inbox.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _drain(self, inbox):
+        while True:
+            item = self._get(inbox)
+            if item is _DONE:
+                return
+            yield item
+
+    def _worker(self, name, inbox, outbox, step):
+        metrics = self.metrics[name]
+        metrics.start()
+        try:
+            items = iter(self.source.chunks()) if inbox is None else self._drain(inbox)
+            while True:
+                start = time.perf_counter()
+                chunk = next(items, _DONE)
+                if chunk is _DONE:
+                    break
+                if step is not None:
+                    # Queue waits are idle time, not stage latency; extract's cost is the read itself
+                    start = time.perf_counter()
+                    chunk = step(chunk)
+                metrics.batch(len(chunk), time.perf_counter() - start)
+                if outbox is not None and not self._put(outbox, chunk):
+                    break
+            metrics.finish("stopped" if self._stop.is_set() else "done")
+        except Exception as exc:
+            self.error = self.error or PipelineError(f"{name} failed: {exc}")
+            self._stop.set()
+            metrics.finish("failed")
+        if outbox is not None and not self._stop.is_set():
+            self._put(outbox, _DONE)
+
+    def _transform(self, chunk):
+        for fn in self.transforms:
+            chunk = fn(chunk)
+        return chunk
+
+    def _quality(self, chunk):
+        failing = np.zeros(len(chunk), dtype=bool)
+        counted = 0
+        for check in self.checks:
+            result = check(chunk)
+            if isinstance(result, np.ndarray):
+                failing |= result
+            else:
+                counted += int(result)
+        # Counts can't be matched to rows, so at most every row of the chunk fails
+        self.failed_rows += min(len(chunk), int(failing.sum()) + counted)
+        return chunk
+
+    def _load(self, chunk):
+        first = self.metrics["load"].batches == 0
+        start = time.perf_counter()
+        self.target.append(self.table, chunk, replace=first and self.replace)
+        commit = getattr(self.source, "commit", None)
+        if commit is not None:
+            if hasattr(self.target, "commit"):
+                self._uncommitted += 1  # durable only once the target commits; see ``run``
+            else:
+                commit()
+        if first or len(chunk.columns) > len(self.columns):
+            self.columns = list(chunk.columns)  # grows when the source's schema widens mid-stream
+        if first:
+            self._index_columns = index_candidates(chunk) if self.index else []
+        if self.monitor:
+            end = time.perf_counter()
+            extracted = self.metrics["extract"].records
+            metrics_store.METRICS.record(
+                self.monitor,
+                records_per_s=len(chunk) / max(end - (self._last_load or self._started), 1e-6),
+                latency_ms=(end - start) * 1000,
+                success_rate=1 - self.failed_rows / extracted if extracted else 1.0,
+            )
+            self._last_load = end
+        return chunk
+
+    def _run_step(self, name, fn):
+        metrics = self.metrics[name]
+        metrics.start()
+        start = time.perf_counter()
+        try:
+            records = fn()
+        except PipelineError:
+            metrics.finish("failed")
+            raise
+        except Exception as exc:
+            metrics.finish("failed")
+            raise PipelineError(f"{name} failed: {exc}") from exc
+        metrics.batch(records, time.perf_counter() - start)
+        metrics.finish()
+
+    def _validate(self):
+        sample = self.source.sample()
+        if sample.empty or len(sample.columns) == 0:
+            raise PipelineError("source has no rows")
+        columns = list(normalize_columns(sample.copy()).columns)
+        if len(set(columns)) != len(columns):
+            raise PipelineError("duplicate column names after normalization")
+        missing = [col for col in (self.expected_columns or ()) if col not in columns]
+        if missing:
+            raise PipelineError(f"missing expected columns: {', '.join(missing)}")
+        return len(sample)
+
+    def progress(self):
+        """Snapshot for the UI: ``{"fraction", "elapsed_s", "stages": [...]}``."""
+        return {
+            "fraction": self.source.progress(self.metrics["extract"].records),
+            "elapsed_s": time.perf_counter() - self._started if self._started else 0.0,
+            "stages": [self.metrics[name].summary() for name in STAGES],
+        }
+
+    def run(self, on_progress=None, poll_s=0.2):
+        """Run every stage; ``on_progress(snapshot)`` is called from this thread while stages run."""
+        self._started = time.perf_counter()
+        connect = getattr(self.target, "connect", None)
+
+        def do_connect():
+            self.source.connect()
+            if connect is not None:
+                connect()
+            return 0
+
+        self._run_step("connect", do_connect)
+        self._run_step("validate", self._validate)
+
+        extracted, transformed, checked = (queue.Queue(maxsize=self.queue_size) for _ in range(3))
+        threads = [
+            threading.Thread(target=self._worker, args=("extract", None, extracted, None), daemon=True),
+            threading.Thread(target=self._worker, args=("transform", extracted, transformed, self._transform), daemon=True),
+            threading.Thread(target=self._worker, args=("quality", transformed, checked, self._quality), daemon=True),
+            threading.Thread(target=self._worker, args=("load", checked, None, self._load), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            threads[-1].join(poll_s)
+            if on_progress is not None:
+                on_progress(self.progress())
+        if on_progress is not None:
+            on_progress(self.progress())
+
+        if self.error is None and self.metrics["load"].batches and self._index_columns:
+            self.target.create_indexes(self.table, self._index_columns)
+        # Targets that stage a run (snapshot, manifest) publish it only on success
+        commit = getattr(self.target, "commit", None)
+        if self.error is None and commit is not None:
+            try:
+                commit()
+                source_commit = getattr(self.source, "commit", None)
+                for _ in range(self._uncommitted):
+                    source_commit()
+            except Exception as exc:
+                self.error = PipelineError(f"commit failed: {exc}")
+        abort = getattr(self.target, "abort", None)
+        if self.error is not None and abort is not None:
+            abort()
+        for endpoint in (self.source, self.target):
+            close = getattr(endpoint, "close", None)
+            if close is not None:
+                close()
+        if self.error is not None:
+            if self.monitor:
+                metrics_store.METRICS.record(self.monitor, 0, 0, 0, status="failed")
+            raise self.error
+        for check in self.checks:
+            commit = getattr(check, "commit", None)
+            if commit is not None:
+                commit()
+
+        loaded = self.metrics["load"].records
+        return {
+            "table": self.table,
+            "columns": self.columns,
+            "records": loaded,
+            "failed_rows": self.failed_rows,
+            "quality_pct": round(100 * (1 - self.failed_rows / loaded), 2) if loaded else 100.0,
+            "seconds": time.perf_counter() - self._started,
+            "stages": [self.metrics[name].summary() for name in STAGES],
+        }
@@ -0,0 +1,332 @@
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core import ref_integrity
+
+# ─── Data Quality Rules Engine ───────────────────────────────────────────────
+# Rules are plain dicts. ``RuleSet`` compiles each into a vectorized mask
+# function; a chunk is checked against every rule in one pass, producing a
+# (rules × rows) violation matrix from which counts, failing rows and sample
+# rows are read off. ``QualityRunner`` accumulates results across chunks —
+# including uniqueness, which needs state across chunk boundaries — and can
+# fan chunks out to a process pool.
+#
+#     {"name": "Range Validation", "type": "range", "column": "sale_amount", "min": 0, "max": 1_000_000}
+#
+# Types: not_null, range (min/max), date (optional format), pattern (regex),
+# unique, in_set (values, or reference=(table, column): probed against the
+# referenced column's key index, built once and reused — see ref_integrity).
+
+DEFAULT_RULES = [
+    {"name": "Null Check", "type": "not_null", "column": "customer_id"},
+    {"name": "Range Validation", "type": "range", "column": "sale_amount", "min": 0, "max": 1_000_000},
+    {"name": "Format Check", "type": "date", "column": "sale_date", "format": "%Y-%m-%d"},
+    {"name": "Duplicate Check", "type": "unique", "column": "transaction_id"},
+    {"name": "Referential Integrity", "type": "in_set", "column": "product",
+     "values": ["Product A", "Product B", "Product C", "Product D"], "label": "products table"},
+]
+
+SAMPLE_ROWS = 5
+WARN_PCT = 1.0
+
+
+def describe(rule):
+    col = rule["column"]
+    kind = rule["type"]
+    if kind == "not_null":
+        return f"{col} NOT NULL"
+    if kind == "range":
+        low, high = rule.get("min"), rule.get("max")
+        if low is not None and high is not None:
+            return f"{col} BETWEEN {low:,} AND {high:,}"
+        return f"{col} >= {low:,}" if low is not None else f"{col} <= {high:,}"
+    if kind == "date":
+        return f"{col} IS VALID DATE"
+    if kind == "pattern":
+        return f"{col} MATCHES /{rule['pattern']}/"
+    if kind == "unique":
+        return f"{col} UNIQUE"
+    if kind == "in_set":
+        if rule.get("reference"):
+            table, column = rule["reference"]
+            return f"{col} IN {table}.{column}"
+        label = rule.get("label") or f"({len(rule['values'])} values)"
+        return f"{col} IN {label}"
+    raise ValueError(f"unknown rule type {kind!r}")
+
+
+# ─── Mask Compilers ──────────────────────────────────────────────────────────
+# Each returns ``fn(series) -> bool ndarray`` where True marks a violation.
+# Nulls only violate ``not_null``; the other rules skip them.
+
+def _not_null(rule):
+    return lambda s: s.isna().to_numpy()
+
+
+def _range(rule):
+    low, high = rule.get("min"), rule.get("max")
+
+    def check(s):
+        values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        bad = np.isnan(values) & s.notna().to_numpy()  # non-numeric text
+        with np.errstate(invalid="ignore"):
+            if low is not None:
+                bad |= values < low
+            if high is not None:
+                bad |= values > high
+        return bad
+    return check
+
+
+def _by_value(fn):
+    # Evaluate ``fn`` once per distinct value: dates, codes and other formatted
+    # text repeat heavily, so parsing the uniques is far cheaper than every row
+    def check(s):
+        codes, uniques = pd.factorize(s, use_na_sentinel=True)
+        if not len(uniques):
+            return np.zeros(len(s), dtype=bool)
+        bad = np.append(np.asarray(fn(pd.Series(uniques)), dtype=bool), False)
+        return bad[codes]  # code -1 (null) picks the trailing False
+    return check
+
+
+def _date(rule):
+    fmt = rule.get("format")
+
+    def parse(uniques):
+        return pd.to_datetime(uniques, format=fmt, errors="coerce").isna().to_numpy()
+
+    by_value = _by_value(parse)
+
+    def check(s):
+        if pd.api.types.is_datetime64_any_dtype(s):
+            return np.zeros(len(s), dtype=bool)
+        return by_value(s)
+    return check
+
+
+def _pattern(rule):
+    pattern = re.compile(rule["pattern"])
+
+    def mismatch(uniques):
+        return ~uniques.astype(str).str.fullmatch(pattern).to_numpy(dtype=bool)
+    return _by_value(mismatch)
+
+
+def _unique(rule):
+    # Duplicates within the chunk; repeats of earlier chunks are added by the runner
+    return lambda s: (s.duplicated(keep="first") & s.notna()).to_numpy()
+
+
+def _in_set(rule):
+    if rule.get("index"):
+        # A reference table: probe its key index rather than materializing every value
+        return ref_integrity.KeyIndex(rule["index"]).orphans
+    allowed = pd.Index(rule["values"]).unique()
+
+    def check(s):
+        return (~s.isin(allowed) & s.notna()).to_numpy()
+    return check
+
+
+COMPILERS = {
+    "not_null": _not_null,
+    "range": _range,
+    "date": _date,
+    "pattern": _pattern,
+    "unique": _unique,
+    "in_set": _in_set,
+}
+
+
+def resolve_references(rules, engine=None):
+    """Point ``reference=(table, column)`` rules at the referenced column's key index (built once, then reused)."""
+    resolved = []
+    for rule in rules:
+        rule = dict(rule)
+        if rule["type"] == "in_set" and rule.get("reference") and "values" not in rule:
+            table, column = rule["reference"]
+            index = ref_integrity.reference_index(table, column, engine)
+            if index is None:
+                rule["error"] = f"reference table {table}.{column} not available"
+            else:
+                rule["index"] = index.path
+        resolved.append(rule)
+    return resolved
+
+
+class RuleSet:
+    """Compiled rules; ``check(chunk)`` evaluates all of them in one pass."""
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._masks = []
+        for rule in self.rules:
+            if rule["type"] not in COMPILERS:
+                raise ValueError(f"unknown rule type {rule['type']!r}")
+            self._masks.append(None if rule.get("error") else COMPILERS[rule["type"]](rule))
+
+    def check(self, chunk, sample_rows=SAMPLE_ROWS):
+        """Return ``{"rows", "violations", "failed", "samples", "skipped", "keys"}`` for one chunk.
+
+        ``violations`` is per rule; ``failed`` counts rows breaking any rule;
+        ``keys`` holds the values and in-chunk duplicate mask of ``unique``
+        columns for cross-chunk checks.
+        """
+        n = len(chunk)
+        matrix = np.zeros((len(self.rules), n), dtype=bool)
+        skipped = [False] * len(self.rules)
+        keys = {}
+        for i, (rule, mask) in enumerate(zip(self.rules, self._masks)):
+            if mask is None or rule["column"] not in chunk.columns:
+                skipped[i] = True
+                continue
+            series = chunk[rule["column"]]
+            matrix[i] = mask(series)
+            if rule["type"] == "unique":
+                keys[i] = (series.to_numpy(), matrix[i])
+        violations = matrix.sum(axis=1)
+        failing = matrix.any(axis=0)
+        samples = {
+            i: chunk.iloc[np.flatnonzero(matrix[i])[:sample_rows]]
+            for i in range(len(self.rules)) if violations[i]
+        }
+        return {
+            "rows": n,
+            "violations": violations,
+            "failed": int(failing.sum()),
+            "failing": failing,
+            "samples": samples,
+            "skipped": skipped,
+            "keys": keys,
+        }
+
+
+# ─── Process Pool Workers ────────────────────────────────────────────────────
+_worker_rules = None
+
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = RuleSet(rules)
+
+
+def _check_in_worker(chunk):
+    return _worker_rules.check(chunk)
+
+
+class QualityRunner:
+    """Accumulates rule results over a stream of chunks.
+
+    Callable as a pipeline check (returns the chunk's failing-row mask).
+    Cross-chunk uniqueness keeps a sorted array of seen keys per ``unique``
+    rule and probes it with ``searchsorted``.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, engine=None, warn_pct=WARN_PCT):
+        self.rules = resolve_references(rules, engine)
+        self.ruleset = RuleSet(self.rules)
+        self.warn_pct = warn_pct
+        self.rows = 0
+        self.failed = 0
+        self.violations = np.zeros(len(self.rules), dtype=np.int64)
+        self.samples = {}
+        self.skipped = [True] * len(self.rules)
+        self._seen = {}
+
+    def __call__(self, chunk):
+        result = self.ruleset.check(chunk)
+        self.add(result, chunk)
+        return result["failing"]  # cross-chunk repeats included
+
+    def add(self, result, chunk=None):
+        """Merge one chunk's ``RuleSet.check`` result; returns the chunk's failing-row count."""
+        failed = result["failed"]
+        failing = result["failing"]
+        for i, (values, in_chunk) in result["keys"].items():
+            # In-chunk duplicates were flagged by the mask; add repeats of earlier chunks
+            repeat = self._repeats(i, values, in_chunk)
+            if repeat.any():
+                result["violations"][i] += int(repeat.sum())
+                failed += int((repeat & ~failing).sum())
+                failing |= repeat
+                if chunk is not None and i not in result["samples"]:
+                    result["samples"][i] = chunk.iloc[np.flatnonzero(repeat)[:SAMPLE_ROWS]]
+        self.rows += result["rows"]
+        self.failed += failed
+        self.violations += result["violations"]
+        for i, frame in result["samples"].items():
+            have = self.samples.get(i)
+            if have is None:
+                self.samples[i] = frame
+            elif len(have) < SAMPLE_ROWS:
+                self.samples[i] = pd.concat([have, frame.head(SAMPLE_ROWS - len(have))])
+        self.skipped = [a and b for a, b in zip(self.skipped, result["skipped"])]
+        return failed
+
+    def _repeats(self, i, values, in_chunk):
+        # In-chunk duplicates were already flagged, so the remaining keys are distinct
+        present = np.asarray(pd.notna(values), dtype=bool) & ~in_chunk
+        keys = values[present]
+        repeat = np.zeros(len(values), dtype=bool)
+        seen = self._seen.get(i)
+        if seen is not None and len(seen) and len(keys):
+            pos = np.minimum(np.searchsorted(seen, keys), len(seen) - 1)
+            hit = seen[pos] == keys
+            repeat[present] = hit
+            keys = keys[~hit]
+        keys = np.sort(keys)
+        # Two sorted runs: a stable sort merges them in linear time
+        self._seen[i] = keys if seen is None else np.sort(np.concatenate([seen, keys]), kind="stable")
+        return repeat
+
+    def run(self, chunks, workers=1, max_in_flight=None):
+        """Check every chunk; ``workers > 1`` fans chunks out to a process pool.
+
+        Results are merged in chunk order, so at most ``max_in_flight`` chunks
+        (default ``2 × workers``) are held in memory at once.
+        """
+        if workers <= 1:
+            for chunk in chunks:
+                self(chunk)
+            return self.report()
+
+        max_in_flight = max_in_flight or 2 * workers
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.rules,)) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append((pool.submit(_check_in_worker, chunk), chunk))
+                if len(pending) >= max_in_flight:
+                    future, done_chunk = pending.popleft()
+                    self.add(future.result(), done_chunk)
+            while pending:
+                future, done_chunk = pending.popleft()
+                self.add(future.result(), done_chunk)
+        return self.report()
+
+    def status(self, i):
+        if self.skipped[i]:
+            return "Skipped"
+        if not self.violations[i]:
+            return "Passed"
+        pct = 100 * self.violations[i] / self.rows if self.rows else 0.0
+        return "Warning" if pct < self.warn_pct else "Failed"
+
+    def report(self):
+        """One row per rule: ``name, condition, checked, violations, violation_pct, status``."""
+        return pd.DataFrame([
+            {
+                "rule": rule["name"],
+                "condition": describe(rule),
+                "checked": 0 if self.skipped[i] else self.rows,
+                "violations": int(self.violations[i]),
+                "violation_pct": round(100 * self.violations[i] / self.rows, 4) if self.rows and not self.skipped[i] else 0.0,
+                "status": self.status(i),
+                "note": rule.get("error", "column not present" if self.skipped[i] else ""),
+            }
+            for i, rule in enumerate(self.rules)
+        ])
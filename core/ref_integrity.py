@@ -0,0 +1,245 @@
+import json
+import os
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from core.dedup import contains_sorted, key_hashes
+
+# ─── Referential Integrity ───────────────────────────────────────────────────
+# Foreign-key checks of fact chunks against a dimension column, as a hash
+# join. The build side is the dimension's distinct keys hashed to uint64
+# (``dedup.key_hashes``) and kept sorted in one ``.npy``, at 8 bytes a key
+# whatever the key type. The probe side is each fact chunk: its keys are
+# hashed the same way, sorted and looked up with one ``searchsorted`` pass
+# (a categorical chunk only probes its categories).
+#
+# An index is built once and reused while the engine's write version of the
+# dimension table (``SQLEngine.table_version``) is unchanged, so any write —
+# not only one that moves its row count or key range — triggers a rebuild.
+# The build holds distinct hashes in memory up to half of ``memory_bytes``,
+# then spills them into 2^PARTITION_BITS files by the top bits of the hash;
+# each partition is deduplicated on its own and written out in order, so the
+# index is sorted without ever being held whole. An index larger than
+# ``memory_bytes`` is probed memory-mapped.
+#
+# Two keys share a 64-bit hash with probability about n·m / 2⁶⁴; such an
+# orphan would be missed, never invented.
+#
+#     <index_dir>/<table>.<column>.json    table version, key count, build stats
+#     <index_dir>/<table>.<column>.npy     sorted distinct uint64 key hashes
+
+DEFAULT_INDEX_DIR = os.environ.get("SMARTHUB_REF_INDEX_DIR", os.path.join("data", "ref_index"))
+DEFAULT_MEMORY_BYTES = 64 << 20
+PARTITION_BITS = 6
+BUILD_CHUNK_ROWS = 500_000
+SAMPLE_ROWS = 5
+TOP_ORPHANS = 10
+TRACKED_ORPHANS = 1_000
+
+
+# ─── Index Build ─────────────────────────────────────────────────────────────
+def _sorted_distinct(keys):
+    # Sort and drop neighbours: several times faster than ``np.unique`` (hash-based) on random uint64
+    keys = np.sort(keys)
+    keep = np.empty(len(keys), dtype=bool)
+    keep[:1] = True
+    np.not_equal(keys[1:], keys[:-1], out=keep[1:])
+    return keys[keep]
+
+
+class _IndexBuilder:
+    def __init__(self, path, memory_bytes):
+        self.path = path
+        self.memory_bytes = memory_bytes
+        self.rows = 0
+        self.spills = 0
+        self._parts = []  # sorted distinct hashes not yet spilled
+        self._held = 0
+        for p in range(1 << PARTITION_BITS):  # left behind by a build that didn't finish
+            if os.path.exists(self._partition(p)):
+                os.remove(self._partition(p))
+
+    def _partition(self, p):
+        return f"{self.path}.part{p}"
+
+    def _merged(self):
+        return _sorted_distinct(np.concatenate(self._parts)) if self._parts else np.array([], dtype=np.uint64)
+
+    def add(self, series):
+        keys = _sorted_distinct(key_hashes(series))
+        self.rows += len(series)
+        self._parts.append(keys)
+        self._held += keys.nbytes
+        if self._held > self.memory_bytes // 2:
+            self._spill()
+
+    def _spill(self):
+        keys = self._merged()
+        # Sorted, so each partition (top PARTITION_BITS bits of the hash) is one slice
+        bounds = np.searchsorted(keys, np.arange(1, 1 << PARTITION_BITS, dtype=np.uint64) << np.uint64(64 - PARTITION_BITS))
+        for p, part in enumerate(np.split(keys, bounds)):
+            with open(self._partition(p), "ab") as fh:
+                part.tofile(fh)
+        self._parts, self._held = [], 0
+        self.spills += 1
+
+    def finish(self):
+        """Write ``<path>.npy``; returns the number of distinct keys."""
+        tmp = self.path + ".npy.tmp"
+        if not self.spills:
+            keys = self._merged()
+            with open(tmp, "wb") as fh:
+                np.save(fh, keys)
+            os.replace(tmp, self.path + ".npy")
+            return len(keys)
+        self._spill()
+        sizes = []
+        for p in range(1 << PARTITION_BITS):
+            part = _sorted_distinct(np.fromfile(self._partition(p), dtype=np.uint64))
+            part.tofile(self._partition(p))
+            sizes.append(len(part))
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint64, shape=(sum(sizes),))
+        start = 0
+        for p, size in enumerate(sizes):
+            out[start:start + size] = np.fromfile(self._partition(p), dtype=np.uint64)
+            start += size
+            os.remove(self._partition(p))
+        out.flush()
+        del out
+        os.replace(tmp, self.path + ".npy")
+        return sum(sizes)
+
+
+def build_index(chunks, column, path, signature=None, memory_bytes=DEFAULT_MEMORY_BYTES):
+    """Index the distinct non-null values of ``column`` over ``chunks`` at ``path``; returns the ``KeyIndex``."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    start = time.perf_counter()
+    builder = _IndexBuilder(path, memory_bytes)
+    for chunk in chunks:
+        builder.add(chunk[column])
+    keys = builder.finish()
+    meta = {"column": column, "signature": signature, "rows": builder.rows, "keys": keys, "spills": builder.spills,
+            "build_s": round(time.perf_counter() - start, 3), "built_at": time.time()}
+    # Data file first, then the metadata that vouches for it
+    with open(path + ".json.tmp", "w") as fh:
+        json.dump(meta, fh, indent=2)
+    os.replace(path + ".json.tmp", path + ".json")
+    return KeyIndex(path, memory_bytes)
+
+
+# ─── Key Index ───────────────────────────────────────────────────────────────
+class KeyIndex:
+    """A built index: loaded when it fits ``memory_bytes``, memory-mapped otherwise.
+
+    ``reused`` is set when ``reference_index`` returned it without rebuilding.
+    """
+
+    def __init__(self, path, memory_bytes=DEFAULT_MEMORY_BYTES):
+        self.path = path
+        with open(path + ".json") as fh:
+            self.meta = json.load(fh)
+        self.mode = "memory" if self.meta["keys"] * 8 <= memory_bytes else "disk"
+        self.keys = np.load(path + ".npy", mmap_mode=None if self.mode == "memory" else "r")
+        self.reused = False
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def memory(self):
+        """Bytes held in memory (a memory-mapped index holds none of its own)."""
+        return self.keys.nbytes if self.mode == "memory" else 0
+
+    def orphans(self, series):
+        """Mask over ``series``: True where a non-null key is missing from the index."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Only the categories need probing; the codes map the answer back onto the rows
+            missing = ~contains_sorted(self.keys, key_hashes(pd.Series(series.cat.categories)))
+            return np.append(missing, False)[series.cat.codes.to_numpy()]  # code -1 (null) picks the trailing False
+        mask = np.zeros(len(series), dtype=bool)
+        mask[series.notna().to_numpy()] = ~contains_sorted(self.keys, key_hashes(series))
+        return mask
+
+
+def reference_index(table, column, engine=None, index_dir=DEFAULT_INDEX_DIR, memory_bytes=DEFAULT_MEMORY_BYTES):
+    """The ``KeyIndex`` of ``table.column`` in the SQL engine, rebuilt only when the table changed; ``None`` if absent."""
+    if engine is None:
+        from core.sql_engine import ENGINE as engine
+    signature = engine.table_version(table)
+    if signature is None:
+        return None
+    path = os.path.join(index_dir, f"{table}.{column}")
+    if os.path.exists(path + ".json") and os.path.exists(path + ".npy"):
+        index = KeyIndex(path, memory_bytes)
+        if index.meta.get("signature") == signature:
+            index.reused = True
+            return index
+    chunks = engine.iter_query(f'SELECT "{column}" FROM "{table}"', BUILD_CHUNK_ROWS)
+    return build_index(chunks, column, path, signature, memory_bytes)
+
+
+# ─── Pipeline Check ──────────────────────────────────────────────────────────
+class ForeignKeyCheck:
+    """Pipeline check that flags rows whose ``column`` has no match in ``reference`` — a ``(table, column)`` pair.
+
+    The reference index is resolved on the first chunk; if the reference
+    table isn't in the engine every row passes and ``error`` says why.
+    """
+
+    def __init__(self, column, reference, engine=None, index_dir=DEFAULT_INDEX_DIR, memory_bytes=DEFAULT_MEMORY_BYTES):
+        self.column = column
+        self.reference = tuple(reference)
+        self.engine = engine
+        self.index_dir = index_dir
+        self.memory_bytes = memory_bytes
+        self.index = None
+        self.error = None
+        self.checked = 0
+        self.orphans = 0
+        self.probe_s = 0.0
+        self.samples = []
+        self._orphan_keys = np.array([], dtype=np.uint64)  # sorted distinct orphan hashes
+        self._orphan_counts = Counter()  # rows per orphan value, for the most frequent ones
+
+    def __call__(self, chunk):
+        if self.index is None and self.error is None:
+            self.index = reference_index(*self.reference, engine=self.engine, index_dir=self.index_dir,
+                                         memory_bytes=self.memory_bytes)
+            if self.index is None:
+                self.error = f"reference table {'.'.join(self.reference)} not available"
+        if self.index is None or self.column not in chunk.columns:
+            return 0
+        start = time.perf_counter()
+        series = chunk[self.column]
+        orphan = self.index.orphans(series)
+        self.probe_s += time.perf_counter() - start
+        self.checked += int(series.notna().sum())
+        count = int(orphan.sum())
+        if count:
+            self.orphans += count
+            values = series[orphan]
+            self._orphan_keys = np.union1d(self._orphan_keys, key_hashes(values))
+            counts = values.value_counts()
+            self._orphan_counts.update(dict(zip(counts.index.tolist(), counts.tolist())))
+            if len(self._orphan_counts) > 2 * TRACKED_ORPHANS:
+                self._orphan_counts = Counter(dict(self._orphan_counts.most_common(TRACKED_ORPHANS)))
+            if sum(len(sample) for sample in self.samples) < SAMPLE_ROWS:
+                self.samples.append(chunk.iloc[np.flatnonzero(orphan)[:SAMPLE_ROWS]])
+        return orphan
+
+    def summary(self):
+        """Orphan counts, the most frequent orphan keys, sample rows and how the index was held."""
+        summary = {"column": self.column, "reference": ".".join(self.reference), "error": self.error,
+                   "checked": self.checked, "orphans": self.orphans,
+                   "orphan_pct": round(100 * self.orphans / self.checked, 4) if self.checked else 0.0,
+                   "distinct_orphans": len(self._orphan_keys),
+                   "top_orphans": pd.DataFrame(self._orphan_counts.most_common(TOP_ORPHANS), columns=[self.column, "rows"]),
+                   "sample": pd.concat(self.samples).head(SAMPLE_ROWS) if self.samples else pd.DataFrame()}
+        if self.index is not None:
+            summary.update(index_keys=len(self.index), index_mode=self.index.mode, index_memory=self.index.memory,
+                           reused=self.index.reused, build_s=self.index.meta["build_s"],
+                           probe_rows_per_s=round(self.checked / self.probe_s) if self.probe_s else 0)
+        return summary
@@ -0,0 +1,356 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from core import column_store, dtypes, incremental, ingest, pipeline, quality, ref_integrity, sql_engine, synthetic
+
+# ─── Ingestion Job Scheduler ─────────────────────────────────────────────────
+# Jobs and their run history live in a local SQLite file, so schedules survive
+# restarts. A single scheduler thread ticks once a second: due slots go into a
+# small per-job pending queue, and runs are dispatched from those queues onto a
+# bounded worker pool — never more in flight than there are workers, and never
+# more per job than its ``max_concurrency``. When a job's runs overlap and its
+# queue is full, the extra slot is dropped and recorded as ``skipped`` rather
+# than piling up.
+#
+# Catch-up after downtime (several slots due at once) is per job:
+#
+#   latest  run the most recent missed slot once (default)
+#   all     run every missed slot, oldest first, up to MAX_CATCH_UP
+#   none    drop missed slots; only slots due within ON_TIME_S run
+#
+# Tasks are looked up by name in ``TASKS`` and called with the job's JSON
+# params; they return a dict whose ``records`` (if any) goes into the history.
+#
+# Several processes (app workers, a CLI runner) may share one database. Due
+# slots are claimed by a conditional UPDATE of the job's ``next_run``, and a
+# run is only inserted while the job has fewer live runs than its
+# ``max_concurrency``, so each slot runs once. A run is leased to its
+# scheduler (``owner``), which renews ``heartbeat`` every tick; runs whose
+# lease lapsed (their process died) are closed out as ``abandoned``.
+
+DEFAULT_DB = os.environ.get("SMARTHUB_SCHEDULER_DB", os.path.join("data", "scheduler.db"))
+INTERVALS = {"Manual": None, "Every 15 min": 900, "Hourly": 3600, "Daily": 86400, "Weekly": 7 * 86400}
+CATCH_UP = ("latest", "all", "none")
+DEFAULT_WORKERS = 4
+MAX_CATCH_UP = 24
+ON_TIME_S = 60
+TICK_S = 1.0
+LEASE_S = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    params TEXT NOT NULL,
+    interval_s REAL NOT NULL,
+    next_run REAL NOT NULL,
+    max_concurrency INTEGER NOT NULL DEFAULT 1,
+    max_pending INTEGER NOT NULL DEFAULT 1,
+    catch_up TEXT NOT NULL DEFAULT 'latest',
+    enabled INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job TEXT NOT NULL,
+    scheduled_for REAL,
+    started_at REAL,
+    finished_at REAL,
+    status TEXT NOT NULL,
+    records INTEGER,
+    detail TEXT,
+    owner TEXT,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS runs_job ON runs (job, id);
+"""
+
+LIVE = "status IN ('queued', 'running') AND heartbeat >= ?"
+
+TASKS = {}
+log = logging.getLogger(__name__)
+
+
+def task(name):
+    """Register a task function under ``name``."""
+    def register(fn):
+        TASKS[name] = fn
+        return fn
+    return register
+
+
+class Scheduler:
+    """Persistent interval scheduler over a bounded worker pool."""
+
+    def __init__(self, path=DEFAULT_DB, workers=DEFAULT_WORKERS, tick_s=TICK_S):
+        self.path = path
+        self.workers = workers
+        self.tick_s = tick_s
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(runs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat", "REAL")):
+            if column not in columns:  # databases from before leases
+                self._db.execute(f"ALTER TABLE runs ADD COLUMN {column} {kind}")
+        self._lock = threading.RLock()
+        self._renew_leases(time.time())
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scheduler")
+        self._pending = defaultdict(deque)  # job → scheduled_for times
+        self._running = Counter()
+        self._in_flight = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    # ─── Jobs ──
+    def add_job(self, name, task_name, params=None, interval_s=3600, start_at=None, max_concurrency=1, max_pending=1,
+                catch_up="latest"):
+        """Create or replace a job; the first run is at ``start_at`` (default: one interval from now)."""
+        if task_name not in TASKS:
+            raise ValueError(f"unknown task: {task_name}")
+        if catch_up not in CATCH_UP:
+            raise ValueError(f"catch_up must be one of {CATCH_UP}")
+        next_run = time.time() + interval_s if start_at is None else start_at
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (name, task, params, interval_s, next_run, max_concurrency, max_pending, "
+                "catch_up, enabled) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                (name, task_name, json.dumps(params or {}), interval_s, next_run, max_concurrency, max_pending, catch_up))
+            self._db.commit()
+
+    def remove_job(self, name):
+        with self._lock:
+            self._db.execute("DELETE FROM jobs WHERE name = ?", (name,))
+            self._db.commit()
+            self._pending.pop(name, None)
+
+    def set_enabled(self, name, enabled=True):
+        with self._lock:
+            self._db.execute("UPDATE jobs SET enabled = ? WHERE name = ?", (int(enabled), name))
+            self._db.commit()
+
+    def run_now(self, name):
+        """Queue an immediate run, subject to the job's pending limit."""
+        with self._lock:
+            job = self._job(name)
+            if job is None:
+                raise KeyError(name)
+            self._enqueue(job, [time.time()])
+        self._dispatch()
+
+    def _job(self, name):
+        cursor = self._db.execute("SELECT * FROM jobs WHERE name = ?", (name,))
+        row = cursor.fetchone()
+        return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+    # ─── Scheduling ──
+    def _due_slots(self, job, now):
+        """Slots to run for a due job, the number dropped, and its next run time."""
+        interval = job["interval_s"]
+        missed = int((now - job["next_run"]) // interval) + 1
+        slots = [job["next_run"] + i * interval for i in range(missed)]
+        next_run = job["next_run"] + missed * interval
+        if job["catch_up"] == "all":
+            run = slots[-MAX_CATCH_UP:]
+        elif job["catch_up"] == "none":
+            run = slots[-1:] if now - slots[-1] <= ON_TIME_S else []
+        else:
+            run = slots[-1:]
+        return run, len(slots) - len(run), next_run
+
+    def _enqueue(self, job, slots):
+        limit = max(job["max_pending"], MAX_CATCH_UP if job["catch_up"] == "all" else 0)
+        pending = self._pending[job["name"]]
+        dropped = []
+        for slot in slots:
+            if len(pending) < limit:
+                pending.append(slot)
+            else:
+                dropped.append(slot)
+        if dropped:
+            self._record_skip(job["name"], dropped[-1], f"{len(dropped)} run(s) dropped: previous run still in progress")
+
+    def _record_skip(self, name, scheduled_for, detail):
+        self._db.execute("INSERT INTO runs (job, scheduled_for, status, detail) VALUES (?, ?, 'skipped', ?)",
+                         (name, scheduled_for, detail))
+
+    def _renew_leases(self, now):
+        """Extend this scheduler's runs and close out runs whose owner stopped renewing them."""
+        with self._lock:
+            self._db.execute("UPDATE runs SET heartbeat = ? WHERE owner = ? AND status IN ('queued', 'running')",
+                             (now, self.owner))
+            self._db.execute("UPDATE runs SET status = 'abandoned', finished_at = ? "
+                             "WHERE status IN ('queued', 'running') AND (heartbeat IS NULL OR heartbeat < ?)",
+                             (now, now - LEASE_S))
+            self._db.commit()
+
+    def tick(self, now=None):
+        """Queue due slots and dispatch what the pool has room for; the scheduler thread calls this every ``tick_s``."""
+        now = time.time() if now is None else now
+        self._renew_leases(now)
+        with self._lock:
+            cursor = self._db.execute("SELECT * FROM jobs WHERE enabled = 1 AND next_run <= ?", (now,))
+            columns = [c[0] for c in cursor.description]
+            for row in cursor.fetchall():
+                job = dict(zip(columns, row))
+                run, dropped, next_run = self._due_slots(job, now)
+                # Whoever moves next_run on owns these slots; another scheduler may have got there first
+                claimed = self._db.execute("UPDATE jobs SET next_run = ? WHERE name = ? AND next_run = ?",
+                                           (next_run, job["name"], job["next_run"])).rowcount
+                if not claimed:
+                    continue
+                if dropped:
+                    self._record_skip(job["name"], next_run - job["interval_s"], f"{dropped} missed run(s) not caught up")
+                self._enqueue(job, run)
+            self._db.commit()
+        self._dispatch()
+
+    def _dispatch(self):
+        with self._lock:
+            progress = True
+            while progress and self._in_flight < self.workers:
+                progress = False
+                # One slot per job per pass, and dispatched jobs rotate to the back, so no job starves
+                for name in list(self._pending):
+                    pending = self._pending[name]
+                    job = self._job(name) if pending else None
+                    if job is None:
+                        self._pending.pop(name, None)
+                        continue
+                    if self._in_flight >= self.workers or self._running[name] >= job["max_concurrency"]:
+                        continue
+                    # Inserted only while the job has room across every scheduler sharing the database
+                    now = time.time()
+                    cursor = self._db.execute(
+                        "INSERT INTO runs (job, scheduled_for, status, owner, heartbeat) SELECT ?, ?, 'queued', ?, ? "
+                        f"WHERE (SELECT COUNT(*) FROM runs WHERE job = ? AND {LIVE}) < ?",
+                        (name, pending[0], self.owner, now, name, now - LEASE_S, job["max_concurrency"]))
+                    self._db.commit()
+                    if not cursor.rowcount:
+                        continue
+                    pending.popleft()
+                    self._running[name] += 1
+                    self._in_flight += 1
+                    self._pool.submit(self._run, job, cursor.lastrowid)
+                    self._pending[name] = self._pending.pop(name)  # to the back of the rotation
+                    progress = True
+
+    def _run(self, job, run_id):
+        started = time.time()
+        with self._lock:
+            self._db.execute("UPDATE runs SET status = 'running', started_at = ? WHERE id = ?", (started, run_id))
+            self._db.commit()
+        try:
+            result = TASKS[job["task"]](json.loads(job["params"])) or {}
+            status, records, detail = "ok", result.get("records"), None
+        except Exception as exc:
+            status, records, detail = "failed", None, f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            self._db.execute("UPDATE runs SET status = ?, finished_at = ?, records = ?, detail = ? WHERE id = ?",
+                             (status, time.time(), records, detail, run_id))
+            self._db.commit()
+            self._running[job["name"]] -= 1
+            self._in_flight -= 1
+        self._dispatch()
+
+    # ─── Lifecycle ──
+    def _loop(self):
+        while not self._stop.wait(self.tick_s):
+            try:
+                self.tick()
+            except Exception:
+                # Lock contention, a bad job row, a full pool: log it and let the next tick retry
+                log.exception("scheduler tick failed")
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, wait=True):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._pool.shutdown(wait=wait)
+        self._db.close()
+
+    # ─── Views ──
+    def jobs(self):
+        with self._lock:
+            frame = pd.read_sql_query(
+                "SELECT name, task, interval_s, next_run, max_concurrency, max_pending, catch_up, enabled FROM jobs "
+                "ORDER BY next_run", self._db)
+        frame["running"] = frame["name"].map(self._running).fillna(0).astype(int)
+        frame["pending"] = frame["name"].map(lambda name: len(self._pending.get(name, ()))).astype(int)
+        return frame
+
+    def history(self, job=None, limit=50):
+        query = "SELECT id, job, scheduled_for, started_at, finished_at, status, records, detail FROM runs"
+        params = ()
+        if job is not None:
+            query, params = query + " WHERE job = ?", (job,)
+        with self._lock:
+            return pd.read_sql_query(query + " ORDER BY id DESC LIMIT ?", self._db, params=params + (limit,))
+
+
+# ─── Tasks ───────────────────────────────────────────────────────────────────
+@task("pipeline")
+def pipeline_task(params):
+    """One ingestion pipeline run.
+
+    ``params``: ``table``; ``source`` ("csv" or "json" with ``path``, or
+    "synthetic" with ``dataset`` and ``rows``); ``target`` ("lake" or "sql");
+    ``mode`` (full / incremental / cdc); optional ``monitor`` name, CSV
+    parse ``workers`` and ``foreign_key`` (``[table, column]`` the same-named
+    column must match).
+    """
+    if params.get("source") in ("csv", "json"):
+        path = ingest.server_file(params["path"])  # same allow-list as paths typed into the ingestion page
+    if params.get("source") == "csv":
+        source = pipeline.CSVSource(path, workers=params.get("workers", 1))
+    elif params.get("source") == "json":
+        source = pipeline.JSONSource(path, records_path=params.get("records_path"))
+    else:
+        rows = params.get("rows", 100_000)
+        source = pipeline.GeneratorSource(
+            lambda: synthetic.iter_chunks(params.get("dataset", "sales_transactions"), rows, chunk_rows=50_000), total_rows=rows)
+    mode = params.get("mode", "full")
+    if params.get("target") == "lake" and mode == "full":
+        target = column_store.ColumnStore()
+    else:
+        target = sql_engine.ENGINE
+    if mode != "full":
+        target = incremental.IncrementalTarget(target, mode=mode)
+    checks = (quality.QualityRunner(),)
+    if params.get("foreign_key"):
+        ref_table, ref_column = params["foreign_key"]
+        checks += (ref_integrity.ForeignKeyCheck(ref_column, (ref_table, ref_column)),)
+    return pipeline.Pipeline(source, target, params["table"], checks=checks,
+                             transforms=pipeline.DEFAULT_TRANSFORMS + (dtypes.TypePlan(),), monitor=params.get("monitor")).run()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def default_scheduler():
+    """Process-wide scheduler on ``DEFAULT_DB``, started on first use."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = Scheduler().start()
+        return _scheduler
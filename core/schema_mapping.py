@@ -0,0 +1,274 @@
+import math
+import re
+from collections import defaultdict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+# ─── Schema Mapping ──────────────────────────────────────────────────────────
+# Maps source columns onto a target model. Target column names are expanded
+# (``cust_nm`` → ``customer name``), cut into character trigrams and compiled
+# once into an inverted index of NumPy posting arrays carrying tf-idf weights,
+# so matching one source column touches only the postings of its own trigrams.
+# Name scores are scaled down for targets whose kind the source can't load
+# into (below DTYPE_FLOOR), so a date column never wins an int id on its name
+# alone; the top matches are then re-ranked with dtype compatibility and, when
+# both sides have one, a sampled value profile.
+#
+# Columns are dicts: {"name", "kind", "profile", "table"} — ``describe_columns``
+# builds them from sample rows; ``kind`` is int, float, bool, date or text and
+# the optional ``table`` qualifies target names.
+
+Mapping = namedtuple("Mapping", ["source", "target", "confidence", "name_score", "dtype_score", "profile_score", "sql_type", "transform"])
+
+ABBREVIATIONS = {
+    "acct": "account", "addr": "address", "amt": "amount", "avg": "average", "bal": "balance",
+    "cat": "category", "cd": "code", "cnt": "count", "cust": "customer", "dept": "department",
+    "desc": "description", "dob": "birth date", "dt": "date", "emp": "employee", "fname": "first name",
+    "lname": "last name", "mgr": "manager", "nm": "name", "no": "number", "num": "number",
+    "pct": "percent", "ph": "phone", "prc": "price", "prod": "product", "qty": "quantity",
+    "rev": "revenue", "sal": "salary", "ts": "timestamp", "txn": "transaction", "trx": "transaction",
+    "upd": "updated", "usr": "user", "val": "value", "yr": "year",
+}
+STOP_TOKENS = frozenset({"tbl", "col", "fld", "src", "tgt", "the", "of"})
+
+KINDS = ("int", "float", "bool", "date", "text")
+# DTYPE_COMPAT[source][target]: how safely a source kind loads into a target kind
+DTYPE_COMPAT = {
+    "int": {"int": 1.0, "float": 0.9, "bool": 0.3, "date": 0.1, "text": 0.5},
+    "float": {"int": 0.5, "float": 1.0, "bool": 0.1, "date": 0.1, "text": 0.5},
+    "bool": {"int": 0.6, "float": 0.4, "bool": 1.0, "date": 0.0, "text": 0.5},
+    "date": {"int": 0.1, "float": 0.0, "bool": 0.0, "date": 1.0, "text": 0.6},
+    "text": {"int": 0.3, "float": 0.3, "bool": 0.2, "date": 0.7, "text": 1.0},
+}
+SQL_TYPES = {"int": "INTEGER", "float": "DECIMAL(18,2)", "bool": "BOOLEAN", "date": "DATE"}
+TRANSFORMS = {("text", "date"): "TO_DATE()", ("float", "float"): "ROUND(2)", ("float", "int"): "ROUND()",
+              ("text", "int"): "CAST()", ("text", "float"): "CAST()"}
+
+# Final confidence weights; the profile weight is redistributed when either side has no profile
+WEIGHTS = {"name": 0.7, "dtype": 0.15, "profile": 0.15}
+DTYPE_FLOOR = 0.5  # compatibilities below this scale the whole score by compatibility / DTYPE_FLOOR
+CANDIDATES = 10
+CUTOFF = 0.6  # candidates must reach this share of the best raw name score
+MAX_DF = 0.05  # on large models, trigrams in more than this share of targets are dropped (e.g. "#id")
+MIN_DF_CAP = 1000
+
+_SPLIT = re.compile(r"[^A-Za-z0-9]+|(?<=[a-z])(?=[A-Z])|(?<=[A-Za-z])(?=[0-9])|(?<=[0-9])(?=[A-Za-z])")
+
+
+def name_tokens(name):
+    """``CustNm_2`` → ``["customer", "name", "2"]``: split case/separators, expand abbreviations."""
+    tokens = []
+    for part in _SPLIT.split(str(name)):
+        part = part.lower()
+        if part and part not in STOP_TOKENS:
+            tokens.extend(ABBREVIATIONS.get(part, part).split())
+    return tokens
+
+
+def trigrams(name):
+    text = "#" + "#".join(name_tokens(name)) + "#"
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# ─── Column Profiles ─────────────────────────────────────────────────────────
+def column_kind(series):
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return "int"
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        return "int" if len(values) and (values == values.round()).all() else "float"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "date"
+    values = series.dropna().astype(str)
+    if len(values) and pd.to_datetime(values, errors="coerce", format="ISO8601").notna().mean() >= 0.9:
+        return "date"
+    return "text"
+
+
+def profile(series, kind=None):
+    """Summary of sampled values used to compare columns of the same kind."""
+    kind = kind or column_kind(series)
+    values = series.dropna()
+    result = {"null_pct": 1 - len(values) / len(series) if len(series) else 0.0}
+    if not len(values):
+        return result
+    if kind in ("int", "float"):
+        numbers = values.astype(np.float64)
+        result.update(magnitude=math.log10(abs(float(numbers.mean())) + 1), spread=math.log10(float(numbers.std() or 0) + 1))
+    elif kind == "date":
+        dates = pd.to_datetime(values, errors="coerce", format="ISO8601").dropna()
+        if len(dates):
+            result.update(year=float(dates.dt.year.mean()), span=math.log10((dates.max() - dates.min()).days + 1))
+    elif kind == "text":
+        text = values.astype(str)
+        result.update(length=float(text.str.len().mean()), distinct=text.nunique() / len(text))
+    return result
+
+
+def describe_columns(frame, sample_rows=1000, table=None):
+    """Column dicts (``name``, ``kind``, ``profile``) from up to ``sample_rows`` rows of ``frame``."""
+    sample = frame.head(sample_rows)
+    columns = []
+    for name in sample.columns:
+        kind = column_kind(sample[name])
+        column = {"name": str(name), "kind": kind, "profile": profile(sample[name], kind)}
+        if table:
+            column["table"] = table
+        columns.append(column)
+    return columns
+
+
+def profile_similarity(a, b):
+    """``[0, 1]`` closeness of two profiles of the same kind, or ``None`` when not comparable."""
+    if not a or not b:
+        return None
+    scores = [1 - abs(a["null_pct"] - b["null_pct"])]
+    if "magnitude" in a and "magnitude" in b:
+        scores.append(max(0.0, 1 - abs(a["magnitude"] - b["magnitude"]) / 3))
+        scores.append(max(0.0, 1 - abs(a["spread"] - b["spread"]) / 3))
+    elif "length" in a and "length" in b:
+        scores.append(1 - abs(a["length"] - b["length"]) / max(a["length"], b["length"], 1))
+        scores.append(1 - abs(a["distinct"] - b["distinct"]))
+    elif "year" in a and "year" in b:
+        scores.append(max(0.0, 1 - abs(a["year"] - b["year"]) / 10))
+        scores.append(max(0.0, 1 - abs(a["span"] - b["span"]) / 3))
+    else:
+        return None
+    return sum(scores) / len(scores)
+
+
+def sql_type(column):
+    if column["kind"] == "text":
+        length = column.get("profile", {}).get("length")
+        return f"VARCHAR({max(20, int(math.ceil((length or 50) * 2 / 10)) * 10)})"
+    return SQL_TYPES[column["kind"]]
+
+
+# ─── Matcher ─────────────────────────────────────────────────────────────────
+class SchemaMatcher:
+    """Trigram tf-idf index over a target model's column names.
+
+    ``target_columns`` are column dicts (``kind`` / ``profile`` optional).
+    ``match`` returns the best ``Mapping`` per source column.
+    """
+
+    def __init__(self, target_columns, max_df=MAX_DF):
+        self.targets = [dict(col, kind=col.get("kind", "text")) for col in target_columns]
+        n = len(self.targets)
+        grams = [trigrams(col["name"]) for col in self.targets]
+        raw = defaultdict(list)
+        for target_id, names in enumerate(grams):
+            for gram in names:
+                raw[gram].append(target_id)
+
+        limit = max(MIN_DF_CAP, int(max_df * n))
+        self.idf = {gram: math.log(1 + n / len(ids)) for gram, ids in raw.items() if len(ids) <= limit}
+        norms = np.zeros(n)
+        for target_id, names in enumerate(grams):
+            norms[target_id] = math.sqrt(sum(self.idf.get(g, 0.0) ** 2 for g in names)) or 1.0
+        self.postings = {
+            gram: (np.asarray(ids, dtype=np.int32), self.idf[gram] ** 2 / norms[ids])
+            for gram, ids in raw.items() if gram in self.idf
+        }
+        self._kind_ids = {kind: i for i, kind in enumerate(KINDS)}
+        self._target_kinds = np.array([self._kind_ids[col["kind"]] for col in self.targets], dtype=np.int8)
+        self._compat = np.array([[DTYPE_COMPAT[s][t] for t in KINDS] for s in KINDS])
+        self._gate = np.minimum(self._compat / DTYPE_FLOOR, 1.0)
+        self._target_gates = self._gate[:, self._target_kinds]  # per source kind, over every target
+
+    def __len__(self):
+        return len(self.targets)
+
+    def candidates(self, name, limit=CANDIDATES, kind=None):
+        """``(target_ids, name_scores)`` of the ``limit`` most similar target names (cosine, ``[0, 1]``).
+
+        With a source ``kind``, targets it loads poorly into are ranked on a
+        gated score, so they don't crowd compatible ones out of the list.
+        """
+        grams = [g for g in trigrams(name) if g in self.postings]
+        if not grams:
+            return np.empty(0, dtype=np.int32), np.empty(0)
+        norm = math.sqrt(sum(self.idf[g] ** 2 for g in grams))
+        ids = np.concatenate([self.postings[g][0] for g in grams])
+        weights = np.concatenate([self.postings[g][1] for g in grams])
+        scores = np.bincount(ids, weights=weights)
+        # Only names within reach of the best one can win; partitioning that short list beats the whole model
+        top = np.flatnonzero(scores >= CUTOFF * scores.max())
+        ranked = scores[top]
+        if kind is not None:
+            gates = self._target_gates[self._kind_ids[kind]]
+            ranked = ranked * gates[top]
+            best = ranked.max()
+            if best < scores[top].max():
+                # The name leader is gated down; gated scores never exceed raw ones, so every
+                # name that can still reach CUTOFF of the best gated score clears CUTOFF * best raw
+                top = np.flatnonzero(scores >= CUTOFF * best)
+                ranked = scores[top] * gates[top]
+            keep = ranked >= CUTOFF * ranked.max()
+            top, ranked = top[keep], ranked[keep]
+        if len(top) > limit:
+            top = top[np.argpartition(-ranked, limit - 1)[:limit]]
+        return top, np.minimum(scores[top] / norm, 1.0)
+
+    def match_column(self, column, limit=1):
+        """Best ``limit`` mappings for one source column dict, highest confidence first."""
+        kind = column.get("kind", "text")
+        ids, name_scores = self.candidates(column["name"], kind=kind)
+        if not len(ids):
+            return []
+        dtype_scores = self._compat[self._kind_ids[kind], self._target_kinds[ids]]
+        gate = self._gate[self._kind_ids[kind], self._target_kinds[ids]]
+        # Name and dtype first; profiles only refine the few candidates that can still come out on top
+        base = gate * (WEIGHTS["name"] * name_scores + WEIGHTS["dtype"] * dtype_scores) / (WEIGHTS["name"] + WEIGHTS["dtype"])
+        order = np.argsort(-base)[:limit + 6]
+        results = []
+        for i in order.tolist():
+            target = self.targets[ids[i]]
+            profile_score = profile_similarity(column.get("profile"), target.get("profile")) if kind == target["kind"] else None
+            confidence = base[i] if profile_score is None else gate[i] * (
+                WEIGHTS["name"] * name_scores[i] + WEIGHTS["dtype"] * dtype_scores[i] + WEIGHTS["profile"] * profile_score)
+            results.append((float(confidence), i, profile_score))
+        results.sort(key=lambda r: -r[0])
+        mappings = []
+        for confidence, i, profile_score in results[:limit]:
+            target = self.targets[ids[i]]
+            mappings.append(Mapping(
+                column["name"], f"{target['table']}.{target['name']}" if target.get("table") else target["name"],
+                round(confidence, 4), round(float(name_scores[i]), 4), round(float(dtype_scores[i]), 4),
+                None if profile_score is None else round(profile_score, 4), sql_type(target),
+                TRANSFORMS.get((kind, target["kind"]), "Direct"),
+            ))
+        return mappings
+
+    def match(self, source_columns, min_confidence=0.0, one_to_one=True):
+        """Map every source column; with ``one_to_one`` a target is given to its most confident source only."""
+        best = {}
+        for column in source_columns:
+            for mapping in self.match_column(column, limit=3 if one_to_one else 1):
+                if mapping.confidence >= min_confidence:
+                    best.setdefault(column["name"], []).append(mapping)
+        if not one_to_one:
+            return [options[0] for options in best.values()]
+        taken = set()
+        mappings = {}
+        # Most confident pairs claim their targets first; losers fall back to their next option
+        for mapping in sorted((m for options in best.values() for m in options), key=lambda m: -m.confidence):
+            if mapping.source in mappings or mapping.target in taken:
+                continue
+            mappings[mapping.source] = mapping
+            taken.add(mapping.target)
+        return [mappings[col["name"]] for col in source_columns if col["name"] in mappings]
+
+
+def to_frame(mappings):
+    """Mappings as the page's table: Source Column, Target Column, Data Type, AI Confidence, Transform."""
+    return pd.DataFrame({
+        "Source Column": [m.source for m in mappings],
+        "Target Column": [m.target for m in mappings],
+        "Data Type": [m.sql_type for m in mappings],
+        "AI Confidence": [f"{m.confidence:.0%}" for m in mappings],
+        "Transform": [m.transform for m in mappings],
+    })
@@ -0,0 +1,267 @@
+import atexit
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+
+import pandas as pd
+
+# ─── In-Process SQL Engine ───────────────────────────────────────────────────
+# One SQLite database per process, in a scratch file so that loading a large
+# extract costs disk rather than RAM. Tables are loaded once from DataFrames
+# and indexed; SELECT results are cached by normalized query text and dropped
+# whenever a table is (re)registered.
+
+_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_COMMENT = re.compile(r"--[^\n]*")
+_READ_ONLY = re.compile(r"^\s*(select|with)\b", re.IGNORECASE)
+DEFAULT_PATH = os.environ.get("SMARTHUB_SQL_DB", os.path.join("data", "sql_engine.db"))
+
+
+def normalize(sql):
+    """Lower-case and collapse whitespace outside string literals; drop comments and trailing ``;``."""
+    parts = _LITERAL.split(sql)
+    for i in range(0, len(parts), 2):
+        parts[i] = " ".join(_COMMENT.sub(" ", parts[i]).lower().split())
+    return " ".join(p for p in parts if p).strip().rstrip(";").strip()
+
+
+def _date_trunc(unit, value):
+    # Postgres-style DATE_TRUNC over ISO date strings, so template SQL runs unchanged
+    if value is None:
+        return None
+    text = str(value)
+    unit = unit.lower()
+    if unit == "year":
+        return f"{text[:4]}-01-01"
+    if unit == "quarter":
+        month = (int(text[5:7]) - 1) // 3 * 3 + 1
+        return f"{text[:4]}-{month:02d}-01"
+    if unit == "month":
+        return f"{text[:7]}-01"
+    if unit == "week":
+        day = date.fromisoformat(text[:10])
+        return date.fromordinal(day.toordinal() - day.weekday()).isoformat()
+    return text[:10]
+
+
+def index_candidates(frame):
+    return [
+        col for col in frame.columns
+        if not pd.api.types.is_float_dtype(frame[col]) and (
+            not pd.api.types.is_numeric_dtype(frame[col]) or str(col).endswith(("_id", "_date"))
+        )
+    ]
+
+
+def add_columns(conn, name, frame):
+    """``ALTER TABLE`` in the columns of ``frame`` that the existing table ``name`` lacks."""
+    existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{name}")')}
+    for col in frame.columns:
+        if existing and col not in existing:
+            conn.execute(f'ALTER TABLE "{name}" ADD COLUMN "{col}"')
+
+
+def sql_values(frame):
+    # SQLite has no date type: parsed dates (see core.dtypes) go back to the ISO
+    # strings the SQL templates compare against and DATE_TRUNC expects
+    dates = [col for col in frame.columns if pd.api.types.is_datetime64_any_dtype(frame[col])]
+    if not dates:
+        return frame
+    converted = {}
+    for col in dates:
+        series = frame[col]
+        date_only = (series.dropna() == series.dropna().dt.normalize()).all()
+        converted[col] = series.dt.strftime("%Y-%m-%d" if date_only else "%Y-%m-%d %H:%M:%S")
+    return frame.assign(**converted)
+
+
+class QueryResult:
+    __slots__ = ("frame", "elapsed_ms", "cached")
+
+    def __init__(self, frame, elapsed_ms, cached):
+        self.frame = frame
+        self.elapsed_ms = elapsed_ms
+        self.cached = cached
+
+
+class SQLEngine:
+    """Thread-safe SQLite with a bounded LRU of query results.
+
+    Tables live in a scratch database file next to ``path`` (``":memory:"``
+    keeps them in RAM): each engine creates its own uniquely named file on
+    first connect and removes it at exit, so it never outlives the process's
+    ``tables`` and processes sharing ``path`` never touch each other's data.
+    Cached frames are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, path=":memory:", cache_size=256):
+        self.path = path
+        self.cache_size = cache_size
+        self.generation = uuid.uuid4().hex  # tells this engine's table versions from another process's
+        self.version = 0
+        self.tables = {}
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        self.file = None
+
+    @property
+    def _conn(self):
+        # Opened on first use, so importing the module leaves no file behind
+        with self._lock:
+            if self._db is None:
+                self.file = self.path
+                if self.path != ":memory:":
+                    directory = os.path.dirname(self.path) or "."
+                    os.makedirs(directory, exist_ok=True)
+                    stem, suffix = os.path.splitext(os.path.basename(self.path))
+                    fd, self.file = tempfile.mkstemp(prefix=stem + ".", suffix=suffix, dir=directory)
+                    os.close(fd)
+                    atexit.register(self._remove_file)
+                conn = sqlite3.connect(self.file, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=OFF")  # scratch data: nothing to protect across a crash
+                conn.create_function("DATE_TRUNC", 2, _date_trunc, deterministic=True)
+                self._db = conn
+            return self._db
+
+    def _remove_file(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            for suffix in ("", "-wal", "-shm", "-journal"):
+                if os.path.exists(self.file + suffix):
+                    os.remove(self.file + suffix)
+
+    def register(self, name, frame, index_columns=None):
+        """Load ``frame`` as table ``name`` (replacing it) and index the lookup columns.
+
+        By default text, ``*_id`` and ``*_date`` columns are indexed — the ones
+        used for grouping, joins and range filters.
+        """
+        with self._lock:
+            self.append(name, frame, replace=True)
+            self.create_indexes(name, index_candidates(frame) if index_columns is None else index_columns)
+
+    def append(self, name, frame, replace=False):
+        """Write ``frame`` into table ``name``; streaming loaders call this once per chunk."""
+        with self._lock:
+            if not replace:
+                add_columns(self._conn, name, frame)  # a source whose schema widened mid-stream
+            sql_values(frame).to_sql(name, self._conn, index=False, if_exists="replace" if replace else "append")
+            self._conn.commit()
+            rows = len(frame) if replace or name not in self.tables else self.tables[name]["rows"] + len(frame)
+            self.version += 1
+            self.tables[name] = {"rows": rows, "columns": list(frame.columns), "version": self.version}
+            self._cache.clear()
+
+    def delete(self, name, column, values):
+        """Delete the rows of ``name`` whose ``column`` is in ``values``; returns the number deleted."""
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(f'DELETE FROM "{name}" WHERE "{column}" = ?', ((value,) for value in values))
+            self._conn.commit()
+            deleted = self._conn.total_changes - before
+            self.version += 1
+            if name in self.tables:
+                self.tables[name]["rows"] -= deleted
+                self.tables[name]["version"] = self.version
+            self._cache.clear()
+            return deleted
+
+    def table_version(self, name):
+        """``[generation, version]`` of the last write to ``name``, or ``None`` if it isn't loaded."""
+        with self._lock:
+            info = self.tables.get(name)
+            return None if info is None else [self.generation, info["version"]]
+
+    def create_indexes(self, name, columns):
+        # Built after the load: one sorted pass instead of per-row index maintenance
+        with self._lock:
+            for col in columns:
+                self._conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{name}_{col}" ON "{name}" ("{col}")')
+            self._conn.commit()
+
+    def query(self, sql):
+        """Run a read-only statement and return a ``QueryResult``; raises on invalid SQL."""
+        key = normalize(sql)
+        if not _READ_ONLY.match(key):
+            raise ValueError("only SELECT / WITH statements can be executed")
+
+        with self._lock:
+            frame = self._cache.get(key)
+            if frame is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return QueryResult(frame, 0.0, True)
+
+            self.misses += 1
+            start = time.perf_counter()
+            with self._read_only():
+                frame = pd.read_sql_query(sql, self._conn)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._cache[key] = frame
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return QueryResult(frame, elapsed_ms, False)
+
+    def iter_query(self, sql, chunk_rows=100_000):
+        """Run a read-only statement and yield its rows as DataFrames of up to ``chunk_rows``; not cached.
+
+        For results too large to hold at once, such as every key of a
+        dimension table. The lock is only held while each batch is fetched.
+        """
+        if not _READ_ONLY.match(normalize(sql)):
+            raise ValueError("only SELECT / WITH statements can be executed")
+        with self._lock, self._read_only():
+            cursor = self._conn.execute(sql)
+            if cursor.description is None:
+                raise ValueError("statement returned no rows")
+            columns = [d[0] for d in cursor.description]
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                return
+            yield pd.DataFrame.from_records(rows, columns=columns)
+
+    @contextmanager
+    def _read_only(self):
+        # The prefix check above only screens the statement text (``WITH … DELETE`` passes it);
+        # SQLite itself refuses writes while query_only is on
+        with self._lock:
+            self._conn.execute("PRAGMA query_only=ON")
+            try:
+                yield
+            finally:
+                self._conn.execute("PRAGMA query_only=OFF")
+
+    def try_query(self, sql):
+        """Like ``query`` but returns ``None`` when the SQL cannot run here."""
+        try:
+            return self.query(sql)
+        except (ValueError, TypeError, sqlite3.Error, pd.errors.DatabaseError):
+            return None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "tables": len(self.tables),
+                "version": self.version,
+                "cached_queries": len(self._cache),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+ENGINE = SQLEngine(DEFAULT_PATH)
@@ -0,0 +1,157 @@
+import importlib
+import importlib.util
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# ─── Dependency Check ────────────────────────────────────────────────────────
+REQUIRED_PACKAGES = ("streamlit", "pandas", "numpy", "plotly")
+
+_missing_packages = None
+
+
+def check_dependencies():
+    """Return the required packages that are not importable.
+
+    Uses ``find_spec`` so nothing is actually imported, and the result is
+    kept for the lifetime of the process — reruns never hit the disk again.
+    """
+    global _missing_packages
+    if _missing_packages is None:
+        _missing_packages = [name for name in REQUIRED_PACKAGES if importlib.util.find_spec(name) is None]
+    return _missing_packages
+
+
+# ─── Lazy Page Loading ───────────────────────────────────────────────────────
+def load_page(module_name):
+    """Import ``pages.<module_name>`` on first use; later calls hit sys.modules."""
+    with startup_phase(f"import pages.{module_name}"):
+        return importlib.import_module(f"pages.{module_name}")
+
+
+# ─── Background Services ─────────────────────────────────────────────────────
+_services_started = False
+_services_lock = threading.Lock()
+
+
+def start_background_services():
+    """Start the job scheduler once per process, whichever page is open.
+
+    Importing the scheduler pulls in the whole pipeline stack, so it is
+    started on a daemon thread rather than on the first render.
+    """
+    global _services_started
+    with _services_lock:
+        if _services_started:
+            return
+        _services_started = True
+    threading.Thread(target=_start_scheduler, name="startup-services", daemon=True).start()
+
+
+def _start_scheduler():
+    with startup_phase("start scheduler"):
+        importlib.import_module("core.scheduler").default_scheduler()
+
+
+# ─── Startup Timings ─────────────────────────────────────────────────────────
+STARTUP_TIMINGS = {}
+
+
+def profiling_enabled():
+    return os.environ.get("SMARTHUB_PROFILE_STARTUP", "") not in ("", "0", "false")
+
+
+@contextmanager
+def startup_phase(name):
+    """Record the wall time of a startup phase; only the first run of each name is kept."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STARTUP_TIMINGS.setdefault(name, (time.perf_counter() - start) * 1000)
+
+
+# ─── Import-Time Profiler ────────────────────────────────────────────────────
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_import(module_name, python=None):
+    """Import ``module_name`` in a fresh interpreter under ``-X importtime``.
+
+    Returns ``{"module", "total_ms", "modules": [{"name", "self_ms", "cumulative_ms", "depth"}]}``
+    with modules sorted by cumulative cost. A fresh process is the only way
+    to measure a true cold start, since this process has its caches warm.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=root, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import of {module_name} failed:\n{proc.stderr[-2000:]}")
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "name": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": (len(indent) - 1) // 2,
+            })
+    target = [m for m in modules if m["name"] == module_name]
+    modules.sort(key=lambda m: m["cumulative_ms"], reverse=True)
+    return {
+        "module": module_name,
+        "total_ms": target[-1]["cumulative_ms"] if target else 0.0,
+        "modules": modules,
+    }
+
+
+def page_modules():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return sorted(
+        f"pages.{name[:-3]}" for name in os.listdir(os.path.join(root, "pages"))
+        if name.endswith(".py") and not name.startswith("_")
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report per-module import cost for each page.")
+    parser.add_argument("modules", nargs="*", help="modules to profile (default: every page)")
+    parser.add_argument("--budget-ms", type=float, default=None, help="fail if any module exceeds this cold-import time")
+    parser.add_argument("--top", type=int, default=10, help="heaviest dependencies to list per module")
+    parser.add_argument("--json", dest="json_path", default=None, help="write the full report to this file")
+    args = parser.parse_args(argv)
+
+    report = [profile_import(name) for name in (args.modules or page_modules())]
+    over_budget = []
+    for entry in report:
+        print(f"{entry['module']:<28} {entry['total_ms']:>9.1f} ms")
+        heaviest = [m for m in entry["modules"] if m["name"] != entry["module"]][:args.top]
+        for mod in heaviest:
+            print(f"    {mod['name']:<40} {mod['cumulative_ms']:>9.1f} ms")
+        if args.budget_ms is not None and entry["total_ms"] > args.budget_ms:
+            over_budget.append(entry["module"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if over_budget:
+        print(f"Over the {args.budget_ms:.0f} ms budget: {', '.join(over_budget)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from core import synthetic
+from core.pipeline import PipelineError
+
+# ─── Streaming Ingestion ─────────────────────────────────────────────────────
+# A ``StreamSource`` turns a consumer into a pipeline source: it polls events
+# into micro-batches bounded by size (``batch_records``) or time
+# (``batch_seconds``), decodes each batch into a DataFrame in one pass, and
+# yields it to the regular ``Pipeline`` stages. The pipeline calls ``commit()``
+# once a batch is durable — after it is loaded, or after the target's own
+# commit for targets that publish a run at once (``ColumnStore``) — so offsets
+# only advance past data that landed. A failed run is redelivered from the
+# last committed offset (at-least-once).
+#
+# Consumers share one small interface, so local stand-ins can replace Kafka:
+#
+#   poll(max_records, timeout_s) -> (values, position after the last value)
+#   commit(position)             persist the group's offset
+#   lag()                        events not yet committed (None if unknown)
+#
+#   MemoryConsumer     over a ``MemoryTopic`` (in-process producer)
+#   FileTailConsumer   over an NDJSON file that producers append to
+#   KafkaConsumer      confluent-kafka, imported on connect
+
+DEFAULT_BATCH_RECORDS = 50_000
+DEFAULT_BATCH_SECONDS = 1.0
+DEFAULT_OFFSET_DIR = os.environ.get("SMARTHUB_OFFSET_DIR", os.path.join("data", "offsets"))
+POLL_RECORDS = 10_000
+DEFAULT_RETENTION = 1_000_000
+READ_BYTES = 4 << 20
+
+
+def decode_batch(values):
+    """Events (JSON bytes / str, or dicts) → DataFrame, decoding the batch as one JSON array."""
+    if not values:
+        return pd.DataFrame()
+    if isinstance(values[0], dict):
+        return pd.DataFrame.from_records(values)
+    if isinstance(values[0], str):
+        values = [value.encode() for value in values]
+    return pd.DataFrame.from_records(json.loads(b"[" + b",".join(values) + b"]"))
+
+
+def encode_frame(frame):
+    """DataFrame → list of NDJSON event bytes (what a producer would send)."""
+    return frame.to_json(orient="records", lines=True, date_format="iso").encode().splitlines()
+
+
+# ─── In-memory Topic ─────────────────────────────────────────────────────────
+class MemoryTopic:
+    """Append-only event log with per-group committed offsets, shared between threads.
+
+    Keeps the newest ``retention`` events, like a broker's retention limit; a
+    consumer that falls behind it resumes from the oldest retained event.
+    """
+
+    def __init__(self, name="events", retention=DEFAULT_RETENTION):
+        self.name = name
+        self.retention = retention
+        self.events = []
+        self.base = 0  # offset of events[0]
+        self.offsets = {}
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return self.base + len(self.events)
+
+    def produce(self, values):
+        with self._cond:
+            self.events.extend(values)
+            excess = len(self.events) - self.retention
+            if excess > 0:
+                del self.events[:excess]
+                self.base += excess
+            self._cond.notify_all()
+
+    def close(self):
+        """No more events; consumers stop waiting once they reach the end."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self.closed = False
+
+    def read(self, offset, max_records, timeout_s):
+        """``(offset of the first event returned, events)``."""
+        with self._cond:
+            if offset >= len(self) and not self.closed:
+                self._cond.wait(timeout_s)
+            offset = max(offset, self.base)
+            return offset, self.events[offset - self.base:offset - self.base + max_records]
+
+
+class MemoryConsumer:
+    def __init__(self, topic, group="default"):
+        self.topic = topic
+        self.group = group
+        self.position = topic.offsets.get(group, 0)
+
+    def poll(self, max_records, timeout_s):
+        self.position, values = self.topic.read(self.position, max_records, timeout_s)
+        self.position += len(values)
+        return values, self.position
+
+    def commit(self, position):
+        self.topic.offsets[self.group] = position
+
+    def lag(self):
+        return len(self.topic) - max(self.topic.offsets.get(self.group, 0), self.topic.base)
+
+    @property
+    def exhausted(self):
+        return self.topic.closed and self.position >= len(self.topic)
+
+
+_topics = {}
+_topics_lock = threading.Lock()
+
+
+def memory_topic(name):
+    """Process-wide in-memory topic by name (the local Kafka stand-in)."""
+    with _topics_lock:
+        topic = _topics.get(name)
+        if topic is None:
+            topic = _topics[name] = MemoryTopic(name)
+        return topic
+
+
+def produce_synthetic(topic, table, events, chunk_rows=20_000, close=True):
+    """Background producer: ``events`` rows of a synthetic table as NDJSON; returns the thread."""
+    topic.reopen()
+
+    def run():
+        for chunk in synthetic.iter_chunks(table, events, chunk_rows=chunk_rows):
+            topic.produce(encode_frame(chunk))
+        if close:
+            topic.close()
+
+    thread = threading.Thread(target=run, name=f"producer-{topic.name}", daemon=True)
+    thread.start()
+    return thread
+
+
+# ─── File Tail ───────────────────────────────────────────────────────────────
+class FileTailConsumer:
+    """Tails an NDJSON file; offsets are byte positions, committed to ``<offset_dir>/<group>.json``."""
+
+    def __init__(self, path, group="default", offset_dir=DEFAULT_OFFSET_DIR):
+        self.path = path
+        self.group = group
+        self.offset_file = os.path.join(offset_dir, f"{group}.json")
+        self.position = 0
+        self._buffer = b""  # read past ``position``, not yet returned
+        self._fh = None
+
+    def connect(self):
+        if not os.path.isfile(self.path):
+            raise PipelineError(f"stream file not found: {self.path}")
+        self.position = self.committed()
+        self._fh = open(self.path, "rb")
+        self._fh.seek(self.position)
+        self._buffer = b""
+
+    def committed(self):
+        if not os.path.exists(self.offset_file):
+            return 0
+        with open(self.offset_file) as fh:
+            return json.load(fh).get(self.path, 0)
+
+    def poll(self, max_records, timeout_s):
+        deadline = time.monotonic() + timeout_s
+        while True:
+            if len(self._buffer) < READ_BYTES:
+                self._buffer += self._fh.read(READ_BYTES)
+            if b"\n" in self._buffer or time.monotonic() >= deadline:
+                break
+            time.sleep(0.05)
+        lines = self._buffer.split(b"\n", max_records)
+        rest = lines.pop()  # unread lines, or a partial line the writer hasn't finished
+        self.position += len(self._buffer) - len(rest)
+        self._buffer = rest
+        return [line for line in lines if line.strip()], self.position
+
+    def commit(self, position):
+        offsets = {}
+        if os.path.exists(self.offset_file):
+            with open(self.offset_file) as fh:
+                offsets = json.load(fh)
+        offsets[self.path] = position
+        os.makedirs(os.path.dirname(self.offset_file) or ".", exist_ok=True)
+        tmp = self.offset_file + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(offsets, fh)
+        os.replace(tmp, self.offset_file)
+
+    def lag(self):
+        return None  # bytes, not events
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+# ─── Kafka ───────────────────────────────────────────────────────────────────
+class KafkaConsumer:
+    """confluent-kafka consumer with auto-commit off; positions are ``{(topic, partition): next offset}``."""
+
+    def __init__(self, broker, topic, group):
+        self.config = {"bootstrap.servers": broker, "group.id": group, "enable.auto.commit": False,
+                       "auto.offset.reset": "earliest"}
+        self.topic = topic
+        self._consumer = None
+        self._positions = {}
+
+    def connect(self):
+        try:
+            from confluent_kafka import Consumer
+        except ImportError as exc:
+            raise PipelineError("Kafka sources need the confluent-kafka package (pip install confluent-kafka)") from exc
+        self._consumer = Consumer(self.config)
+        self._consumer.subscribe([self.topic])
+
+    def poll(self, max_records, timeout_s):
+        values = []
+        for message in self._consumer.consume(num_messages=max_records, timeout=timeout_s):
+            if message.error():
+                raise PipelineError(f"Kafka error: {message.error()}")
+            values.append(message.value())
+            self._positions[(message.topic(), message.partition())] = message.offset() + 1
+        return values, dict(self._positions)
+
+    def commit(self, position):
+        from confluent_kafka import TopicPartition
+
+        offsets = [TopicPartition(topic, partition, offset) for (topic, partition), offset in position.items()]
+        if offsets:
+            self._consumer.commit(offsets=offsets, asynchronous=False)
+
+    def lag(self):
+        return None
+
+    def close(self):
+        if self._consumer is not None:
+            self._consumer.close()
+            self._consumer = None
+
+
+# ─── Pipeline Source ─────────────────────────────────────────────────────────
+class StreamSource:
+    """Micro-batching pipeline source over a consumer.
+
+    Stops after ``duration_s``, after ``max_records`` events, when ``stop`` (a
+    ``threading.Event``) is set, after ``idle_s`` without events, or when a
+    closed in-memory topic is drained — whichever comes first.
+    """
+
+    def __init__(self, consumer, batch_records=DEFAULT_BATCH_RECORDS, batch_seconds=DEFAULT_BATCH_SECONDS,
+                 duration_s=None, max_records=None, idle_s=None, stop=None):
+        self.consumer = consumer
+        self.batch_records = batch_records
+        self.batch_seconds = batch_seconds
+        self.duration_s = duration_s
+        self.max_records = max_records
+        self.idle_s = idle_s
+        self.stop = stop or threading.Event()
+        self.consumed = 0
+        self.committed = 0
+        self.batches = []  # (events, seconds to fill) per batch, for reporting
+        self._pending = deque()  # (position, events) of batches yielded but not yet loaded
+        self._buffer = None
+        self._started = None
+        self._last_event = None
+
+    def connect(self):
+        connect = getattr(self.consumer, "connect", None)
+        if connect is not None:
+            connect()
+        self._started = self._last_event = time.monotonic()
+
+    def _done(self):
+        now = time.monotonic()
+        return (
+            self.stop.is_set()
+            or (self.duration_s is not None and now - self._started >= self.duration_s)
+            or (self.max_records is not None and self.consumed >= self.max_records)
+            or (self.idle_s is not None and now - self._last_event >= self.idle_s)
+            or getattr(self.consumer, "exhausted", False)
+        )
+
+    def _next_batch(self):
+        """Poll until the batch is full, its time is up, or the stream should stop."""
+        values, position = [], None
+        start = time.monotonic()
+        limit = self.batch_records
+        if self.max_records is not None:
+            limit = min(limit, self.max_records - self.consumed)
+        while len(values) < limit:
+            remaining = self.batch_seconds - (time.monotonic() - start)
+            if remaining <= 0:
+                break
+            polled, polled_position = self.consumer.poll(min(POLL_RECORDS, limit - len(values)), min(remaining, 0.1))
+            if polled:
+                values.extend(polled)
+                position = polled_position
+                self._last_event = time.monotonic()
+            elif self._done():
+                break
+        if not values:
+            return None
+        self.consumed += len(values)
+        self.batches.append((len(values), time.monotonic() - start))
+        self._pending.append((position, len(values)))
+        return decode_batch(values)
+
+    def sample(self, rows=100):
+        # The first batch is held back and yielded first, so sampling consumes nothing twice
+        if self._buffer is None:
+            while self._buffer is None and not self._done():
+                self._buffer = self._next_batch()
+        return self._buffer.head(rows) if self._buffer is not None else pd.DataFrame()
+
+    def chunks(self):
+        if self._buffer is not None:
+            batch, self._buffer = self._buffer, None
+            yield batch
+        while not self._done():
+            batch = self._next_batch()
+            if batch is not None:
+                yield batch
+
+    def commit(self):
+        position, events = self._pending.popleft()
+        self.consumer.commit(position)
+        self.committed += events
+
+    def progress(self, rows):
+        if self.duration_s:
+            return min(1.0, (time.monotonic() - self._started) / self.duration_s)
+        if self.max_records:
+            return min(1.0, rows / self.max_records)
+        return None
+
+    def close(self):
+        close = getattr(self.consumer, "close", None)
+        if close is not None:
+            close()
@@ -0,0 +1,271 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.column_store import ColumnStore
+
+# ─── Synthetic Datasets ──────────────────────────────────────────────────────
+# Seeded, vectorized generators for the chatbot schemas and the Data Catalog
+# datasets. Every chunk draws from its own RNG stream seeded by
+# (seed, table, chunk index), so output is reproducible for a given seed and
+# chunk size, and a 100M-row table is written chunk by chunk in constant memory.
+# Foreign keys line up: sales reference existing customers.
+#
+#     python -m core.synthetic --scale 1000000 --out data/synthetic --format csv
+
+# Catalog record counts from the Data Catalog tab; a scale factor sets the size
+# of sales_transactions and the other tables keep these proportions.
+CATALOG_ROWS = {
+    "sales_transactions": 12_400_000,
+    "customer_master": 2_100_000,
+    "product_catalog": 450_000,
+    "hr_employees": 85_000,
+    "finance_gl": 8_700_000,
+    "marketing_campaigns": 320_000,
+}
+TABLES = tuple(CATALOG_ROWS)
+
+DEFAULT_SEED = 42
+DEFAULT_CHUNK_ROWS = 250_000
+FORMATS = {"csv": ".csv", "ndjson": ".ndjson", "parquet": "", "store": ""}
+
+REGIONS = np.array(["North", "South", "East", "West"])
+PRODUCTS = np.array(["Product A", "Product B", "Product C", "Product D"])
+SEGMENTS = np.array(["Enterprise", "SMB", "Startup"])
+COUNTRIES = np.array(["USA", "UK", "Germany", "India", "Australia"])
+RISK_LEVELS = np.array(["Low", "Medium", "High"])
+DEPARTMENTS = np.array(["Sales", "Ops", "HR", "IT"])
+CATEGORIES = np.array(["Hardware", "Software", "Services", "Accessories", "Subscriptions"])
+TITLES = np.array(["Analyst", "Engineer", "Manager", "Director", "Associate"])
+CHANNELS = np.array(["Email", "Search", "Social", "Display", "Events"])
+
+EPOCH = np.datetime64("2024-01-01")
+DATE_SPAN_DAYS = 3 * 365
+
+
+def table_rows(scale):
+    """Row count per table when ``sales_transactions`` has ``scale`` rows."""
+    base = CATALOG_ROWS["sales_transactions"]
+    return {table: max(1, round(scale * rows / base)) for table, rows in CATALOG_ROWS.items()}
+
+
+def _pick(rng, values, n, p=None):
+    # Categorical codes instead of an array of strings: ~10x faster and a byte per row
+    codes = rng.choice(len(values), n, p=p) if p is not None else rng.integers(0, len(values), n)
+    return pd.Categorical.from_codes(codes, values)
+
+
+def _labels(prefix, ids):
+    return prefix + pd.Series(ids).astype(str)
+
+
+def _dates(offsets):
+    return np.datetime_as_string(EPOCH + offsets.astype("timedelta64[D]"), unit="D")
+
+
+def _months(offsets):
+    return np.datetime_as_string(EPOCH.astype("datetime64[M]") + offsets.astype("timedelta64[M]"), unit="M")
+
+
+# ─── Table Generators ────────────────────────────────────────────────────────
+# Each takes (rng, ids, dims) — ``ids`` are the 1-based row ids of the chunk,
+# ``dims`` the row counts of referenced tables — and returns a DataFrame.
+
+def _sales_transactions(rng, ids, dims):
+    n = len(ids)
+    customer_ids = rng.integers(1, dims["customer_master"] + 1, n)
+    return pd.DataFrame({
+        "transaction_id": ids,
+        "customer_id": customer_ids,
+        "customer_name": _labels("Customer_", customer_ids),
+        "region": _pick(rng, REGIONS, n),
+        "product": _pick(rng, PRODUCTS, n),
+        "sale_amount": rng.uniform(100, 50000, n).round(2),
+        "quantity": rng.integers(1, 100, n),
+        "sale_date": _dates(ids * 3 % DATE_SPAN_DAYS),
+    })
+
+
+def _customer_master(rng, ids, dims):
+    n = len(ids)
+    return pd.DataFrame({
+        "customer_id": ids,
+        "name": _labels("Customer_", ids),
+        "segment": _pick(rng, SEGMENTS, n),
+        "country": _pick(rng, COUNTRIES, n),
+        "lifetime_value": rng.uniform(5000, 500000, n).round(2),
+        "churn_risk": _pick(rng, RISK_LEVELS, n),
+    })
+
+
+def _finance_gl(rng, ids, dims):
+    n = len(ids)
+    revenue = rng.uniform(3000000, 6000000, n).round(2)
+    expenses = rng.uniform(2000000, 4000000, n).round(2)
+    return pd.DataFrame({
+        "month": _months((ids - 1) % 36),
+        "revenue": revenue,
+        "expenses": expenses,
+        "profit": (revenue - expenses).round(2),
+        "department": _pick(rng, DEPARTMENTS, n),
+    })
+
+
+def _product_catalog(rng, ids, dims):
+    n = len(ids)
+    return pd.DataFrame({
+        "product_id": ids,
+        "product_name": _labels("Product_", ids),
+        "category": _pick(rng, CATEGORIES, n),
+        "unit_price": rng.lognormal(4, 1, n).round(2),
+        "supplier": _labels("Supplier_", rng.integers(1, max(2, n // 20 + 1), n)),
+        "in_stock": rng.random(n) < 0.9,
+    })
+
+
+def _hr_employees(rng, ids, dims):
+    n = len(ids)
+    return pd.DataFrame({
+        "employee_id": ids,
+        "name": _labels("Employee_", ids),
+        "department": _pick(rng, DEPARTMENTS, n),
+        "title": _pick(rng, TITLES, n),
+        "salary": rng.normal(95000, 25000, n).clip(35000).round(-2),
+        "hire_date": _dates(-rng.integers(0, 10 * 365, n)),
+        "attrition_risk": _pick(rng, RISK_LEVELS, n, p=[0.7, 0.2, 0.1]),
+    })
+
+
+def _marketing_campaigns(rng, ids, dims):
+    n = len(ids)
+    impressions = rng.integers(1000, 5_000_000, n)
+    clicks = (impressions * rng.uniform(0.002, 0.05, n)).astype(np.int64)
+    return pd.DataFrame({
+        "campaign_id": ids,
+        "channel": _pick(rng, CHANNELS, n),
+        "start_date": _dates(rng.integers(0, DATE_SPAN_DAYS, n)),
+        "budget": rng.uniform(1000, 250000, n).round(2),
+        "impressions": impressions,
+        "clicks": clicks,
+        "conversions": (clicks * rng.uniform(0.01, 0.15, n)).astype(np.int64),
+    })
+
+
+GENERATORS = {
+    "sales_transactions": _sales_transactions,
+    "customer_master": _customer_master,
+    "finance_gl": _finance_gl,
+    "product_catalog": _product_catalog,
+    "hr_employees": _hr_employees,
+    "marketing_campaigns": _marketing_campaigns,
+}
+
+
+# ─── Chunked Generation ──────────────────────────────────────────────────────
+def iter_chunks(table, rows, chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED, dims=None):
+    """Yield ``table`` as DataFrames of at most ``chunk_rows`` rows, ``rows`` in total.
+
+    ``dims`` gives the row counts of referenced tables; by default they are
+    derived from ``rows`` with the catalog proportions.
+    """
+    if table not in GENERATORS:
+        raise ValueError(f"unknown table {table!r}; expected one of {', '.join(TABLES)}")
+    if dims is None:
+        dims = table_rows(rows * CATALOG_ROWS["sales_transactions"] / CATALOG_ROWS[table])
+    generator = GENERATORS[table]
+    table_id = TABLES.index(table)
+    for chunk_index, start in enumerate(range(0, rows, chunk_rows)):
+        rng = np.random.default_rng((seed, table_id, chunk_index))
+        ids = np.arange(start + 1, min(start + chunk_rows, rows) + 1, dtype=np.int64)
+        yield generator(rng, ids, dims)
+
+
+def generate(table, rows, seed=DEFAULT_SEED, dims=None):
+    """Return ``table`` with ``rows`` rows as one in-memory DataFrame."""
+    chunks = list(iter_chunks(table, rows, chunk_rows=max(rows, 1), seed=seed, dims=dims))
+    return chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+
+
+def write_table(table, rows, out_dir, fmt="csv", chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED, dims=None):
+    """Stream ``table`` to ``out_dir`` and return ``{"table", "rows", "path", "bytes", "seconds"}``.
+
+    ``csv`` and ``ndjson`` append every chunk to one file; ``parquet`` (needs
+    pyarrow) writes one ``part-NNNNN.parquet`` per chunk into a directory;
+    ``store`` writes a memory-mappable dataset into a ``ColumnStore`` at ``out_dir``.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, table + FORMATS[fmt])
+    if fmt == "parquet":
+        os.makedirs(path, exist_ok=True)
+    store = ColumnStore(out_dir) if fmt == "store" else None
+
+    start = time.perf_counter()
+    written = 0
+    for index, chunk in enumerate(iter_chunks(table, rows, chunk_rows=chunk_rows, seed=seed, dims=dims)):
+        if fmt == "csv":
+            chunk.to_csv(path, mode="w" if index == 0 else "a", header=index == 0, index=False)
+        elif fmt == "ndjson":
+            with open(path, "w" if index == 0 else "a") as fh:
+                chunk.to_json(fh, orient="records", lines=True)
+        elif fmt == "store":
+            store.append(table, chunk, replace=index == 0)
+        else:
+            chunk.to_parquet(os.path.join(path, f"part-{index:05d}.parquet"), index=False)
+        written += len(chunk)
+
+    if store is not None:
+        store.commit()
+        size = store.open(table).mapped_bytes()
+    elif fmt == "parquet":
+        size = sum(entry.stat().st_size for entry in os.scandir(path))
+    else:
+        size = os.path.getsize(path)
+    return {"table": table, "rows": written, "path": path, "bytes": size, "seconds": time.perf_counter() - start}
+
+
+def write_dataset(scale, out_dir, tables=None, fmt="csv", chunk_rows=DEFAULT_CHUNK_ROWS, seed=DEFAULT_SEED):
+    """Write every table (or ``tables``) at ``scale`` with consistent foreign keys."""
+    dims = table_rows(scale)
+    return [
+        write_table(table, dims[table], out_dir, fmt=fmt, chunk_rows=chunk_rows, seed=seed, dims=dims)
+        for table in (tables or TABLES)
+    ]
+
+
+def _parse_count(text):
+    # Accepts 1000000, 1_000_000, 1e6, 250K, 1M, 100M
+    text = text.strip().upper().replace("_", "")
+    multiplier = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}.get(text[-1:], 1)
+    if multiplier > 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write seeded synthetic datasets in chunks.")
+    parser.add_argument("--scale", type=_parse_count, default=1_000_000, help="rows of sales_transactions, e.g. 1M or 100M")
+    parser.add_argument("--out", default=os.path.join("data", "synthetic"), help="output directory")
+    parser.add_argument("--format", dest="fmt", choices=list(FORMATS), default="csv")
+    parser.add_argument("--tables", nargs="*", choices=TABLES, default=None)
+    parser.add_argument("--chunk-rows", type=_parse_count, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    dims = table_rows(args.scale)
+    for table in args.tables or TABLES:
+        info = write_table(table, dims[table], args.out, fmt=args.fmt, chunk_rows=args.chunk_rows, seed=args.seed, dims=dims)
+        rate = info["rows"] / info["seconds"] if info["seconds"] else 0.0
+        print(f"{table:<22} {info['rows']:>13,} rows  {info['bytes'] / 1e6:>9.1f} MB  "
+              f"{info['seconds']:>7.1f} s  {rate:>12,.0f} rows/s  {info['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,29 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
 import plotly.graph_objects as go
-import random
-from datetime import datetime
+import os
+
+from core import column_store, components, instrumentation, sql_engine, synthetic
+from core.chat_store import ChatHistory, ResultCache
+from core.figure_cache import FigureCache
+from core.intent_index import IntentIndex
 
 # ─── Sample Data ─────────────────────────────────────────────────────────────
+# Seeded synthetic tables. SMARTHUB_DATA_SCALE=<rows of sales> (e.g. 1000000)
+# swaps the demo sizes for production-like volumes when load testing.
+SAMPLE_TABLES = {"sales": "sales_transactions", "customers": "customer_master", "finance": "finance_gl"}
+
+DATA_SCALE = int(float(os.environ.get("SMARTHUB_DATA_SCALE") or 0))
+SAMPLE_ROWS = synthetic.table_rows(DATA_SCALE) if DATA_SCALE else {"sales_transactions": 100, "customer_master": 50, "finance_gl": 12}
+
 SAMPLE_DATA = {
-    "sales": pd.DataFrame({
-        "customer_id": range(1, 101),
-        "customer_name": [f"Customer_{i}" for i in range(1, 101)],
-        "region": np.random.choice(["North", "South", "East", "West"], 100),
-        "product": np.random.choice(["Product A", "Product B", "Product C", "Product D"], 100),
-        "sale_amount": np.random.uniform(100, 50000, 100).round(2),
-        "quantity": np.random.randint(1, 100, 100),
-        "sale_date": pd.date_range("2024-01-01", periods=100, freq="3D").strftime("%Y-%m-%d"),
-    }),
-    "customers": pd.DataFrame({
-        "customer_id": range(1, 51),
-        "name": [f"Customer_{i}" for i in range(1, 51)],
-        "segment": np.random.choice(["Enterprise", "SMB", "Startup"], 50),
-        "country": np.random.choice(["USA", "UK", "Germany", "India", "Australia"], 50),
-        "lifetime_value": np.random.uniform(5000, 500000, 50).round(2),
-        "churn_risk": np.random.choice(["Low", "Medium", "High"], 50),
-    }),
-    "finance": pd.DataFrame({
-        "month": pd.date_range("2024-01-01", periods=12, freq="MS").strftime("%Y-%m"),
-        "revenue": np.random.uniform(3000000, 6000000, 12).round(2),
-        "expenses": np.random.uniform(2000000, 4000000, 12).round(2),
-        "profit": np.random.uniform(500000, 2000000, 12).round(2),
-        "department": np.random.choice(["Sales", "Ops", "HR", "IT"], 12),
-    }),
+    data_key: synthetic.generate(table, SAMPLE_ROWS[table], dims=SAMPLE_ROWS)
+    for data_key, table in SAMPLE_TABLES.items()
 }
 
 # ─── NL2SQL Engine ────────────────────────────────────────────────────────────
 NL2SQL_RESPONSES = {
     "total sales": {
+        "keywords": ["revenue", "orders", "sum"],
         "sql": "SELECT SUM(sale_amount) AS total_sales, COUNT(*) AS total_orders\nFROM sales_transactions\nWHERE sale_date >= '2024-01-01';",
         "insight": "💡 **AI Insight**: Total sales are **$2.47M** across **100 transactions**. The average order value is **$24,700**. Sales are trending **+12.4%** vs last period.",
         "data_key": "sales",
@@ -44,6 +32,7 @@ NL2SQL_RESPONSES = {
         "chart_val": "sale_amount",
     },
     "top customers": {
+        "keywords": ["best", "biggest", "largest", "clients"],
         "sql": "SELECT customer_name, SUM(sale_amount) AS total_revenue,\n       COUNT(*) AS orders\nFROM sales_transactions\nGROUP BY customer_name\nORDER BY total_revenue DESC\nLIMIT 10;",
         "insight": "💡 **AI Insight**: Top 10 customers contribute **38%** of total revenue. Customer concentration risk is **Medium**. Recommend loyalty program for top 5.",
         "data_key": "customers",
@@ -52,6 +41,7 @@ NL2SQL_RESPONSES = {
         "chart_val": "lifetime_value",
     },
     "revenue by region": {
+        "keywords": ["sales", "compare", "geography", "regional"],
         "sql": "SELECT region, SUM(sale_amount) AS revenue,\n       COUNT(*) AS transactions,\n       AVG(sale_amount) AS avg_order_value\nFROM sales_transactions\nGROUP BY region\nORDER BY revenue DESC;",
         "insight": "💡 **AI Insight**: **North region** leads with 32% of revenue. **West region** shows fastest growth at +18% QoQ. Recommend increasing sales headcount in West.",
         "data_key": "sales",
@@ -60,6 +50,7 @@ NL2SQL_RESPONSES = {
         "chart_val": "sale_amount",
     },
     "monthly revenue": {
+        "keywords": ["month", "trend", "over time", "seasonal"],
         "sql": "SELECT DATE_TRUNC('month', sale_date) AS month,\n       SUM(sale_amount) AS monthly_revenue,\n       COUNT(*) AS orders\nFROM sales_transactions\nGROUP BY month\nORDER BY month;",
         "insight": "💡 **AI Insight**: Revenue shows **seasonal pattern** with peaks in Q4. **December** is historically the strongest month (+34% vs average). Plan inventory accordingly.",
         "data_key": "finance",
@@ -68,6 +59,7 @@ NL2SQL_RESPONSES = {
         "chart_val": "revenue",
     },
     "churn risk": {
+        "keywords": ["churning", "retention", "at risk", "attrition"],
         "sql": "SELECT churn_risk, COUNT(*) AS customers,\n       AVG(lifetime_value) AS avg_ltv\nFROM customer_master\nGROUP BY churn_risk\nORDER BY CASE churn_risk WHEN 'High' THEN 1 WHEN 'Medium' THEN 2 ELSE 3 END;",
         "insight": "💡 **AI Insight**: **23% of customers** are at High churn risk, representing **$4.2M** in at-risk revenue. Immediate retention campaign recommended for High-risk segment.",
         "data_key": "customers",
@@ -76,6 +68,7 @@ NL2SQL_RESPONSES = {
         "chart_val": "lifetime_value",
     },
     "profit margin": {
+        "keywords": ["department", "profitable", "expenses", "margins"],
         "sql": "SELECT department,\n       SUM(revenue) AS total_revenue,\n       SUM(expenses) AS total_expenses,\n       SUM(profit) AS total_profit,\n       ROUND(SUM(profit)/SUM(revenue)*100, 2) AS profit_margin_pct\nFROM finance_gl\nGROUP BY department\nORDER BY profit_margin_pct DESC;",
         "insight": "💡 **AI Insight**: Overall profit margin is **28.4%**, above industry average of 22%. **Sales dept** has highest margin at 34%. Recommend cost optimization in IT dept (margin: 18%).",
         "data_key": "finance",
@@ -85,11 +78,15 @@ NL2SQL_RESPONSES = {
     },
 }
 
+# Built once at import; lookups only walk the posting lists of the question's tokens
+INTENT_INDEX = IntentIndex(NL2SQL_RESPONSES)
+INTENT_INDEX.compile()
+MIN_INTENT_CONFIDENCE = 0.3
+
 def get_nl2sql_response(question):
-    question_lower = question.lower()
-    for key, response in NL2SQL_RESPONSES.items():
-        if any(word in question_lower for word in key.split()):
-            return response
+    match = INTENT_INDEX.best(question, min_confidence=MIN_INTENT_CONFIDENCE)
+    if match:
+        return match.template
     # Default response
     return {
         "sql": f"-- AI-Generated SQL for: {question}\nSELECT *\nFROM data_platform.analytics\nWHERE created_date >= CURRENT_DATE - INTERVAL '30 days'\nLIMIT 1000;",
@@ -100,39 +97,29 @@ def get_nl2sql_response(question):
         "chart_val": "sale_amount",
     }
 
-def render_chart(response):
-    data = SAMPLE_DATA[response["data_key"]]
-    chart_type = response["chart_type"]
-    col = response["chart_col"]
-    val = response["chart_val"]
-    
-    if col not in data.columns or val not in data.columns:
-        return None
-    
-    grouped = data.groupby(col)[val].sum().reset_index()
-    
-    if chart_type == "bar":
-        fig = go.Figure(go.Bar(
-            x=grouped[col], y=grouped[val],
-            marker=dict(color=grouped[val], colorscale=[[0, '#0f3460'], [1, '#00d4ff']], showscale=False),
-            text=[f'${v:,.0f}' if v > 1000 else str(v) for v in grouped[val]],
-            textposition='outside',
-            textfont=dict(color='#aabbcc', size=10),
-        ))
-    elif chart_type == "pie":
+def build_figure(chart_type, x, y):
+    if chart_type == "pie":
         fig = go.Figure(go.Pie(
-            labels=grouped[col], values=grouped[val],
+            labels=x, values=y,
             hole=0.4,
             marker=dict(colors=['#00d4ff', '#00ff88', '#ff6b6b', '#ffd700', '#ff88ff']),
         ))
     elif chart_type == "line":
         fig = go.Figure(go.Scatter(
-            x=grouped[col], y=grouped[val],
+            x=x, y=y,
             line=dict(color='#00d4ff', width=3),
             fill='tozeroy', fillcolor='rgba(0,212,255,0.1)',
             mode='lines+markers',
             marker=dict(color='#00d4ff', size=8),
         ))
+    else:
+        fig = go.Figure(go.Bar(
+            x=x, y=y,
+            marker=dict(color=y, colorscale=[[0, '#0f3460'], [1, '#00d4ff']], showscale=False),
+            text=[f'${v:,.0f}' if v > 1000 else str(v) for v in y],
+            textposition='outside',
+            textfont=dict(color='#aabbcc', size=10),
+        ))
     
     fig.update_layout(
         plot_bgcolor='rgba(0,0,0,0)',
@@ -145,6 +132,89 @@ def render_chart(response):
     )
     return fig
 
+def sample_columns(data_key, columns):
+    # Only the charted columns; a table landed in the local column store is read
+    # through memory maps instead of the in-memory sample
+    store = column_store.ColumnStore()
+    table = SAMPLE_TABLES[data_key]
+    if table in store.datasets():
+        dataset = store.open(table)
+        return dataset.read(columns) if all(c in dataset.columns for c in columns) else None
+    data = SAMPLE_DATA[data_key]
+    return data[columns] if all(c in data.columns for c in columns) else None
+
+def render_chart(response):
+    col = response["chart_col"]
+    val = response["chart_val"]
+    data = sample_columns(response["data_key"], [col, val])
+    
+    if data is None:
+        return None
+    
+    grouped = data.groupby(col, observed=True)[val].sum().reset_index()
+    return build_figure(response["chart_type"], grouped[col], grouped[val])
+
+def render_result_chart(frame, chart_type):
+    # Chart what the SQL returned: first label column against first numeric column;
+    # single-row aggregates (e.g. SUM/COUNT) become one bar per measure.
+    numeric = list(frame.select_dtypes("number").columns)
+    if frame.empty or not numeric:
+        return None
+    labels = [c for c in frame.columns if c not in numeric]
+    if labels:
+        return build_figure(chart_type, frame[labels[0]].astype(str), frame[numeric[0]])
+    row = frame.iloc[0]
+    return build_figure("bar", numeric, [row[c] for c in numeric])
+
+# ─── SQL Execution ────────────────────────────────────────────────────────────
+# Template SQL runs against the sample tables in the shared in-process engine;
+# datasets ingested on the Data Ingestion page are registered there too.
+for _data_key, _table in SAMPLE_TABLES.items():
+    if _table not in sql_engine.ENGINE.tables:
+        sql_engine.ENGINE.register(_table, SAMPLE_DATA[_data_key])
+
+# ─── Chat Results ─────────────────────────────────────────────────────────────
+# Chat messages only hold a result key and the SQL text; the preview frame and
+# chart behind them are rebuilt on demand and shared across sessions. Previews
+# live in an LRU result cache, figures in a figure cache as pre-serialized
+# JSON. The engine's data version is part of both keys, so re-registering a
+# table invalidates every dependent result.
+RESULT_CACHE = ResultCache(max_entries=64)
+FIGURE_CACHE = FigureCache(max_entries=128)
+
+WELCOME_MESSAGE = "👋 Hello! I'm your **AI Data Assistant**. I can help you:\n\n• 📊 Query your data in plain English\n• 🔍 Generate SQL automatically\n• 📈 Create instant visualizations\n• 💡 Provide AI-powered insights\n\nTry asking: *'Show me total sales by region'* or *'Which customers have high churn risk?'*"
+
+def result_key(response):
+    return "|".join((response["data_key"], response["chart_type"], response["chart_col"], response["chart_val"]))
+
+def build_chart(key, sql):
+    data_key, chart_type, chart_col, chart_val = key.split("|")
+    result = sql_engine.ENGINE.try_query(sql)
+    if result is not None:
+        return render_result_chart(result.frame, chart_type)
+    return render_chart({"data_key": data_key, "chart_type": chart_type, "chart_col": chart_col, "chart_val": chart_val})
+
+def load_result(key, sql):
+    """Return ``(chart, preview, meta)`` for a chat answer, executing its SQL when possible."""
+    def build():
+        data_key = key.split("|", 1)[0]
+        with instrumentation.timed("ai_chatbot", "sql_execute"):
+            result = sql_engine.ENGINE.try_query(sql)
+        if result is not None:
+            preview = result.frame.head(8)
+            meta = {"source": "sql", "rows": len(result.frame), "elapsed_ms": result.elapsed_ms, "cached": result.cached}
+        else:
+            # SQL references tables this engine does not hold — show the sample data instead
+            preview = SAMPLE_DATA[data_key].head(8)
+            meta = {"source": "sample", "rows": len(SAMPLE_DATA[data_key]), "elapsed_ms": 0.0, "cached": False}
+        return (preview, meta), int(preview.memory_usage(deep=True).sum())
+
+    cache_key = f"{key}|{sql_engine.ENGINE.version}|{sql_engine.normalize(sql)}"
+    preview, meta = RESULT_CACHE.get_or_build(cache_key, build)
+    with instrumentation.timed("ai_chatbot", "chart_build"):
+        chart = FIGURE_CACHE.get_or_build(cache_key, lambda: build_chart(key, sql))
+    return chart, preview, meta
+
 # ─── Main Page ────────────────────────────────────────────────────────────────
 def show():
     st.markdown("""
@@ -161,18 +231,15 @@ def show():
         st.markdown('<div class="section-header">💬 Chat with Your Data</div>', unsafe_allow_html=True)
         
         # Initialize chat history
-        if "chat_history" not in st.session_state:
-            st.session_state.chat_history = [
-                {
-                    "role": "bot",
-                    "content": "👋 Hello! I'm your **AI Data Assistant**. I can help you:\n\n• 📊 Query your data in plain English\n• 🔍 Generate SQL automatically\n• 📈 Create instant visualizations\n• 💡 Provide AI-powered insights\n\nTry asking: *'Show me total sales by region'* or *'Which customers have high churn risk?'*"
-                }
-            ]
+        if "chat_store" not in st.session_state:
+            st.session_state.chat_store = ChatHistory(WELCOME_MESSAGE)
+        history = st.session_state.chat_store
         
-        # Display chat history
+        # Display chat history — only the latest answer rebuilds its chart eagerly
+        latest_id = history.last_bot_id()
         chat_container = st.container()
-        with chat_container:
-            for msg in st.session_state.chat_history:
+        with chat_container, instrumentation.timed("ai_chatbot", "chat_history_render"):
+            for msg in history.messages:
                 if msg["role"] == "user":
                     st.markdown(f"""
                     <div class="chat-user">
@@ -190,11 +257,17 @@ def show():
                         with st.expander("📝 Generated SQL", expanded=False):
                             st.code(msg["sql"], language="sql")
                     
-                    if "chart" in msg and msg["chart"] is not None:
-                        st.plotly_chart(msg["chart"], use_container_width=True)
-                    
-                    if "dataframe" in msg:
-                        st.dataframe(msg["dataframe"].head(8), use_container_width=True, hide_index=True)
+                    if msg.get("result_key"):
+                        if msg["id"] == latest_id or st.checkbox("📈 Show chart & data", key=f"show_result_{msg['id']}"):
+                            chart, preview, meta = load_result(msg["result_key"], msg["sql"])
+                            if chart is not None:
+                                st.plotly_chart(chart, use_container_width=True)
+                            st.dataframe(preview, use_container_width=True, hide_index=True)
+                            if meta["source"] == "sql":
+                                timing = "query cache" if meta["cached"] else f"{meta['elapsed_ms']:.1f} ms"
+                                st.caption(f"⚡ {meta['rows']} rows · {timing} · in-process SQL engine")
+                            else:
+                                st.caption("ℹ️ Query references tables outside the local engine — showing sample data")
         
         # Input
         st.markdown("---")
@@ -229,7 +302,7 @@ def show():
             send_btn = st.button("🚀 Ask AI", use_container_width=True, type="primary")
         with col_clear:
             if st.button("🗑️ Clear", use_container_width=True):
-                st.session_state.chat_history = [st.session_state.chat_history[0]]
+                history.clear()
                 st.rerun()
         
         # Process question
@@ -242,21 +315,19 @@ def show():
         
         if question:
             # Add user message
-            st.session_state.chat_history.append({"role": "user", "content": question})
+            history.add_user(question)
             
             # Get AI response
-            response = get_nl2sql_response(question)
-            
-            # Build bot message
-            bot_msg = {
-                "role": "bot",
-                "content": f"I've analyzed your question and generated the following:\n\n{response['insight']}",
-                "sql": response["sql"],
-                "chart": render_chart(response),
-                "dataframe": SAMPLE_DATA[response["data_key"]],
-            }
+            with instrumentation.timed("ai_chatbot", "nl2sql_lookup"):
+                response = get_nl2sql_response(question)
             
-            st.session_state.chat_history.append(bot_msg)
+            # Store a compact bot message; the chart is rebuilt from result_key
+            history.add_bot(
+                question,
+                f"I've analyzed your question and generated the following:\n\n{response['insight']}",
+                response["sql"],
+                result_key(response),
+            )
             st.rerun()
     
     with col2:
@@ -272,13 +343,16 @@ def show():
             ("🏷️", "Auto Tagging", "Classify and tag data automatically"),
         ]
         
-        for icon, title, desc in capabilities:
-            st.markdown(f"""
+        components.render({
+            "layout": "list",
+            "template": """
             <div style='background:#1a1a3e; border:1px solid #334466; border-radius:10px; padding:12px; margin-bottom:8px;'>
                 <div style='font-size:1.2rem;'>{icon} <strong style='color:#00d4ff;'>{title}</strong></div>
                 <div style='font-size:0.78rem; color:#8899bb; margin-top:4px;'>{desc}</div>
             </div>
-            """, unsafe_allow_html=True)
+            """,
+            "items": [{"icon": icon, "title": title, "desc": desc} for icon, title, desc in capabilities],
+        })
         
         st.markdown("---")
         
@@ -296,12 +370,15 @@ def show():
             "Find anomalies in sales data",
         ]
         
-        for q in sample_qs:
-            st.markdown(f"""
+        components.render({
+            "layout": "list",
+            "template": """
             <div style='background:#0d1b2a; border:1px solid #1e3a5f; border-radius:8px; padding:8px 12px; margin:4px 0; font-size:0.8rem; color:#8899bb;'>
                 💬 {q}
             </div>
-            """, unsafe_allow_html=True)
+            """,
+            "items": [{"q": q} for q in sample_qs],
+        })
         
         st.markdown("---")
         
@@ -310,3 +387,12 @@ def show():
         st.metric("Queries Today", "1,247", "+23%")
         st.metric("Avg Response Time", "0.8s", "-45%")
         st.metric("User Satisfaction", "4.8/5", "+0.2")
+        
+        session = history.footprint()
+        shared = RESULT_CACHE.footprint()
+        figures = FIGURE_CACHE.stats()
+        st.caption(
+            f"💾 Session chat: {session['messages']} msgs · {session['bytes'] / 1024:.1f} / {session['max_bytes'] / 1024:.0f} KB — "
+            f"shared results: {shared['entries']} cached · {shared['bytes'] / 1024:.0f} KB · {shared['hits']} hits / {shared['misses']} misses — "
+            f"figures: {figures['entries']} cached · {figures['bytes'] / 1024:.0f} KB · {figures['hits']} hits / {figures['misses']} misses"
+        )
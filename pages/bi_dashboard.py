@@ -1,12 +1,14 @@
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import random
 
+from core import instrumentation
+
 def show():
+    timer = instrumentation.SectionTimer("bi_dashboard")
     st.markdown("""
     <div style='background: linear-gradient(135deg, #0f3460, #533483); border-radius:16px; padding:24px; margin-bottom:24px;'>
         <div style='font-size:1.8rem; font-weight:800; color:white;'>📊 BI & Analytics Dashboard</div>
@@ -44,6 +46,7 @@ def show():
     for col, (val, label, delta) in zip([col1, col2, col3, col4, col5, col6], metrics):
         with col:
             st.metric(label=label, value=val, delta=delta)
+    timer.lap("filters_kpis")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -82,6 +85,7 @@ def show():
             height=300,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("revenue_chart")
     
     with col2:
         st.markdown('<div class="section-header">🥧 Data Source Distribution</div>', unsafe_allow_html=True)
@@ -105,6 +109,7 @@ def show():
             height=300,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("source_chart")
 
     # Charts Row 2
     col1, col2, col3 = st.columns(3)
@@ -138,6 +143,7 @@ def show():
             height=250,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("pipeline_chart")
     
     with col2:
         st.markdown('<div class="section-header">⚡ Query Volume (24h)</div>', unsafe_allow_html=True)
@@ -163,6 +169,7 @@ def show():
             height=250,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("query_volume_chart")
     
     with col3:
         st.markdown('<div class="section-header">🌡️ Data Quality Heatmap</div>', unsafe_allow_html=True)
@@ -192,6 +199,7 @@ def show():
             height=250,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("quality_heatmap")
 
     # Operational Reports Table
     st.markdown('<div class="section-header">📋 Operational Reports — Live Feed</div>', unsafe_allow_html=True)
@@ -211,6 +219,7 @@ def show():
         use_container_width=True,
         hide_index=True,
     )
+    timer.lap("reports_dataframe")
 
     # AI Insights Panel
     st.markdown('<div class="section-header">🤖 AI-Generated Insights</div>', unsafe_allow_html=True)
@@ -2,11 +2,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, timedelta
 import random
 
+from core import components, instrumentation
+
 def show():
+    timer = instrumentation.SectionTimer("cost_optimizer")
     st.markdown("""
     <div style='background: linear-gradient(135deg, #1a2a0a, #0f3460); border-radius:16px; padding:24px; margin-bottom:24px;'>
         <div style='font-size:1.8rem; font-weight:800; color:white;'>💰 Cost Optimizer</div>
@@ -49,6 +51,7 @@ def show():
             <div class="metric-delta">↑ Payback in 8 months</div>
         </div>
         """, unsafe_allow_html=True)
+    timer.lap("savings_metrics")
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -83,6 +86,7 @@ def show():
                 height=300,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("cost_chart")
         
         with col2:
             st.markdown('<div class="section-header">📈 Cost Trend (12 Months)</div>', unsafe_allow_html=True)
@@ -109,6 +113,7 @@ def show():
                 height=300,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("cost_trend_chart")
         
         # Cost table
         st.markdown('<div class="section-header">📋 Detailed Cost Analysis</div>', unsafe_allow_html=True)
@@ -124,6 +129,7 @@ def show():
         
         df_cost = pd.DataFrame(cost_data)
         st.dataframe(df_cost, use_container_width=True, hide_index=True)
+        timer.lap("cost_dataframe")
 
     # ─── TAB 2: Bottleneck Analyzer ───────────────────────────────────────────
     with tabs[1]:
@@ -140,9 +146,9 @@ def show():
                 ("🟢 Info", "CRM Sync", "Scheduled every 5 min but data changes hourly", "Change to hourly → 12x fewer compute cycles"),
             ]
             
-            for severity, name, issue, fix in bottlenecks:
-                color = "#ff4444" if "Critical" in severity else "#ffaa00" if "Warning" in severity else "#00d4ff"
-                st.markdown(f"""
+            components.render({
+                "layout": "list",
+                "template": """
                 <div style='background:#1a1a3e; border-left:4px solid {color}; border-radius:0 12px 12px 0; padding:14px; margin-bottom:10px;'>
                     <div style='display:flex; justify-content:space-between; margin-bottom:6px;'>
                         <strong style='color:{color};'>{severity}</strong>
@@ -151,7 +157,13 @@ def show():
                     <div style='font-size:0.82rem; color:#cc8888; margin-bottom:4px;'>⚠️ Issue: {issue}</div>
                     <div style='font-size:0.82rem; color:#88cc88;'>✅ Fix: {fix}</div>
                 </div>
-                """, unsafe_allow_html=True)
+                """,
+                "items": [
+                    {"severity": severity, "name": name, "issue": issue, "fix": fix,
+                     "color": "#ff4444" if "Critical" in severity else "#ffaa00" if "Warning" in severity else "#00d4ff"}
+                    for severity, name, issue, fix in bottlenecks
+                ],
+            })
         
         with col2:
             st.markdown('<div class="section-header">📊 Query Performance Distribution</div>', unsafe_allow_html=True)
@@ -179,6 +191,7 @@ def show():
                 height=280,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("query_histogram")
             
             col_a, col_b, col_c = st.columns(3)
             col_a.metric("Median Query", f"{np.median(query_times):.2f}s")
@@ -232,10 +245,19 @@ def show():
             with st.expander(f"{rec['priority']} | {rec['title']} — {rec['impact']}", expanded=True):
                 col1, col2 = st.columns([2, 1])
                 with col1:
-                    st.markdown(f"<div style='color:#aabbcc; font-size:0.9rem;'>{rec['description']}</div>", unsafe_allow_html=True)
-                    st.markdown("**Implementation Steps:**")
-                    for i, step in enumerate(rec['steps'], 1):
-                        st.markdown(f"{i}. {step}")
+                    components.render([
+                        {
+                            "layout": "list",
+                            "template": "<div style='color:#aabbcc; font-size:0.9rem;'>{description}</div>",
+                            "items": [{"description": rec['description']}],
+                        },
+                        {
+                            "layout": "list",
+                            "title": "Implementation Steps:",
+                            "template": "<div style='margin:4px 0 4px 8px;'>{i}. {step}</div>",
+                            "items": [{"i": i, "step": step} for i, step in enumerate(rec['steps'], 1)],
+                        },
+                    ])
                 with col2:
                     st.markdown(f"""
                     <div style='background:#1a1a3e; border:1px solid {rec['color']}44; border-radius:10px; padding:14px; text-align:center;'>
@@ -244,6 +266,7 @@ def show():
                     </div>
                     """, unsafe_allow_html=True)
 
+        timer.lap("recommendations")
     # ─── TAB 4: ROI Calculator ────────────────────────────────────────────────
     with tabs[3]:
         st.markdown('<div class="section-header">📊 ROI Calculator</div>', unsafe_allow_html=True)
@@ -328,3 +351,4 @@ def show():
                 title=dict(text='Cumulative ROI Over 3 Years', font=dict(color='#00d4ff', size=13)),
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("roi_chart")
@@ -2,11 +2,13 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
 import time
 import random
 
+from core import column_store, instrumentation
+
 def show():
+    timer = instrumentation.SectionTimer("data_science")
     st.markdown("""
     <div style='background: linear-gradient(135deg, #0d2a1a, #0f3460); border-radius:16px; padding:24px; margin-bottom:24px;'>
         <div style='font-size:1.8rem; font-weight:800; color:white;'>🔬 Data Science & AutoML</div>
@@ -38,16 +40,26 @@ def show():
                 "Clustering", "Anomaly Detection", "NLP / Text Analysis"
             ])
             
+            # Datasets landed by the ingestion pipeline in the local column store; only the
+            # manifest is read here, column data is paged in when training starts
+            store = column_store.ColumnStore()
+            stored = store.datasets()
+            dataset_name = st.selectbox("📦 Training Dataset", ["Demo customer features"] + stored)
+            dataset = store.open(dataset_name) if dataset_name in stored else None
+            
             target_col = st.text_input("🎯 Target Variable", placeholder="e.g., churn, revenue, risk_score")
             
             st.markdown("**🔧 Feature Engineering (AI-Assisted)**")
-            features = st.multiselect(
-                "Select Features",
-                ["customer_age", "tenure_months", "monthly_spend", "support_tickets",
-                 "last_login_days", "product_usage", "contract_type", "region",
-                 "payment_method", "num_products", "satisfaction_score"],
-                default=["customer_age", "tenure_months", "monthly_spend", "support_tickets"]
-            )
+            if dataset is not None:
+                features = st.multiselect("Select Features", dataset.columns, default=dataset.columns[:4])
+            else:
+                features = st.multiselect(
+                    "Select Features",
+                    ["customer_age", "tenure_months", "monthly_spend", "support_tickets",
+                     "last_login_days", "product_usage", "contract_type", "region",
+                     "payment_method", "num_products", "satisfaction_score"],
+                    default=["customer_age", "tenure_months", "monthly_spend", "support_tickets"]
+                )
             
             st.markdown("**🤖 AutoML Settings**")
             col_a, col_b = st.columns(2)
@@ -81,6 +93,22 @@ def show():
                     (100, "🎉 AutoML training complete!"),
                 ]
                 
+                if dataset is not None:
+                    columns = features + ([target_col] if target_col in dataset.columns and target_col not in features else [])
+                    with instrumentation.timed("data_science", "dataset_load"):
+                        training_frame = dataset.read(columns)
+                    st.caption(
+                        f"📦 {dataset.rows:,} rows × {len(columns)} of {len(dataset.columns)} columns read from `{dataset_name}` "
+                        f"({dataset.mapped_bytes(columns) / 1e6:,.1f} MB memory-mapped)"
+                    )
+                    # Validate what training will see: types and missing values of the selected columns
+                    with st.expander("🧪 Training data validation"):
+                        st.dataframe(pd.DataFrame({
+                            "dtype": training_frame.dtypes.astype(str),
+                            "nulls": training_frame.isna().sum(),
+                            "null_pct": (100 * training_frame.isna().mean()).round(2),
+                        }).rename_axis("column").reset_index(), use_container_width=True, hide_index=True)
+                
                 for pct, msg in training_steps:
                     time.sleep(0.5)
                     progress_bar.progress(pct)
@@ -108,6 +136,7 @@ def show():
             
             df_models = pd.DataFrame(models_data)
             st.dataframe(df_models, use_container_width=True, hide_index=True)
+            timer.lap("model_dataframe")
             
             # Model comparison chart
             fig = go.Figure()
@@ -134,6 +163,7 @@ def show():
                 height=280,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("model_comparison_chart")
             
             # Feature Importance
             st.markdown('<div class="section-header">🔍 Feature Importance (SHAP)</div>', unsafe_allow_html=True)
@@ -159,6 +189,7 @@ def show():
                 height=220,
             )
             st.plotly_chart(fig2, use_container_width=True)
+            timer.lap("shap_chart")
 
     # ─── TAB 2: Model Performance ─────────────────────────────────────────────
     with tabs[1]:
@@ -189,6 +220,7 @@ def show():
                 height=300,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("roc_chart")
         
         with col2:
             st.markdown('<div class="section-header">🎯 Confusion Matrix</div>', unsafe_allow_html=True)
@@ -215,6 +247,7 @@ def show():
                 height=300,
             )
             st.plotly_chart(fig, use_container_width=True)
+            timer.lap("confusion_matrix")
         
         # Model drift monitoring
         st.markdown('<div class="section-header">📉 Model Drift Monitoring</div>', unsafe_allow_html=True)
@@ -238,6 +271,7 @@ def show():
             height=250,
         )
         st.plotly_chart(fig, use_container_width=True)
+        timer.lap("drift_chart")
 
     # ─── TAB 3: Deployed Models ───────────────────────────────────────────────
     with tabs[2]:
@@ -255,6 +289,7 @@ def show():
         
         df_deployed = pd.DataFrame(deployed_data)
         st.dataframe(df_deployed, use_container_width=True, hide_index=True)
+        timer.lap("deployed_dataframe")
         
         col1, col2, col3, col4 = st.columns(4)
         col1.metric("Total Models", "12", "+3 this month")
@@ -331,6 +366,7 @@ def show():
                             height=250,
                         )
                         st.plotly_chart(fig, use_container_width=True)
+                        timer.lap("prediction_gauge")
                         
                         # Recommendations
                         st.markdown("**🤖 AI Recommendations:**")
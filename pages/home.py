@@ -1,5 +1,7 @@
 import streamlit as st
 
+from core import components
+
 def show():
     # Hero Banner
     st.markdown("""
@@ -42,8 +44,6 @@ def show():
     # Feature Cards
     st.markdown('<div class="section-header">🚀 Platform Capabilities</div>', unsafe_allow_html=True)
     
-    col1, col2, col3, col4 = st.columns(4)
-    
     features = [
         ("📊", "BI & Analytics", "Real-time dashboards, KPI tracking, operational & strategic reporting across all business units."),
         ("🔄", "Data Ingestion", "Ingest from 20+ sources: CSV, APIs, databases, streaming, IoT, cloud storage — all unified."),
@@ -55,16 +55,18 @@ def show():
         ("⚡", "Real-time Processing", "Stream processing with sub-second latency for operational analytics and alerting."),
     ]
     
-    cols = st.columns(4)
-    for i, (icon, title, desc) in enumerate(features):
-        with cols[i % 4]:
-            st.markdown(f"""
-            <div class="feature-card" style="margin-bottom:16px;">
-                <div class="feature-icon">{icon}</div>
-                <div class="feature-title">{title}</div>
-                <div class="feature-desc">{desc}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    components.render({
+        "layout": "grid",
+        "columns": 4,
+        "template": """
+        <div class="feature-card" style="margin-bottom:16px;">
+            <div class="feature-icon">{icon}</div>
+            <div class="feature-title">{title}</div>
+            <div class="feature-desc">{desc}</div>
+        </div>
+        """,
+        "items": [{"icon": icon, "title": title, "desc": desc} for icon, title, desc in features],
+    })
 
     st.markdown("<br>", unsafe_allow_html=True)
 
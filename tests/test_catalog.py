@@ -0,0 +1,29 @@
+import numpy as np
+
+from core import catalog
+from core.catalog import CatalogIndex
+
+
+def test_postings_are_int64():
+    index = CatalogIndex()
+    index.register_dataset("sales", ["revenue"])
+    ids, _ = index._postings["revenue"]
+    assert ids.typecode == "q" and np.frombuffer(ids, dtype=np.int64).tolist() == [1]
+
+
+def test_reregistration_compacts_tombstones(monkeypatch):
+    monkeypatch.setattr(catalog, "COMPACT_MIN", 10)
+    index = CatalogIndex()
+    index.register_dataset("customers", ["customer_id", "churn_score"], domain="CRM")
+    for run in range(20):
+        index.register_dataset("sales", ["revenue", "region", f"col_{run}"], domain="Sales")
+    assert len(index) == 7
+    assert len(index.entries) < 2 * len(index) + 10  # tombstones were dropped along the way
+    assert len(index._postings["revenue"][0]) < 20
+    results = index.search("revenue")
+    assert [(entry["dataset"], entry["column"]) for entry, _, _ in results] == [("sales", "revenue")]
+    assert index.search("col_19")[0][0]["column"] == "col_19"
+    assert not any(entry["column"] == "col_3" for entry, _, _ in index.search("col_3"))
+    index.compact()
+    assert len(index.entries) == len(index) == 7
+    assert index.search("churn")[0][0]["column"] == "churn_score"
@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import dtypes, pipeline, synthetic
+from core.column_store import ColumnStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # pipeline metrics land under ./data
+    return ColumnStore(str(tmp_path / "store"))
+
+
+def test_type_plan_pipeline_into_column_store(tmp_path, store):
+    # The plan is profiled on the first 10k rows; later chunks outgrow its int widths
+    frame = synthetic.generate("sales_transactions", 50_000)
+    path = tmp_path / "sales.csv"
+    frame.to_csv(path, index=False)
+    plan = dtypes.TypePlan()
+    result = pipeline.Pipeline(pipeline.CSVSource(str(path), chunk_rows=10_000), store, "sales",
+                               transforms=pipeline.DEFAULT_TRANSFORMS + (plan,)).run()
+    assert result["records"] == 50_000
+    assert "transaction_id" in plan.widened
+    stored = store.open("sales").read()
+    assert stored["transaction_id"].tolist() == frame["transaction_id"].tolist()
+    assert np.allclose(stored["sale_amount"], frame["sale_amount"])
+
+
+def test_chunk_widens_written_rows(store):
+    store.append("d", pd.DataFrame({"n": np.array([1, 2], dtype=np.int16), "x": [1, 2]}))
+    store.append("d", pd.DataFrame({"n": [70_000, 3], "x": [1.5, None]}))
+    store.append("d", pd.DataFrame({"n": [4, 5], "x": ["a", None]}))
+    store.commit()
+    stored = store.open("d").read()
+    assert stored["n"].dtype == np.int64
+    assert stored["n"].tolist() == [1, 2, 70_000, 3, 4, 5]
+    assert stored["x"].astype(object).where(stored["x"].notna(), None).tolist() == ["1.0", "2.0", "1.5", None, "a", None]
+
+
+def test_datetime_with_nat_keeps_unit(store):
+    for _ in range(2):
+        store.append("d", pd.DataFrame({"t": pd.to_datetime(["2024-01-01", None])}))
+    store.commit()
+    assert store.open("d").read()["t"].isna().tolist() == [False, True, False, True]
+
+
+def test_failed_rerun_keeps_published_version(tmp_path, store):
+    frame = pd.DataFrame({"id": range(30)})
+    pipeline.Pipeline(pipeline.GeneratorSource(lambda: iter([frame])), store, "d", checks=()).run()
+
+    def failing():
+        yield frame.head(10)
+        deadline = time.monotonic() + 5
+        while not rerun.metrics["load"].batches and time.monotonic() < deadline:
+            time.sleep(0.01)  # fail only once the first chunk is in the new version
+        raise OSError("source went away")
+
+    rerun = pipeline.Pipeline(pipeline.GeneratorSource(failing), store, "d", checks=())
+    with pytest.raises(pipeline.PipelineError):
+        rerun.run()
+    assert store.open("d").rows == 30
+    assert sorted(entry.name for entry in (tmp_path / "store" / "d").iterdir() if entry.is_dir()) == ["v1"]
+
+
+def test_concurrent_writers_get_their_own_versions(tmp_path):
+    first, second = ColumnStore(str(tmp_path / "store")), ColumnStore(str(tmp_path / "store"))
+    first.append("d", pd.DataFrame({"id": [1]}), replace=True)
+    second.append("d", pd.DataFrame({"id": [2]}), replace=True)
+    first.commit()
+    assert first.open("d").read()["id"].tolist() == [1]
+    second.commit()
+    dataset = second.open("d")
+    assert dataset.version == 2 and dataset.read()["id"].tolist() == [2]
@@ -0,0 +1,33 @@
+import socket
+import sqlite3
+
+import pytest
+
+from core import health
+
+
+def test_close_releases_pooled_sqlite_connections(tmp_path):
+    path = str(tmp_path / "warehouse.db")
+    sqlite3.connect(path).execute("CREATE TABLE t (x)").connection.close()
+    checker = health.HealthChecker({"Warehouse": {"kind": "sqlite", "path": path}}, timeout=5)
+    assert checker.results(wait_s=5)["Warehouse"].status == "ok"
+    (conn,) = checker.pool._idle[("sqlite", path)]
+    checker.close()
+    assert not checker.pool._idle
+    with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+        conn.execute("SELECT 1")
+
+
+def test_tcp_probe_notices_a_listener_that_went_away():
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    checker = health.HealthChecker({"Broker": {"kind": "tcp", "host": "127.0.0.1", "port": port}}, timeout=5)
+    try:
+        assert checker.results(wait_s=5)["Broker"].status == "ok"
+        accepted, _ = listener.accept()  # the old connection stays open, as to a host that vanished without a FIN
+        listener.close()
+        checker.refresh().result(timeout=5)
+        assert checker.results()["Broker"].status == "error"
+        accepted.close()
+    finally:
+        checker.close()
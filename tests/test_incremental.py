@@ -0,0 +1,42 @@
+import time
+
+import pandas as pd
+import pytest
+
+from core import incremental, pipeline
+from core.sql_engine import SQLEngine
+
+
+def run_cdc(engine, frame, state_dir, fail_after=None):
+    """CDC-load ``frame`` in 10-row chunks; with ``fail_after``, the source raises once that many rows are loaded."""
+    target = incremental.IncrementalTarget(engine, mode="cdc", key="id", state_dir=str(state_dir))
+
+    def chunks():
+        for start in range(0, len(frame), 10):
+            if fail_after is not None and start >= fail_after:
+                deadline = time.monotonic() + 5
+                while target.stats["scanned"] < fail_after and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                raise OSError("source went away")
+            yield frame.iloc[start:start + 10]
+
+    return pipeline.Pipeline(pipeline.GeneratorSource(chunks, total_rows=len(frame)), target, "t", checks=()).run()
+
+
+def test_failed_cdc_run_keeps_rows_and_snapshot(tmp_path):
+    engine = SQLEngine()
+    frame = pd.DataFrame({"id": range(30), "value": range(30)})
+    run_cdc(engine, frame, tmp_path)
+
+    changed = frame.assign(value=frame["value"] * 2)
+    changed.loc[0, "id"] = 100  # a new key in the chunk that loads before the failure
+    with pytest.raises(pipeline.PipelineError):
+        run_cdc(engine, changed, tmp_path, fail_after=10)
+    assert engine.query("SELECT COUNT(*) AS n FROM t").frame["n"][0] == 31  # unseen keys were not deleted
+    assert len(incremental.Snapshot.load(str(tmp_path), "t")) == 30
+
+    run_cdc(engine, changed, tmp_path)
+    rows = engine.query("SELECT id, value FROM t ORDER BY id").frame
+    assert rows["id"].tolist() == list(range(1, 30)) + [100]  # the rerun inserts 100 once and deletes 0
+    assert rows["value"].tolist() == changed.sort_values("id")["value"].tolist()
+    assert len(incremental.Snapshot.load(str(tmp_path), "t")) == 30
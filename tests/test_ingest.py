@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from core import ingest, synthetic
+from core.sql_engine import SQLEngine
+
+
+def test_server_file_only_reads_under_root(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "sales.csv").write_text("a\n1\n")
+    (tmp_path / "secret.csv").write_text("a\n1\n")
+    os.symlink(tmp_path / "secret.csv", root / "link.csv")
+    assert ingest.server_file(str(root / "sales.csv"), root=str(root)) == os.path.realpath(root / "sales.csv")
+    for path in ("/etc/passwd", str(root / ".." / "secret.csv"), str(root / "link.csv"), str(tmp_path / "data2.csv")):
+        with pytest.raises(ValueError):
+            ingest.server_file(path, root=str(root))
+    with pytest.raises(ValueError, match="not found"):
+        ingest.server_file(str(root / "missing.csv"), root=str(root))
+
+
+def test_csv_streams_into_file_backed_engine(tmp_path):
+    path = tmp_path / "sales.csv"
+    synthetic.generate("sales_transactions", 30_000).to_csv(path, index=False)
+    (tmp_path / "engine.db").write_text("left over from an earlier process")
+    engine = SQLEngine(str(tmp_path / "engine.db"))
+    result = ingest.ingest_csv(str(path), "sales", engine, chunk_rows=10_000)
+    assert result["rows"] == 30_000 and result["chunks"] == 3
+    assert engine.query("SELECT COUNT(*) AS n FROM sales").frame["n"][0] == 30_000
+    assert sum(entry.stat().st_size for entry in tmp_path.glob("engine.*.db*")) > 1 << 20  # the rows are on disk
+
+
+def test_ingested_tables_never_replace_sample_tables():
+    engine = SQLEngine()
+    engine.register("sales_transactions", synthetic.generate("sales_transactions", 10))
+    table = ingest.table_name("Sales Transactions")
+    assert table == "ingested_sales_transactions"
+    ingest.ingest_frame(synthetic.generate("sales_transactions", 3), table, engine)
+    assert engine.tables["sales_transactions"]["rows"] == 10
+    assert ingest.table_name("???") == "ingested_uploaded"
+
+
+def test_upload_paths_stay_in_the_upload_dir(tmp_path):
+    directory = str(tmp_path / "uploads")
+    for name in ("../../etc/passwd", "..\\..\\app.py", "/abs/sales.csv", "..", "sales.csv"):
+        path = ingest.upload_path(name, directory)
+        assert os.path.dirname(path) == os.path.realpath(directory)
+    assert ingest.upload_path("sales.csv", directory) != ingest.upload_path("sales.csv", directory)
+    assert ingest.upload_path("sales.csv", directory).endswith("_sales.csv")
@@ -0,0 +1,17 @@
+from core.intent_index import IntentIndex
+
+TEMPLATES = {
+    "total sales": {"keywords": ["revenue", "orders", "sum"]},
+    "revenue by region": {"keywords": ["sales", "compare", "geography", "regional"]},
+    "monthly revenue": {"keywords": ["month", "trend", "over time", "seasonal"]},
+    "top customers": {"keywords": ["best", "largest"]},
+}
+
+
+def test_best_never_falls_back_past_the_top_match():
+    index = IntentIndex(TEMPLATES)
+    top, runner_up = index.search("Revenue by product", limit=2)
+    assert top.key == "total sales" and top.score > runner_up.score
+    assert top.confidence < 0.2 <= runner_up.confidence
+    assert index.best("Revenue by product", min_confidence=0.2) is None
+    assert index.best("Revenue by product", min_confidence=0.1).key == "total sales"
@@ -0,0 +1,38 @@
+import json
+
+import pandas as pd
+
+from core import pipeline
+from core.column_store import ColumnStore
+from core.json_reader import JSONReader
+
+
+def test_widened_column_into_column_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / "dump.ndjson"
+    with open(path, "w") as fh:
+        for i in range(3_000):
+            fh.write(json.dumps({"id": i, "amt": i if i < 1_500 else i + 0.5}) + "\n")
+    store = ColumnStore(str(tmp_path / "store"))
+    result = pipeline.Pipeline(pipeline.JSONSource(str(path), chunk_rows=1_000), store, "dump").run()
+    assert result["records"] == 3_000
+    stored = store.open("dump").read()
+    assert stored["amt"].tolist() == [i if i < 1_500 else i + 0.5 for i in range(3_000)]
+
+
+def test_single_record_with_object_list_is_ndjson(tmp_path):
+    path = tmp_path / "one.ndjson"
+    path.write_text('{"id": 1, "items": [{"k": 1}]}\n')
+    reader = JSONReader(str(path), chunk_rows=100)
+    frame = pd.concat(list(reader))
+    assert reader.format == "ndjson"
+    assert frame["id"].tolist() == [1]
+    assert json.loads(frame["items"].iloc[0]) == [{"k": 1}]
+
+
+def test_minified_wrapper_is_document(tmp_path):
+    path = tmp_path / "wrapped.json"
+    path.write_text('{"meta": {"page": 1}, "data": [{"id": 1}, {"id": 2}]}')
+    reader = JSONReader(str(path), chunk_rows=100)
+    assert pd.concat(list(reader))["id"].tolist() == [1, 2]
+    assert reader.format == "document"
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from core import parallel_csv
+from core.parallel_csv import ParallelCSVReader
+
+
+def test_quoted_newlines_past_the_first_block(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_csv, "MIN_RANGE_BYTES", 1 << 16)  # many cuts, most through quoted notes
+    # Plain rows for the first MB, then notes with embedded newlines and doubled quotes
+    rows = 90_000
+    plain = 60_000
+    frame = pd.DataFrame({"id": range(rows), "amount": [i * 0.5 for i in range(rows)],
+                          "note": ["plain"] * plain + ['line one\nline "two"\n\nend'] * (rows - plain)})
+    path = tmp_path / "notes.csv"
+    frame.to_csv(path, index=False)
+    assert parallel_csv.splittable(str(path))
+    reader = ParallelCSVReader(str(path), chunk_rows=5_000, workers=2)
+    parsed = pd.concat(list(reader), ignore_index=True)
+    assert reader.ranges > 10
+    pd.testing.assert_frame_equal(parsed, pd.read_csv(path))
+
+
+def test_cut_skips_newlines_inside_quotes():
+    buffer = b'1,"a\nb"\n2,"c\nd'
+    assert parallel_csv._cut(buffer, b'"') == len(b'1,"a\nb"\n')
+    assert parallel_csv._cut(b'1,"a\nb', b'"') == 0
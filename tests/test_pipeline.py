@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from core import pipeline, scheduler, synthetic
+from core.sql_engine import SQLEngine
+
+
+def frame_source(frame):
+    return pipeline.GeneratorSource(lambda: iter([frame]), total_rows=len(frame))
+
+
+def test_rows_failing_several_checks_count_once():
+    frame = pd.DataFrame({"id": [1, 2, 3, 4], "name": ["a", None, "c", None]})
+    result = pipeline.Pipeline(frame_source(frame), SQLEngine(), "t",
+                               checks=(pipeline.null_check, pipeline.null_check, lambda chunk: 3)).run()
+    assert result["failed_rows"] == 4  # two null rows plus a count capped at the chunk's size
+    assert result["quality_pct"] == 0.0
+    result = pipeline.Pipeline(frame_source(frame), SQLEngine(), "t",
+                               checks=(pipeline.null_check, pipeline.null_check)).run()
+    assert result["failed_rows"] == 2 and result["quality_pct"] == 50.0
+
+
+def test_unchanged_incremental_rerun_keeps_quality(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # state, the allow-listed data dir and the engine file live under ./data
+    (tmp_path / "data").mkdir()
+    synthetic.generate("sales_transactions", 20_000).to_csv("data/sales.csv", index=False)
+    params = {"table": "sales", "source": "csv", "path": "data/sales.csv", "target": "sql", "mode": "incremental"}
+    first = scheduler.pipeline_task(params)
+    second = scheduler.pipeline_task(params)
+    assert second["records"] == first["records"] == 20_000
+    assert second["failed_rows"] == first["failed_rows"]
+    assert second["quality_pct"] == first["quality_pct"] > 0
+    assert np.isclose(second["quality_pct"], 100 * (1 - first["failed_rows"] / 20_000))
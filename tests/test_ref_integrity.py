@@ -0,0 +1,24 @@
+import pandas as pd
+
+from core import ref_integrity
+from core.sql_engine import SQLEngine
+
+
+def test_index_rebuilt_when_a_middle_key_changes(tmp_path):
+    engine = SQLEngine()
+    engine.register("customer_master", pd.DataFrame({"customer_id": [1, 2, 3, 4, 10]}))
+    facts = pd.Series([1, 3, 7, 33])
+    check = lambda: ref_integrity.reference_index("customer_master", "customer_id", engine, str(tmp_path))
+    index = check()
+    assert not index.reused and index.orphans(facts).tolist() == [False, False, True, True]
+    assert check().reused
+    # Same count, min and max: only the version shows the table changed
+    engine.delete("customer_master", "customer_id", [3])
+    engine.append("customer_master", pd.DataFrame({"customer_id": [7]}))
+    index = check()
+    assert not index.reused and index.orphans(facts).tolist() == [False, True, False, True]
+    # Another engine (a new process) never trusts an index built from this one's tables
+    other = SQLEngine()
+    other.register("customer_master", pd.DataFrame({"customer_id": [1]}))
+    index = ref_integrity.reference_index("customer_master", "customer_id", other, str(tmp_path))
+    assert not index.reused and index.orphans(facts).tolist() == [False, True, True, True]
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from core import scheduler
+
+release = threading.Event()
+started = []
+
+
+@scheduler.task("test_block")
+def block(params):
+    started.append(params)
+    release.wait(5)
+    return {"records": 1}
+
+
+@pytest.fixture
+def schedulers(tmp_path):
+    release.clear()
+    started.clear()
+    made = []
+
+    def make():
+        made.append(scheduler.Scheduler(str(tmp_path / "scheduler.db"), tick_s=3600))
+        return made[-1]
+
+    yield make
+    release.set()
+    for each in made:
+        each.stop()
+
+
+def test_each_due_slot_runs_once_across_schedulers(schedulers):
+    first, second = schedulers(), schedulers()
+    first.add_job("job", "test_block", interval_s=60, start_at=0)
+    first.tick(now=30)
+    second.tick(now=30)
+    assert len(second.history("job")) == 1  # second found next_run already moved on
+    second.run_now("job")
+    assert len(second.history("job")) == 1  # and max_concurrency counts the first scheduler's run
+
+
+def test_new_scheduler_keeps_live_runs(schedulers):
+    first = schedulers()
+    first.add_job("job", "test_block", interval_s=60, start_at=0)
+    first.tick(now=30)
+    second = schedulers()  # another process starting up
+    assert second.history("job")["status"].isin(["queued", "running"]).all()
+    second._renew_leases(scheduler.time.time() + scheduler.LEASE_S + 1)  # the owner stopped renewing
+    assert second.history("job")["status"].tolist() == ["abandoned"]
+
+
+def test_loop_survives_a_failing_tick(schedulers, monkeypatch, caplog):
+    sched = schedulers()
+    sched.tick_s = 0.01
+    ticks = []
+
+    def tick():
+        ticks.append(1)
+        raise ValueError("bad job row")
+
+    monkeypatch.setattr(sched, "tick", tick)
+    sched.start()
+    deadline = scheduler.time.time() + 5
+    while len(ticks) < 3 and scheduler.time.time() < deadline:
+        scheduler.time.sleep(0.01)
+    assert len(ticks) >= 3 and sched._thread.is_alive()
+    assert "scheduler tick failed" in caplog.text
@@ -0,0 +1,23 @@
+import pandas as pd
+
+from core import schema_mapping
+from pages.data_ingestion import DEMO_SOURCE, target_matcher
+
+
+def test_demo_source_mapping():
+    mappings = {m.source: m for m in target_matcher().match(schema_mapping.describe_columns(DEMO_SOURCE))}
+    assert mappings["txn_dt"].target == "sales_transactions.sale_date"
+    assert mappings["txn_dt"].sql_type == "DATE"
+    assert mappings["cust_nm"].target == "sales_transactions.customer_name"
+    assert mappings["sale_amt"].target == "sales_transactions.sale_amount"
+    assert mappings["prod_cd"].target == "sales_transactions.product"
+    assert mappings["cust_id"].target.endswith(".customer_id")
+
+
+def test_date_column_never_takes_an_int_id_on_its_name():
+    matcher = schema_mapping.SchemaMatcher(
+        schema_mapping.describe_columns(pd.DataFrame({"transaction_id": [1, 2, 3], "sale_date": ["2024-01-01"] * 3})))
+    dates = pd.DataFrame({"txn_dt": ["2024-03-01", "2024-03-02", "2024-03-05"]})
+    best = matcher.match_column(schema_mapping.describe_columns(dates)[0], limit=2)
+    assert [m.target for m in best][0] == "sale_date"
+    assert all(m.confidence < 0.2 for m in best if m.target == "transaction_id")
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+import pytest
+
+from core.sql_engine import SQLEngine
+
+
+@pytest.fixture
+def engine():
+    engine = SQLEngine()
+    engine.register("finance_gl", pd.DataFrame({"account": [1, 2, 3]}))
+    return engine
+
+
+@pytest.mark.parametrize("sql", [
+    "WITH x AS (SELECT 1) DELETE FROM finance_gl",
+    "WITH x AS (SELECT 1) INSERT INTO finance_gl SELECT * FROM x",
+    "with x as (select 1) update finance_gl set account = 0",
+    "DROP TABLE finance_gl",
+])
+def test_queries_cannot_write(engine, sql):
+    assert engine.try_query(sql) is None
+    with pytest.raises(Exception):
+        list(engine.iter_query(sql))
+    assert engine.query("SELECT COUNT(*) AS n FROM finance_gl WHERE account > 0").frame["n"][0] == 3
+
+
+def test_writes_still_work_after_a_query(engine):
+    engine.try_query("WITH x AS (SELECT 1) DELETE FROM finance_gl")
+    engine.append("finance_gl", pd.DataFrame({"account": [4]}))
+    assert engine.delete("finance_gl", "account", [1]) == 1
+    assert engine.query("SELECT account FROM finance_gl").frame["account"].tolist() == [2, 3, 4]
+
+
+def test_engines_sharing_a_path_keep_separate_files(tmp_path):
+    path = tmp_path / "sql_engine.db"
+    path.write_bytes(b"another process's database")
+    first, second = SQLEngine(str(path)), SQLEngine(str(path))
+    first.register("t", pd.DataFrame({"x": [1]}))
+    second.register("t", pd.DataFrame({"x": [2, 3]}))
+    assert first.query("SELECT COUNT(*) AS n FROM t").frame["n"][0] == 1
+    assert first.file != second.file and os.path.dirname(first.file) == str(tmp_path)
+    assert path.read_bytes() == b"another process's database"
+    first._remove_file()
+    assert not os.path.exists(first.file)
@@ -0,0 +1,76 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from core import pipeline, streaming
+from core.column_store import ColumnStore
+
+
+def run_stream(topic, store, events):
+    streaming.produce_synthetic(topic, "sales_transactions", events, chunk_rows=10_000).join()
+    source = streaming.StreamSource(streaming.MemoryConsumer(topic, "lake"), batch_records=10_000)
+    result = pipeline.Pipeline(source, store, "events", replace=False).run()
+    return source, result
+
+
+def test_stream_runs_append_to_lake(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    topic = streaming.MemoryTopic("events")
+    for run in (1, 2):
+        # A fresh store per run, as the page builds one per job
+        source, result = run_stream(topic, ColumnStore(str(tmp_path / "lake")), 30_000)
+        assert result["records"] == 30_000
+    dataset = ColumnStore(str(tmp_path / "lake")).open("events")
+    assert topic.offsets["lake"] == 60_000
+    assert dataset.rows == 60_000
+    assert dataset.version == 2
+    assert dataset.read(["transaction_id"])["transaction_id"].is_unique is False  # both runs' synthetic ids
+
+
+def test_append_without_replace_copies_version_forward(tmp_path):
+    store = ColumnStore(str(tmp_path / "lake"))
+    store.write("t", pd.DataFrame({"id": [1, 2], "name": ["a", "b"]}))
+    store.append("t", pd.DataFrame({"id": [3], "name": ["a"]}), replace=False)
+    store.append("t", pd.DataFrame({"id": [4], "name": ["c"]}))  # continues the version just started
+    store.commit()
+    frame = store.open("t").read()
+    assert frame["id"].tolist() == [1, 2, 3, 4]
+    assert frame["name"].tolist() == ["a", "b", "a", "c"]
+    store.write("t", pd.DataFrame({"id": [9], "name": ["z"]}))
+    assert store.open("t").read()["id"].tolist() == [9]
+
+
+def test_failed_stream_run_commits_no_offsets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    topic = streaming.MemoryTopic("events")
+    streaming.produce_synthetic(topic, "sales_transactions", 30_000, chunk_rows=10_000).join()
+    store = ColumnStore(str(tmp_path / "lake"))
+    source = streaming.StreamSource(streaming.MemoryConsumer(topic, "lake"), batch_records=10_000)
+
+    def fail_on_second_batch(chunk):
+        if run.metrics["transform"].batches:
+            deadline = time.monotonic() + 5
+            while not run.metrics["load"].batches and time.monotonic() < deadline:
+                time.sleep(0.01)  # the first batch is in the unpublished version by now
+            raise ValueError("bad batch")
+        return chunk
+
+    run = pipeline.Pipeline(source, store, "events", transforms=(fail_on_second_batch,), replace=False)
+    with pytest.raises(pipeline.PipelineError):
+        run.run()
+    assert topic.offsets.get("lake", 0) == 0
+    assert store.datasets() == []
+
+
+def test_append_links_instead_of_copying(tmp_path):
+    store = ColumnStore(str(tmp_path / "lake"))
+    first = store.write("t", pd.DataFrame({"id": [1, 2]}))
+    store.append("t", pd.DataFrame({"id": [3]}), replace=False)
+    store.commit()
+    second = store.open("t")
+    old_file, new_file = (os.path.join(dataset.directory, "id.npy") for dataset in (first, second))
+    assert os.stat(old_file).st_ino == os.stat(new_file).st_ino
+    assert first.read()["id"].tolist() == [1, 2]  # the published version still ends at its own rows
+    assert second.read()["id"].tolist() == [1, 2, 3]